@@ -0,0 +1,188 @@
+"""TODOリスト・TODO項目の読み取りキャッシュ用モジュール."""
+
+import secrets
+import time
+from collections import OrderedDict
+from typing import Protocol, TypeVar
+
+from pydantic import BaseModel
+
+from app import const
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class CacheBackend(Protocol):
+    """キャッシュのバックエンドが満たすRedis互換のインターフェース."""
+
+    async def get(self, key: str) -> bytes | int | None: ...  # noqa: D102
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None: ...  # noqa: D102
+
+    async def delete(self, *keys: str) -> int: ...  # noqa: D102
+
+    async def clear(self) -> None: ...  # noqa: D102
+
+
+class LRUCache:
+    """件数上限とTTLを持つプロセス内のLRUキャッシュ.
+
+    maxsizeにNoneを指定すると件数上限を設けず、期限切れのエントリのみを削除する。
+    """
+
+    def __init__(self, maxsize: int | None, ttl: int | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, bytes | int]] = OrderedDict()
+        self._next_sweep = 1024
+
+    async def get(self, key: str) -> bytes | int | None:  # noqa: D102
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes | int, ex: int | None = None) -> None:  # noqa: D102
+        ttl = ex if ex is not None else self.ttl
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(key)
+        if self.maxsize is None:
+            if len(self._entries) >= self._next_sweep:
+                self._sweep_expired()
+            return
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _sweep_expired(self) -> None:
+        """期限切れのエントリを削除する. 件数が倍になるごとに実行するため、1回のsetあたりの平均コストは定数に収まる."""
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at is not None and expires_at <= now]:
+            del self._entries[key]
+        self._next_sweep = max(1024, len(self._entries) * 2)
+
+    async def delete(self, *keys: str) -> int:  # noqa: D102
+        return sum(self._entries.pop(key, None) is not None for key in keys)
+
+    async def clear(self) -> None:  # noqa: D102
+        self._entries.clear()
+
+
+class RedisCache:
+    """Redisプロトコルのクライアント(redis.asyncio.Redisなど)をバックエンドにするキャッシュ.
+
+    全ワーカープロセスで共有されるため、あるプロセスでの更新による無効化が他のプロセスにも反映される。
+    Redisのデータベースは他のアプリと共有されうるため、キーにはprefixを付け、削除もprefixの付いたキーに限る。
+    """
+
+    def __init__(self, client, ttl: int | None = None, prefix: str = "") -> None:  # noqa: ANN001
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | int | None:  # noqa: D102
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes | int, ex: int | None = None) -> None:  # noqa: D102
+        await self.client.set(self.prefix + key, value, ex=ex if ex is not None else self.ttl)
+
+    async def delete(self, *keys: str) -> int:  # noqa: D102
+        return await self.client.delete(*(self.prefix + x for x in keys))
+
+    async def clear(self) -> None:  # noqa: D102
+        keys = [x async for x in self.client.scan_iter(match=f"{self.prefix}*", count=1000)]
+        for start in range(0, len(keys), 1000):
+            await self.client.delete(*keys[start:start + 1000])
+
+
+class EntityCache:
+    """レスポンススキーマ単位でエンティティをキャッシュする.
+
+    TODO項目のキーにはTODOリストごとの世代を含めており、世代を変えることで
+    TODOリストに属する全項目のキャッシュを個別に削除せずに無効化できる。
+    世代は連番ではなく無作為な値とし、世代のキーが破棄・期限切れになった場合も新しい値を割り当てる。
+    連番にすると、破棄された世代が0から数え直され、無効化済みの古いエントリが再び参照されてしまう。
+    """
+
+    def __init__(self, backend: CacheBackend, *, enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def list_key(todo_list_id: int) -> str:  # noqa: D102
+        return f"todo_list:{todo_list_id}"
+
+    @staticmethod
+    def _generation_key(todo_list_id: int) -> str:
+        return f"todo_list_gen:{todo_list_id}"
+
+    async def _new_generation(self, todo_list_id: int) -> bytes:
+        generation = secrets.token_hex(8).encode()
+        await self.backend.set(self._generation_key(todo_list_id), generation)
+        return generation
+
+    async def item_key(self, todo_list_id: int, todo_item_id: int) -> str:  # noqa: D102
+        generation = await self.backend.get(self._generation_key(todo_list_id))
+        if generation is None:
+            generation = await self._new_generation(todo_list_id)
+        return f"todo_item:{todo_list_id}:{generation.decode()}:{todo_item_id}"
+
+    async def get(self, key: str, schema: type[ModelT]) -> ModelT | None:
+        """キャッシュされたエンティティを返す."""
+        if not self.enabled:
+            return None
+        raw = await self.backend.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return schema.model_validate_json(raw)
+
+    async def set(self, key: str, model: BaseModel) -> None:
+        """エンティティをキャッシュする."""
+        if self.enabled:
+            await self.backend.set(key, model.model_dump_json().encode())
+
+    async def invalidate_list(self, todo_list_id: int, *, items: bool = False) -> None:
+        """TODOリストのキャッシュを無効化する. itemsがTrueの場合は属するTODO項目も無効化する."""
+        if not self.enabled:
+            return
+        await self.backend.delete(self.list_key(todo_list_id))
+        if items:
+            await self._new_generation(todo_list_id)
+
+    async def invalidate_item(self, todo_list_id: int, todo_item_id: int) -> None:
+        """TODO項目のキャッシュを無効化する."""
+        if self.enabled:
+            await self.backend.delete(await self.item_key(todo_list_id, todo_item_id))
+
+    async def clear(self) -> None:
+        """このアプリのキャッシュを全て削除する."""
+        await self.backend.clear()
+
+
+def _build_backends() -> tuple[CacheBackend, CacheBackend]:
+    """キャッシュと状態保存のバックエンドを返す.
+
+    CACHE_REDIS_URLが設定されていればRedis、なければプロセス内のLRUをバックエンドにする。
+    状態保存のバックエンドは件数上限で破棄されないよう、キャッシュとは別のprefix・上限なしのストアとする。
+    """
+    if const.CACHE_REDIS_URL:
+        from redis import asyncio as redis  # noqa: PLC0415
+
+        client = redis.from_url(const.CACHE_REDIS_URL)
+        return (
+            RedisCache(client, ttl=const.CACHE_TTL_SECONDS, prefix=f"{const.CACHE_KEY_PREFIX}cache:"),
+            RedisCache(client, prefix=f"{const.CACHE_KEY_PREFIX}state:"),
+        )
+    return LRUCache(maxsize=const.CACHE_MAX_ENTRIES, ttl=const.CACHE_TTL_SECONDS), LRUCache(maxsize=None)
+
+
+_cache_backend, state_store = _build_backends()
+entity_cache = EntityCache(_cache_backend, enabled=const.CACHE_ENABLED)
@@ -0,0 +1,253 @@
+"""検証用の大量のTODOリスト・TODO項目を生成して登録するコマンド.
+
+TODOリストごとのTODO項目数の偏り(--skewにパレート分布の形状パラメータを指定、0で均等)、完了済みの割合、
+期限の有無と範囲、タイトル・説明の言語(日本語・英語・混在)を指定できる。
+TODOリストとTODO項目のidは事前に採番した範囲を割り当て、TODO項目数を合計したTODOリストの件数カウンタと併せて登録するため、
+チャンクをワーカープロセスで並列に登録できる。登録中に他の処理がTODOリスト・TODO項目を登録するとidが重複するため、
+開発用のデータベースで実行すること。
+
+登録方法は--methodで指定する。
+  insert: 複数行のINSERT(PyMySQLのexecutemanyが1文にまとめる)
+  load-data: TSVファイルを書き出してLOAD DATA LOCAL INFILE(サーバーのlocal_infileの有効化が必要)
+FULLTEXTインデックスは1行ごとのngramの更新が登録の大半を占めるため、既定では登録前に削除し、登録後に作り直す。
+
+実行方法: python -m app.commands.generate_dataset --lists 10000 --items-per-list 100 [--skew 1.2] [--method load-data] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.pool import NullPool
+
+from app.const import TodoItemStatusCode
+from app.database import DATABASE_URL, engine
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+
+JA_WORDS = [
+    "買い物", "牛乳", "卵", "会議", "資料", "作成", "掃除", "洗濯", "予約", "病院", "支払い", "提出",
+    "確認", "連絡", "準備", "整理", "申請", "更新", "見積", "請求書", "打ち合わせ", "引っ越し",
+]
+EN_WORDS = [
+    "report", "meeting", "review", "deploy", "invoice", "groceries", "call", "email", "draft", "plan",
+    "book", "renew", "schedule", "prepare", "submit", "clean", "fix", "update", "order", "pay",
+]
+LANGUAGES = ("ja", "en", "mixed")
+METHODS = ("insert", "load-data")
+
+LIST_COLUMNS = ("id", "title", "description", "item_count", "completed_count", "created_at", "updated_at")
+ITEM_COLUMNS = ("id", "todo_list_id", "title", "description", "status_code", "due_at", "created_at", "updated_at")
+
+# 作成日時は現在から過去この秒数の範囲に分布させる
+CREATED_AT_RANGE_SECONDS = 365 * 24 * 60 * 60
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# ワーカープロセスごとのエンジン. チャンクごとに接続し直さないよう、プロセスの開始時に作成する
+_worker_engine: Engine | None = None
+
+
+def plan_item_counts(num_of_lists: int, items_per_list: int, skew: float, max_items_per_list: int, seed: int) -> list[int]:
+    """TODOリストごとのTODO項目数を返す. 合計はおおむねnum_of_lists * items_per_listとなる.
+
+    skewが0の場合は全TODOリストを同じ件数とし、正の場合はパレート分布の重みで配分する(小さいほど偏る)。
+    """
+    if skew <= 0:
+        return [min(items_per_list, max_items_per_list)] * num_of_lists
+    rng = random.Random(seed)
+    weights = [rng.paretovariate(skew) for _ in range(num_of_lists)]
+    scale = num_of_lists * items_per_list / sum(weights)
+    return [min(round(x * scale), max_items_per_list) for x in weights]
+
+
+def plan_chunks(item_counts: list[int], first_list_id: int, first_item_id: int, chunk_rows: int) -> list[tuple[int, int, list[int]]]:
+    """TODO項目がおおむねchunk_rows件ずつとなるよう、TODOリストをチャンクに分ける.
+
+    各チャンクは(先頭のTODOリストのid, 先頭のTODO項目のid, チャンク内のTODOリストごとのTODO項目数)で、idの範囲は重複しない。
+    """
+    chunks = []
+    start = 0
+    list_id, item_id = first_list_id, first_item_id
+    while start < len(item_counts):
+        end, rows = start, 0
+        while end < len(item_counts) and (end == start or rows + item_counts[end] <= chunk_rows):
+            rows += item_counts[end]
+            end += 1
+        chunks.append((list_id, item_id, item_counts[start:end]))
+        list_id += end - start
+        item_id += rows
+        start = end
+    return chunks
+
+
+def _text(rng: random.Random, lang: str, words: int, max_length: int) -> str:
+    if lang == "mixed":
+        lang = rng.choice(LANGUAGES[:2])
+    if lang == "ja":
+        return "".join(rng.choices(JA_WORDS, k=words))[:max_length]
+    return " ".join(rng.choices(EN_WORDS, k=words))[:max_length]
+
+
+def generate_rows(chunk: tuple[int, int, list[int]], options: dict, seed: int) -> tuple[list[tuple], list[tuple]]:
+    """チャンク分のTODOリストとTODO項目の行を、LIST_COLUMNS・ITEM_COLUMNSの順の値のタプルで返す."""
+    rng = random.Random(seed)
+    list_id, item_id, item_counts = chunk
+    now = options["now"]
+    lang = options["lang"]
+    due_range = options["due_days"] * 24 * 60 * 60
+    list_rows = []
+    item_rows = []
+    for item_count in item_counts:
+        list_created_at = now - rng.randrange(CREATED_AT_RANGE_SECONDS)
+        completed_count = 0
+        for _ in range(item_count):
+            created_at = list_created_at + rng.randrange(now - list_created_at + 1)
+            if rng.random() < options["completed_ratio"]:
+                status_code = TodoItemStatusCode.COMPLETED.value
+                completed_count += 1
+            else:
+                status_code = TodoItemStatusCode.NOT_COMPLETED.value
+            due_at = None
+            if rng.random() < options["due_ratio"]:
+                due_at = time.strftime(TIMESTAMP_FORMAT, time.gmtime(now + rng.randint(-due_range, due_range)))
+            item_rows.append((
+                item_id,
+                list_id,
+                _text(rng, lang, rng.randint(1, 3), 50),
+                _text(rng, lang, rng.randint(3, 10), 200) if rng.random() < 0.8 else None,
+                status_code,
+                due_at,
+                time.strftime(TIMESTAMP_FORMAT, time.gmtime(created_at)),
+                time.strftime(TIMESTAMP_FORMAT, time.gmtime(created_at + rng.randrange(now - created_at + 1))),
+            ))
+            item_id += 1
+        list_rows.append((
+            list_id,
+            _text(rng, lang, rng.randint(1, 3), 50),
+            _text(rng, lang, rng.randint(3, 10), 200),
+            item_count,
+            completed_count,
+            time.strftime(TIMESTAMP_FORMAT, time.gmtime(list_created_at)),
+            time.strftime(TIMESTAMP_FORMAT, time.gmtime(list_created_at + rng.randrange(now - list_created_at + 1))),
+        ))
+        list_id += 1
+    return list_rows, item_rows
+
+
+def _insert_rows(conn, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:  # noqa: ANN001
+    # PyMySQLのexecutemanyはINSERT ... VALUESをmax_allowed_packet以下の複数行のINSERTにまとめて送信する
+    placeholders = ", ".join(["%s"] * len(columns))
+    conn.exec_driver_sql(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+
+def _load_rows(conn, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:  # noqa: ANN001
+    # 生成する文字列はタブ・改行・バックスラッシュを含まないため、エスケープせずに書き出す
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv", delete=False) as f:
+        f.writelines("\t".join(r"\N" if x is None else str(x) for x in row) + "\n" for row in rows)
+    try:
+        conn.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4"
+            f" FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (f.name,),
+        )
+    finally:
+        os.unlink(f.name)
+
+
+def _init_worker(method: str) -> None:
+    global _worker_engine  # noqa: PLW0603
+    connect_args = {"local_infile": True} if method == "load-data" else {}
+    _worker_engine = create_engine(DATABASE_URL, poolclass=NullPool, connect_args=connect_args)
+
+
+def load_chunk(chunk: tuple[int, int, list[int]], options: dict, seed: int) -> int:
+    """チャンク分の行を生成して1トランザクションで登録し、登録した行数を返す."""
+    list_rows, item_rows = generate_rows(chunk, options, seed)
+    write_rows = _load_rows if options["method"] == "load-data" else _insert_rows
+    with _worker_engine.begin() as conn:
+        # 同じチャンク内でTODOリストを先に登録するため、外部キーの検査は省略できる
+        conn.exec_driver_sql("SET SESSION foreign_key_checks = 0")
+        write_rows(conn, ListModel.__tablename__, LIST_COLUMNS, list_rows)
+        write_rows(conn, ItemModel.__tablename__, ITEM_COLUMNS, item_rows)
+    return len(list_rows) + len(item_rows)
+
+
+def _fulltext_indexes() -> list:
+    return [x for model in (ListModel, ItemModel) for x in model.__table__.indexes if x.dialect_options["mysql"]["prefix"] == "FULLTEXT"]
+
+
+def generate_dataset(options: dict, workers: int, chunk_rows: int, *, defer_fulltext: bool = True) -> tuple[int, float]:
+    """TODOリストとTODO項目を生成して登録し、登録した行数と所要秒数(FULLTEXTインデックスの作り直しを含む)を返す."""
+    item_counts = plan_item_counts(
+        options["lists"], options["items_per_list"], options["skew"], options["max_items_per_list"], options["seed"],
+    )
+    with engine.connect() as conn:
+        first_list_id = (conn.scalar(select(func.max(ListModel.id))) or 0) + 1
+        first_item_id = (conn.scalar(select(func.max(ItemModel.id))) or 0) + 1
+    chunks = plan_chunks(item_counts, first_list_id, first_item_id, chunk_rows)
+    fulltext_indexes = _fulltext_indexes() if defer_fulltext else []
+
+    started_at = time.perf_counter()
+    for index in fulltext_indexes:
+        index.drop(engine, checkfirst=True)
+    rows = 0
+    try:
+        # 親プロセスのコネクションプールを引き継がないよう、forkではなくspawnでワーカーを起動する
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_init_worker, initargs=(options["method"],)) as executor:
+            futures = [executor.submit(load_chunk, chunk, options, options["seed"] + i) for i, chunk in enumerate(chunks)]
+            for future in futures:
+                rows += future.result()
+                elapsed = time.perf_counter() - started_at
+                print(f"loaded {rows} rows ({rows / elapsed:.0f} rows/s)", end="\r", flush=True)  # noqa: T201
+        print()  # noqa: T201
+    finally:
+        for index in fulltext_indexes:
+            print(f"creating {index.name}")  # noqa: T201
+            index.create(engine, checkfirst=True)
+    return rows, time.perf_counter() - started_at
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lists", type=int, default=10000, help="number of todo lists")
+    parser.add_argument("--items-per-list", type=int, default=100, help="mean number of todo items per list")
+    parser.add_argument("--skew", type=float, default=0.0, help="Pareto shape of items per list; 0 for uniform, smaller is more skewed")
+    parser.add_argument("--max-items-per-list", type=int, default=100000, help="upper bound of todo items per list")
+    parser.add_argument("--completed-ratio", type=float, default=0.3, help="ratio of completed todo items")
+    parser.add_argument("--due-ratio", type=float, default=0.5, help="ratio of todo items with a due date")
+    parser.add_argument("--due-days", type=int, default=30, help="due dates are spread within this many days before and after now")
+    parser.add_argument("--lang", choices=LANGUAGES, default="mixed", help="language of titles and descriptions")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--method", choices=METHODS, default="insert", help="multi-row INSERT or LOAD DATA LOCAL INFILE")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of loader processes")
+    parser.add_argument("--chunk-rows", type=int, default=50000, help="number of todo items per transaction")
+    parser.add_argument(
+        "--defer-fulltext", action=argparse.BooleanOptionalAction, default=True,
+        help="drop FULLTEXT indexes while loading and recreate them afterwards",
+    )
+    args = parser.parse_args()
+
+    options = {
+        "lists": args.lists,
+        "items_per_list": args.items_per_list,
+        "skew": args.skew,
+        "max_items_per_list": args.max_items_per_list,
+        "completed_ratio": args.completed_ratio,
+        "due_ratio": args.due_ratio,
+        "due_days": args.due_days,
+        "lang": args.lang,
+        "seed": args.seed,
+        "method": args.method,
+        "now": int(time.time()),
+    }
+    rows, elapsed = generate_dataset(options, args.workers, args.chunk_rows, defer_fulltext=args.defer_fulltext)
+    print(f"generated {rows} rows in {elapsed:.1f} s ({rows / elapsed:.0f} rows/s)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
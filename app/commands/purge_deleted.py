@@ -0,0 +1,40 @@
+"""論理削除されたTODOリスト・TODO項目を物理削除するコマンド.
+
+APIのバックグラウンド処理(app.purger)と異なり、負荷によらず対象がなくなるまでバッチを繰り返す。
+PURGE_ENABLEDをfalseにしてAPIでの物理削除を止め、負荷の低い時間帯にこのコマンドを定期実行する運用もできる。
+
+実行方法: python -m app.commands.purge_deleted [--retention-seconds 86400] [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+
+from app import const
+from app.database import AsyncSessionLocal
+from app.purger import purge_deleted_rows
+
+
+async def purge_all(retention_seconds: int, batch_size: int) -> tuple[int, int]:
+    """物理削除の対象がなくなるまでバッチを繰り返し、削除したTODOリストとTODO項目の件数を返す."""
+    purged_lists = purged_items = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            lists, items = await purge_deleted_rows(db, retention_seconds, batch_size)
+            purged_lists += lists
+            purged_items += items
+            if lists < batch_size and items < batch_size:
+                return purged_lists, purged_items
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--retention-seconds", type=int, default=const.PURGE_RETENTION_SECONDS, help="purge rows deleted at least this many seconds ago")
+    parser.add_argument("--batch-size", type=int, default=const.PURGE_BATCH_SIZE, help="number of rows per batch")
+    args = parser.parse_args()
+
+    purged_lists, purged_items = asyncio.run(purge_all(args.retention_seconds, args.batch_size))
+    print(f"purged {purged_lists} todo lists and {purged_items} todo items")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""TODOリストの件数カウンタ(item_count・completed_count)をTODO項目から集計し直すコマンド.
+
+TODOリストをid順にchunk_size件ずつ処理し、チャンクごとに短いトランザクションで集計・更新する。
+件数の修正ではTODOリストのupdated_atを更新しない。集計中はチャンク内のTODOリストの行をロックするため、並行するTODO項目の登録・削除による件数の更新と競合しない。
+APIの読み取りキャッシュは無効化しないため、修正した件数はCACHE_TTL_SECONDSの経過後にレスポンスへ反映される。
+
+実行方法: python -m app.commands.reconcile_counters [--chunk-size 1000] [--dry-run]
+"""
+
+import argparse
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.const import TodoItemStatusCode
+from app.database import SessionLocal
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+
+
+def reconcile_counters(db: Session, chunk_size: int = 1000, *, dry_run: bool = False) -> tuple[int, list[dict]]:
+    """件数カウンタを集計し直し、確認したTODOリストの件数と、ずれていたTODOリストの一覧を返す.
+
+    dry_runがTrueの場合は更新せずにずれの検出のみ行う。
+    """
+    todo_lists = ListModel.__table__
+    checked = 0
+    drifts = []
+    last_id = 0
+    while True:
+        stmt = select(todo_lists.c.id, todo_lists.c.item_count, todo_lists.c.completed_count)\
+            .where(todo_lists.c.id > last_id)\
+            .order_by(todo_lists.c.id)\
+            .limit(chunk_size)
+        if not dry_run:
+            stmt = stmt.with_for_update()
+        stored_rows = db.execute(stmt).all()
+        if not stored_rows:
+            db.rollback()
+            break
+        last_id = stored_rows[-1].id
+        checked += len(stored_rows)
+
+        actual = {
+            row.todo_list_id: (row.item_count, int(row.completed_count))
+            for row in db.execute(
+                select(
+                    ItemModel.todo_list_id,
+                    func.count().label("item_count"),
+                    func.sum(case((ItemModel.status_code == TodoItemStatusCode.COMPLETED.value, 1), else_=0)).label("completed_count"),
+                )
+                .where(ItemModel.todo_list_id.in_([x.id for x in stored_rows]))
+                .group_by(ItemModel.todo_list_id),
+            )
+        }
+        for row in stored_rows:
+            item_count, completed_count = actual.get(row.id, (0, 0))
+            if (row.item_count, row.completed_count) == (item_count, completed_count):
+                continue
+            drifts.append({
+                "todo_list_id": row.id,
+                "item_count": (row.item_count, item_count),
+                "completed_count": (row.completed_count, completed_count),
+            })
+            if not dry_run:
+                db.execute(update(todo_lists).where(todo_lists.c.id == row.id).values(
+                    item_count=item_count,
+                    completed_count=completed_count,
+                    updated_at=todo_lists.c.updated_at,
+                ))
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    return checked, drifts
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=1000, help="number of todo lists per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without updating the counters")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        checked, drifts = reconcile_counters(db, args.chunk_size, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for drift in drifts:
+        print(  # noqa: T201
+            f"todo_list_id={drift['todo_list_id']}"
+            f" item_count: {drift['item_count'][0]} -> {drift['item_count'][1]}"
+            f" completed_count: {drift['completed_count'][0]} -> {drift['completed_count'][1]}",
+        )
+    action = "found" if args.dry_run else "fixed"
+    print(f"checked {checked} todo lists, {action} {len(drifts)} with drifted counters")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""ETag・Last-Modifiedによる条件付きGET用モジュール.
+
+ETagはレスポンスボディではなく、行のidと更新日時などのバージョンから作成する。
+ボディを作成する前に条件付きリクエストを判定できるため、304を返す場合はエンティティの取得・変換・シリアライズを省略できる。
+updated_atは秒単位のため、直近に更新された行は同じ秒内の後続の更新でバージョンが変わらない可能性がある。
+その場合はバージョンからETagを作成せず、従来どおりボディを作成してからボディのハッシュで判定する。
+"""
+
+import hashlib
+import json
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from app.database import current_timestamp
+
+# 更新日時がこの秒数より前であれば、以降の更新では必ず更新日時が進むとみなす(DBとアプリの時計のずれも見込む)
+VERSION_SETTLE_SECONDS = 2
+
+
+def _digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def make_etag(version: dict, *variant) -> str | None:  # noqa: ANN002
+    """バージョンと、レスポンスの形を変えるクエリ文字列の値(variant)から弱いETagを作成する.
+
+    バージョンのupdated_atが直近の場合は、同じ秒内の更新を区別できないためNoneを返す。
+    """
+    updated_at = version["updated_at"]
+    if updated_at is not None and updated_at > current_timestamp() - timedelta(seconds=VERSION_SETTLE_SECONDS):
+        return None
+    raw = json.dumps([version, *variant], separators=(",", ":"), default=str).encode()
+    return f'W/"{_digest(raw)}"'
+
+
+def is_conditional(request: Request) -> bool:
+    """If-None-Match・If-Modified-Sinceのいずれかが指定されていればTrueを返す."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Matchの値にETagが含まれるか(弱い比較)を判定する."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [x.strip().removeprefix("W/") for x in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """If-Modified-Sinceの日時以降に更新されていないかを判定する."""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified.replace(tzinfo=UTC, microsecond=0) <= since
+
+
+def _preconditions_match(request: Request, etag: str, last_modified: datetime | None, use_if_modified_since: bool) -> bool:
+    """条件付きリクエストに一致するかを判定する. If-None-Matchが指定されている場合はIf-Modified-Sinceを評価しない(RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if if_modified_since is not None and last_modified is not None and use_if_modified_since:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def _validator_headers(etag: str, last_modified: datetime | None) -> dict:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=UTC), usegmt=True)
+    return headers
+
+
+def _not_modified_response(etag: str, last_modified: datetime | None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_validator_headers(etag, last_modified))
+
+
+def not_modified(
+    request: Request,
+    etag: str | None,
+    last_modified: datetime | None = None,
+    *,
+    use_if_modified_since: bool = True,
+) -> Response | None:
+    """ボディを作成する前に、条件付きリクエストに一致すれば304のレスポンスを、そうでなければNoneを返す.
+
+    etagがNone(バージョンから判定できない)場合もNoneを返し、conditional_responseでボディを作成してから判定する。
+    last_modifiedはDBに保存されたUTCの日時とみなす。
+    一覧のように行の削除で最終更新日時が変わらないレスポンスでは、use_if_modified_sinceをFalseにしてETagのみで判定する。
+    """
+    if etag is None or not _preconditions_match(request, etag, last_modified, use_if_modified_since):
+        return None
+    return _not_modified_response(etag, last_modified)
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: str | None = None,
+    last_modified: datetime | None = None,
+    *,
+    use_if_modified_since: bool = True,
+) -> Response:
+    """条件付きリクエストに一致すれば304を、そうでなければボディ付きの200を返す.
+
+    etagがNoneの場合は、ボディのハッシュから強いETagを作成する。
+    """
+    if etag is None:
+        etag = f'"{_digest(body)}"'
+    if _preconditions_match(request, etag, last_modified, use_if_modified_since):
+        return _not_modified_response(etag, last_modified)
+    return Response(content=body, media_type="application/json", headers=_validator_headers(etag, last_modified))
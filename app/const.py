@@ -1,15 +1,91 @@
 """定数定義モジュール."""
 
 import os
-from enum import Enum
+from enum import IntEnum
 
 DB_HOST = os.getenv("DB_HOST")
 DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS")
+# コネクションプールの設定
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# MySQLのwait_timeoutより短い秒数でコネクションを作り直す
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true") == "true"
+# テストのようにリクエストごとにイベントループが変わる環境では、非同期エンジンのコネクションをプールしない
+DB_ASYNC_NULL_POOL = os.getenv("DB_ASYNC_NULL_POOL", "") == "true"
 
+# リードレプリカのURL(mysql+aiomysql://...)をカンマ区切りで指定すると、読み取り専用のエンドポイントはレプリカから読み取る
+# レプリカが複数ある場合は、応答時間の移動平均が短い方に振り分ける
+DB_REPLICA_URLS = [x.strip() for x in os.getenv("DB_REPLICA_URLS", "").split(",") if x.strip()]
+# 接続エラーが発生したレプリカへの振り分けを停止する秒数
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+# 更新の後、同じクライアントからの読み取りをプライマリに送る秒数。レプリカの遅延より長くする
+# クライアントはX-Client-Idヘッダ、なければX-Forwarded-Forの先頭のアドレス、それもなければ接続元IPアドレスで識別し、
+# 件数上限で破棄されない状態保存用のストアに記録する
+# CACHE_REDIS_URLが未設定の場合は記録がワーカーごとになるため、更新と異なるワーカーでの読み取りにはレプリカの遅延が見える
+DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
 
-class TodoItemStatusCode(Enum):
+# trueの場合、リクエストごとのSQLの実行件数と合計時間をServer-Timing・X-DB-Queriesヘッダで返す
+# 実行件数がSQL_N_PLUS_ONE_THRESHOLDを超えたリクエストはN+1クエリの疑いとしてX-DB-N-Plus-One-Suspectヘッダを付与し、ログに出力する
+SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true") == "true"
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "20"))
+
+# /metricsで公開するメトリクス
+# 複数のワーカープロセスで動かす場合は、全ワーカーで共有するディレクトリをMETRICS_MULTIPROC_DIRに指定する
+# 各ワーカーはMETRICS_SNAPSHOT_INTERVAL_SECONDSごとに自身の値をこのディレクトリに書き出す
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true") == "true"
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+METRICS_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("METRICS_SNAPSHOT_INTERVAL_SECONDS", "5"))
+
+# trueの場合、登録時にSELECTによる親リストの存在確認とrefreshを行わず、INSERTとCOMMITのみで登録する
+LEAN_WRITES = os.getenv("LEAN_WRITES", "true") == "true"
+
+# TODO項目の一括登録で1回のリクエストに含められる件数と、1回のINSERTで登録する件数
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
+
+# TODO項目のインポートで1トランザクションに登録する件数と、レスポンスに含めるエラーの最大件数
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# TODO項目のエクスポートでサーバーサイドカーソルから1回に取り出す件数
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "500"))
+
+# TODOリストの削除で1トランザクションに削除するTODO項目の件数
+DELETE_CHUNK_SIZE = int(os.getenv("DELETE_CHUNK_SIZE", "1000"))
+
+# 論理削除された行の物理削除
+# 削除からPURGE_RETENTION_SECONDS秒が経過するまでは復元できる。物理削除はPURGE_INTERVAL_SECONDSごとにPURGE_BATCH_SIZE件ずつ行い、
+# コネクションプールの使用率がPURGE_MAX_POOL_USAGEを超えている間は負荷が高いとみなして次の周期まで見送る
+PURGE_ENABLED = os.getenv("PURGE_ENABLED", "true") == "true"
+PURGE_RETENTION_SECONDS = int(os.getenv("PURGE_RETENTION_SECONDS", "86400"))
+PURGE_INTERVAL_SECONDS = float(os.getenv("PURGE_INTERVAL_SECONDS", "60"))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+PURGE_BATCH_PAUSE_SECONDS = float(os.getenv("PURGE_BATCH_PAUSE_SECONDS", "0.5"))
+PURGE_MAX_POOL_USAGE = float(os.getenv("PURGE_MAX_POOL_USAGE", "0.5"))
+
+# バックグラウンドジョブの状態を保持する秒数
+# 状態はCACHE_REDIS_URLのRedis、未設定の場合はプロセス内に保存する。プロセス内の場合はジョブを作成したワーカーでしか
+# 状態を参照できないため、複数のワーカーでasync=trueの削除を使う場合はCACHE_REDIS_URLを設定すること
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "86400"))
+
+# TODOリスト・TODO項目の読み取りキャッシュ
+# CACHE_REDIS_URLを設定すると全ワーカー共有のRedisを、未設定の場合はプロセス内のLRUを利用する
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true") == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+# プロセス内のLRUはワーカーごとのため、あるワーカーでの更新による無効化は他のワーカーに反映されず、
+# 他のワーカーは最大CACHE_TTL_SECONDSの間、更新前の値を返す。複数のワーカーで動かす場合はRedisを設定するか、
+# CACHE_ENABLEDをfalseにすること
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+# Redisのキーの接頭辞。キャッシュの全削除はこの接頭辞の付いたキャッシュのキーに限る
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "todo_api:")
+
+
+class TodoItemStatusCode(IntEnum):
     """TODO項目のステータス."""
     NOT_COMPLETED = 1
     COMPLETED = 2
@@ -0,0 +1,599 @@
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+import anyio
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from app import const
+from app.cache import entity_cache
+from app.const import TodoItemStatusCode
+from app.database import AsyncSessionLocal, current_timestamp
+from app.item_import import RecordError
+
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+from app.pagination import decode_cursor
+
+from app.schemas.item_schema import BulkUpdateTodoItems, NewTodoItem, ResponseTodoItem, UpdateTodoItem
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only
+
+# item_crudの非同期版。APIのリクエスト処理からはこちらを利用する
+
+# 親のTODOリストが存在することを確認する
+async def ensure_todo_list(
+    db: AsyncSession,
+    todo_list_id: int
+):
+    parent_list_id = await db.scalar(select(ListModel.id).where(ListModel.id == todo_list_id))
+    if parent_list_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo List not found"
+        )
+
+# TODO項目を、論理削除されていないTODOリストに属するものに絞り込む
+# TODOリストの論理削除ではTODO項目を更新しないため、TODO項目の取得では親のTODOリストを結合して判定する
+# 結合したTODOリストにはdatabase._exclude_deleted_rowsによって論理削除の条件が追加される
+def _with_alive_list(stmt):
+    return stmt.join(ListModel, ListModel.id == ItemModel.todo_list_id)
+
+# Coreのテーブルに対する文で、論理削除されていないTODOリスト・TODO項目に絞り込む条件
+def _alive_conditions(todo_list_id: int):
+    todo_lists = ListModel.__table__
+    alive_list = select(todo_lists.c.id).where(todo_lists.c.id == todo_list_id, todo_lists.c.deleted_at.is_(None))
+    return [ItemModel.todo_list_id.in_(alive_list), ItemModel.deleted_at.is_(None)]
+
+# 期限日時順に並べる場合のカーソルのソートキー
+DUE_AT_CURSOR_KEYS = ("due_at", "id")
+
+# タイムゾーン付きの日時をDBに保存している形式(UTC・タイムゾーンなし)に揃える
+def _as_utc(value: datetime):
+    return value if value.tzinfo is None else value.astimezone(UTC).replace(tzinfo=None)
+
+# 期限日時順(期限なしが先頭)のキーセットページネーションで、カーソルより後の項目を取得する条件を組み立てる
+def _due_at_cursor_condition(cursor: str):
+    values = decode_cursor(cursor, DUE_AT_CURSOR_KEYS)
+    if values["due_at"] is None:
+        return or_(and_(ItemModel.due_at.is_(None), ItemModel.id > values["id"]), ItemModel.due_at.is_not(None))
+    try:
+        last_due_at = datetime.fromisoformat(values["due_at"])
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from None
+    return or_(ItemModel.due_at > last_due_at, and_(ItemModel.due_at == last_due_at, ItemModel.id > values["id"]))
+
+# TODO項目のETagの元にするカラム
+ITEM_VERSION_COLUMNS = ("id", "updated_at")
+
+# TODO項目一覧の1ページ分を取得する文を組み立てる。一覧の取得とバージョンの取得で同じ絞り込み・ページの範囲を使う
+# (todo_list_id, status_code, due_at)・(todo_list_id, due_at)のインデックスで絞り込みと並べ替えを行う
+def _todo_items_page(
+    stmt,
+    todo_list_id: int,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    status_code: TodoItemStatusCode | None,
+    due_before: datetime | None,
+    due_after: datetime | None,
+    sort: str,
+):
+    stmt = _with_alive_list(stmt).where(ItemModel.todo_list_id == todo_list_id)
+    if status_code is not None:
+        stmt = stmt.where(ItemModel.status_code == status_code.value)
+    if due_after is not None:
+        stmt = stmt.where(ItemModel.due_at >= _as_utc(due_after))
+    if due_before is not None:
+        stmt = stmt.where(ItemModel.due_at < _as_utc(due_before))
+    if sort == "due_at":
+        stmt = stmt.order_by(ItemModel.due_at, ItemModel.id)
+        if cursor is not None:
+            stmt = stmt.where(_due_at_cursor_condition(cursor))
+    else:
+        stmt = stmt.order_by(ItemModel.id)
+        if cursor is not None:
+            last_id = decode_cursor(cursor)["id"]
+            stmt = stmt.where(ItemModel.id > last_id)
+    if cursor is None:
+        stmt = stmt.offset((page - 1) * per_page)
+    return stmt.limit(per_page)
+
+# TODOリストに紐づくTODOアイテムを取得するエンドポイント
+# fieldsが指定された場合は、指定されたカラム(とバージョンのカラム)のみをSELECTする
+# status_code・期限日時で絞り込み、sortに"due_at"を指定すると期限日時順(期限なしが先頭)に並べる
+async def get_todo_items(
+    db: AsyncSession,
+    todo_list_id: int,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
+    status_code: TodoItemStatusCode | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    sort: str = "id",
+):
+    stmt = select(ItemModel)
+    if fields is not None:
+        # 次ページのカーソルを作成するため、ソートキーは指定がなくても取得する
+        columns = {*fields, *ITEM_VERSION_COLUMNS, *(DUE_AT_CURSOR_KEYS if sort == "due_at" else ())}
+        stmt = stmt.options(load_only(*(getattr(ItemModel, x) for x in columns), raiseload=True))
+    stmt = _todo_items_page(stmt, todo_list_id, page, per_page, cursor, status_code, due_before, due_after, sort)
+    db_items = await db.scalars(stmt)
+    return db_items.all()
+
+# TODO項目一覧の1ページのバージョン
+# 件数とidの合計でページに含まれる行の増減を、更新日時の最大値で行の更新を検知する
+def _todo_items_version(count, id_sum, updated_at):
+    return {"count": count, "id_sum": int(id_sum or 0), "updated_at": updated_at}
+
+# 取得済みのTODO項目一覧からバージョンを求める
+def todo_items_version(db_items):
+    return _todo_items_version(len(db_items), sum(x.id for x in db_items), max((x.updated_at for x in db_items), default=None))
+
+# TODO項目一覧の1ページのバージョンを、ページの範囲の集計1回で取得する
+# 条件付きリクエストで、一覧の取得・変換・シリアライズの前に304を返せるかを判定するために使う
+async def get_todo_items_version(
+    db: AsyncSession,
+    todo_list_id: int,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    status_code: TodoItemStatusCode | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    sort: str = "id",
+):
+    stmt = select(*(getattr(ItemModel, x) for x in ITEM_VERSION_COLUMNS))
+    page_rows = _todo_items_page(stmt, todo_list_id, page, per_page, cursor, status_code, due_before, due_after, sort).subquery()
+    row = (await db.execute(select(func.count(), func.sum(page_rows.c.id), func.max(page_rows.c.updated_at)))).one()
+    return _todo_items_version(*row)
+
+# 全TODOリストから期限切れ(未完了かつ期限日時が現在より前)のTODO項目を期限日時順に取得する
+# (status_code, due_at)のインデックスを範囲検索し、期限日時順にそのまま読み出す
+async def get_overdue_todo_items(
+    db: AsyncSession,
+    per_page: int = 10,
+    cursor: str | None = None,
+):
+    stmt = _with_alive_list(select(ItemModel))\
+        .where(ItemModel.status_code == TodoItemStatusCode.NOT_COMPLETED.value, ItemModel.due_at < current_timestamp())\
+        .order_by(ItemModel.due_at, ItemModel.id)
+    if cursor is not None:
+        stmt = stmt.where(_due_at_cursor_condition(cursor))
+    db_items = await db.scalars(stmt.limit(per_page))
+    return db_items.all()
+
+# 複数のTODOリストについて、それぞれ先頭からlimit件のTODO項目を1回のクエリで取得する
+# TODOリストごとにROW_NUMBER()で連番を振り、連番がlimit以下の項目のみを返す
+async def get_todo_items_for_lists(
+    db: AsyncSession,
+    todo_list_ids: list[int],
+    limit: int
+):
+    todo_items = {x: [] for x in todo_list_ids}
+    if not todo_list_ids:
+        return todo_items
+    item_position = func.row_number().over(partition_by=ItemModel.todo_list_id, order_by=ItemModel.id).label("item_position")
+    numbered_items = select(ItemModel, item_position).where(ItemModel.todo_list_id.in_(todo_list_ids)).subquery()
+    numbered_item = aliased(ItemModel, numbered_items)
+    db_items = await db.scalars(
+        select(numbered_item)
+        .where(numbered_items.c.item_position <= limit)
+        .order_by(numbered_items.c.todo_list_id, numbered_items.c.id),
+    )
+    for db_item in db_items:
+        todo_items[db_item.todo_list_id].append(db_item)
+    return todo_items
+
+# for_updateがTrueの場合は、カウンタの更新が終わるまで他のトランザクションからの更新をロックする
+async def _get_todo_item(
+    db: AsyncSession,
+    todo_list_id: int,
+    todo_item_id: int,
+    for_update: bool = False
+):
+    stmt = _with_alive_list(select(ItemModel)).where(ItemModel.todo_list_id == todo_list_id, ItemModel.id == todo_item_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    db_item = await db.scalar(stmt)
+    if db_item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo Item not found"
+        )
+    return db_item
+
+# TODO項目のバージョン(ETagの元にする値)を返す
+def todo_item_version(todo_item):
+    return {x: getattr(todo_item, x) for x in ITEM_VERSION_COLUMNS}
+
+# TODO項目のバージョンを取得する
+# キャッシュに載っている場合はDBにアクセスせず、載っていない場合もバージョンのカラムのみをSELECTする
+async def get_todo_item_version(
+    db: AsyncSession,
+    todo_list_id: int,
+    todo_item_id: int
+):
+    cached_item = await entity_cache.get(await entity_cache.item_key(todo_list_id, todo_item_id), ResponseTodoItem)
+    if cached_item is not None:
+        return todo_item_version(cached_item)
+    row = (await db.execute(
+        _with_alive_list(select(*(getattr(ItemModel, x) for x in ITEM_VERSION_COLUMNS)))
+        .where(ItemModel.todo_list_id == todo_list_id, ItemModel.id == todo_item_id),
+    )).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo Item not found"
+        )
+    return todo_item_version(row)
+
+# キャッシュにない場合のみDBから取得し、レスポンススキーマの形でキャッシュする
+# レプリカから取得した値は反映の遅延で古い可能性があるためキャッシュしない
+async def get_todo_item(
+    db: AsyncSession,
+    todo_list_id: int,
+    todo_item_id: int
+):
+    cache_key = await entity_cache.item_key(todo_list_id, todo_item_id)
+    cached_item = await entity_cache.get(cache_key, ResponseTodoItem)
+    if cached_item is not None:
+        return cached_item
+    todo_item = ResponseTodoItem.model_validate(await _get_todo_item(db, todo_list_id, todo_item_id), from_attributes=True)
+    if "replica" not in db.info:
+        await entity_cache.set(cache_key, todo_item)
+    return todo_item
+
+# TODO項目エクスポートエンドポイント
+# サーバーサイドカーソルからEXPORT_YIELD_PER件ずつ取り出し、NDJSON(1行1項目)として順次出力する
+# レスポンスの送信中もカーソルを保持する必要があるため、リクエストのセッションとは別にセッションを開く
+# クライアントが途中で切断した場合もカーソルと接続を解放できるよう、呼び出し側は送信の終了後にaclose()する
+# 切断によるキャンセルで取得の途中の接続が破棄されないよう、クエリの実行・チャンクの取得・解放はキャンセルから保護する
+async def export_todo_items(
+    todo_list_id: int
+):
+    stmt = select(*ItemModel.__table__.columns)\
+        .where(ItemModel.todo_list_id == todo_list_id, ItemModel.deleted_at.is_(None))\
+        .order_by(ItemModel.id)\
+        .execution_options(yield_per=const.EXPORT_YIELD_PER)
+    db = AsyncSessionLocal()
+    result = None
+    try:
+        with anyio.CancelScope(shield=True):
+            result = await db.stream(stmt)
+        partitions = result.mappings().partitions()
+        while True:
+            with anyio.CancelScope(shield=True):
+                rows = await anext(partitions, None)
+            if rows is None:
+                break
+            yield b"".join(ResponseTodoItem.model_validate(x).model_dump_json().encode() + b"\n" for x in rows)
+    finally:
+        with anyio.CancelScope(shield=True):
+            if result is not None:
+                await result.close()
+            await db.close()
+
+# TODOリストの件数カウンタ(item_count・completed_count)をSQL上で加算する
+# 対象のTODOリストの行はトランザクションの終了までロックされる。TODOリストが存在しない(論理削除済みを含む)場合はFalseを返す
+# カウンタはTODOリスト自体の更新ではないため、ON UPDATE CURRENT_TIMESTAMPによるupdated_atの更新を抑止する
+async def _increment_counters(
+    db: AsyncSession,
+    todo_list_id: int,
+    items: int = 0,
+    completed: int = 0
+):
+    todo_lists = ListModel.__table__
+    result = await db.execute(update(todo_lists).where(todo_lists.c.id == todo_list_id, todo_lists.c.deleted_at.is_(None)).values(
+        item_count=todo_lists.c.item_count + items,
+        completed_count=todo_lists.c.completed_count + completed,
+        updated_at=todo_lists.c.updated_at,
+    ))
+    return result.rowcount > 0
+
+# TODOリストの完了件数をTODO項目から数え直す
+async def _recount_completed(
+    db: AsyncSession,
+    todo_list_id: int
+):
+    todo_lists = ListModel.__table__
+    completed_count = select(func.count())\
+        .where(
+            ItemModel.todo_list_id == todo_list_id,
+            ItemModel.status_code == TodoItemStatusCode.COMPLETED.value,
+            ItemModel.deleted_at.is_(None),
+        )\
+        .scalar_subquery()
+    await db.execute(update(todo_lists).where(todo_lists.c.id == todo_list_id).values(
+        completed_count=completed_count,
+        updated_at=todo_lists.c.updated_at,
+    ))
+
+# TODO 項目作成エンドポイント
+async def post_todo_item(
+    db: AsyncSession,
+    todo_list_id: int,
+    data: NewTodoItem
+):
+    new_db_item = ItemModel(
+        todo_list_id=todo_list_id,
+        title=data.title,
+        description=data.description,
+        due_at=data.due_at,
+        status_code=TodoItemStatusCode.NOT_COMPLETED.value
+    )
+    if not const.LEAN_WRITES:
+        parent_list = await db.scalar(select(ListModel).where(ListModel.id == todo_list_id))
+        if parent_list is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Todo Item not found"
+            )
+        await _increment_counters(db, todo_list_id, items=1)
+        db.add(new_db_item)
+        await db.commit()
+        await entity_cache.invalidate_list(todo_list_id)
+        await db.refresh(new_db_item)
+        return new_db_item
+
+    # 親リストの存在確認はカウンタのUPDATEの更新件数で行い、登録日時をアプリ側で設定してrefreshを省略する
+    if not await _increment_counters(db, todo_list_id, items=1):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo List not found"
+        )
+    new_db_item.created_at = new_db_item.updated_at = current_timestamp()
+    db.add(new_db_item)
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id)
+    return new_db_item
+
+# 複数行INSERTでTODO項目を登録し、採番されたidを返す
+# 1文の複数行INSERTで採番されるidは連番となるため、先頭のid(lastrowid)から件数分のidを求める
+# TODOリストのカウンタも同じトランザクションで加算する
+async def _insert_todo_items(
+    db: AsyncSession,
+    todo_list_id: int,
+    data: list[NewTodoItem]
+):
+    await _increment_counters(db, todo_list_id, items=len(data))
+    ids = []
+    for start in range(0, len(data), const.BULK_INSERT_BATCH_SIZE):
+        batch = data[start:start + const.BULK_INSERT_BATCH_SIZE]
+        result = await db.execute(insert(ItemModel.__table__).values([{
+            "todo_list_id": todo_list_id,
+            "title": x.title,
+            "description": x.description,
+            "due_at": x.due_at,
+            "status_code": TodoItemStatusCode.NOT_COMPLETED.value,
+        } for x in batch]))
+        ids.extend(range(result.lastrowid, result.lastrowid + len(batch)))
+    return ids
+
+# TODO項目一括作成エンドポイント
+async def post_todo_items(
+    db: AsyncSession,
+    todo_list_id: int,
+    data: list[NewTodoItem]
+):
+    await ensure_todo_list(db, todo_list_id)
+    ids = await _insert_todo_items(db, todo_list_id, data)
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id)
+    db_items = await db.scalars(
+        select(ItemModel).where(ItemModel.todo_list_id == todo_list_id, ItemModel.id.in_(ids)).order_by(ItemModel.id),
+    )
+    return db_items.all()
+
+# TODO項目インポートエンドポイント
+# 受信したレコードを1行ずつ検証し、IMPORT_BATCH_SIZE件ごとに別トランザクションで登録する
+# 登録が終わるまで次のレコードを読み込まないため、DBより速く送信されてもメモリに溜まらない
+async def import_todo_items(
+    db: AsyncSession,
+    todo_list_id: int,
+    records: AsyncIterator[tuple[int, dict | RecordError]]
+):
+    await ensure_todo_list(db, todo_list_id)
+    started_at = time.perf_counter()
+    imported = 0
+    failed = 0
+    errors = []
+
+    def add_error(line_no: int, messages: list[str]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < const.IMPORT_MAX_ERRORS:
+            errors.append({"line": line_no, "errors": messages})
+
+    async def flush(batch: list[tuple[int, NewTodoItem]]) -> None:
+        nonlocal imported
+        try:
+            await _insert_todo_items(db, todo_list_id, [x for _, x in batch])
+            await db.commit()
+            imported += len(batch)
+        except DBAPIError:
+            await db.rollback()
+            # どの行が原因か特定するため、1件ずつ登録し直す
+            for line_no, data in batch:
+                try:
+                    await _insert_todo_items(db, todo_list_id, [data])
+                    await db.commit()
+                    imported += 1
+                except DBAPIError as e:
+                    await db.rollback()
+                    add_error(line_no, [str(e.orig)])
+
+    batch = []
+    async for line_no, record in records:
+        if isinstance(record, RecordError):
+            add_error(line_no, [str(record)])
+            continue
+        try:
+            batch.append((line_no, NewTodoItem.model_validate(record)))
+        except ValidationError as e:
+            add_error(line_no, [f"{'.'.join(map(str, x['loc']))}: {x['msg']}" for x in e.errors()])
+            continue
+        if len(batch) >= const.IMPORT_BATCH_SIZE:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    if imported:
+        await entity_cache.invalidate_list(todo_list_id)
+
+    elapsed_seconds = time.perf_counter() - started_at
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "rows_per_second": round((imported + failed) / elapsed_seconds, 1) if elapsed_seconds > 0 else 0.0,
+    }
+
+# TODO項目更新エンドポイント
+async def update_todo_item(
+    db: AsyncSession,
+    todo_list_id: int,
+    todo_item_id: int,
+    data: UpdateTodoItem
+):
+    db_item = await _get_todo_item(db, todo_list_id, todo_item_id, for_update=data.complete is not None)
+    if data.title is not None:
+        db_item.title = data.title
+    if data.description is not None:
+        db_item.description = data.description
+    if data.due_at is not None:
+        db_item.due_at = data.due_at
+    status_changed = False
+    if data.complete is not None:
+        status_code = TodoItemStatusCode.COMPLETED.value if data.complete else TodoItemStatusCode.NOT_COMPLETED.value
+        status_changed = db_item.status_code != status_code
+        if status_changed:
+            await _increment_counters(db, todo_list_id, completed=1 if data.complete else -1)
+        db_item.status_code = status_code
+
+    await db.commit()
+    await entity_cache.invalidate_item(todo_list_id, todo_item_id)
+    if status_changed:
+        await entity_cache.invalidate_list(todo_list_id)
+    await db.refresh(db_item)
+    return db_item
+
+# 更新内容から一括更新用のカラムと値を組み立てる
+def _update_values(data: UpdateTodoItem):
+    values = {}
+    if data.title is not None:
+        values["title"] = data.title
+    if data.description is not None:
+        values["description"] = data.description
+    if data.due_at is not None:
+        values["due_at"] = data.due_at
+    if data.complete is not None:
+        values["status_code"] = TodoItemStatusCode.COMPLETED.value if data.complete else TodoItemStatusCode.NOT_COMPLETED.value
+    return values
+
+# TODO項目一括更新エンドポイント
+# 対象の項目を1件ずつ読み込まず、UPDATE ... WHERE todo_list_id = ? AND id IN (...) の1文で更新する
+async def update_todo_items(
+    db: AsyncSession,
+    todo_list_id: int,
+    data: BulkUpdateTodoItems
+):
+    conditions = [ItemModel.todo_list_id == todo_list_id, *_alive_conditions(todo_list_id)]
+    if data.ids is not None:
+        conditions.append(ItemModel.id.in_(data.ids))
+    if data.status_code is not None:
+        conditions.append(ItemModel.status_code == data.status_code.value)
+    if data.return_items:
+        # 更新後はstatus_codeの条件に一致しなくなるため、先に対象のidを確定させておく
+        target_ids = await db.scalars(select(ItemModel.id).where(*conditions).with_for_update())
+        conditions = [ItemModel.todo_list_id == todo_list_id, ItemModel.id.in_(target_ids.all()), ItemModel.deleted_at.is_(None)]
+
+    updated = 0
+    values = _update_values(data.patch)
+    if values:
+        result = await db.execute(update(ItemModel.__table__).where(*conditions).values(**values))
+        updated = result.rowcount
+    if updated and "status_code" in values:
+        # ステータスが実際に変わった件数は分からないため、完了件数を数え直す
+        await _recount_completed(db, todo_list_id)
+    await db.commit()
+    if updated:
+        # 更新された項目を特定せず、TODOリストに属する項目のキャッシュをまとめて無効化する
+        await entity_cache.invalidate_list(todo_list_id, items=True)
+
+    if updated == 0:
+        await ensure_todo_list(db, todo_list_id)
+
+    db_items = None
+    if data.return_items:
+        db_items = await db.scalars(select(ItemModel).where(*conditions).order_by(ItemModel.id))
+        db_items = db_items.all()
+    return {"updated": updated, "items": db_items}
+
+# TODO項目削除エンドポイント
+# 行を削除せずに削除日時を設定して論理削除する。物理削除はapp.purgerがPURGE_RETENTION_SECONDSの経過後にまとめて行う
+async def delete_todo_item(
+    db: AsyncSession,
+    todo_list_id: int,
+    todo_item_id: int
+):
+    db_item = await _get_todo_item(db, todo_list_id, todo_item_id, for_update=True)
+
+    db_item.deleted_at = current_timestamp()
+    await _increment_counters(
+        db,
+        todo_list_id,
+        items=-1,
+        completed=-1 if db_item.status_code == TodoItemStatusCode.COMPLETED.value else 0,
+    )
+    await db.commit()
+    await entity_cache.invalidate_item(todo_list_id, todo_item_id)
+    await entity_cache.invalidate_list(todo_list_id)
+    return {}
+
+# 論理削除されたTODO項目を復元するエンドポイント
+# TODOリストが論理削除されている場合や、TODO項目が物理削除済みの場合は404を返す
+async def restore_todo_item(
+    db: AsyncSession,
+    todo_list_id: int,
+    todo_item_id: int
+):
+    db_item = await db.scalar(
+        _with_alive_list(select(ItemModel))
+        .where(
+            ItemModel.todo_list_id == todo_list_id,
+            ItemModel.id == todo_item_id,
+            ItemModel.deleted_at.is_not(None),
+            ListModel.deleted_at.is_(None),
+        )
+        .with_for_update()
+        .execution_options(include_deleted=True),
+    )
+    if db_item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted Todo Item not found"
+        )
+
+    db_item.deleted_at = None
+    await _increment_counters(
+        db,
+        todo_list_id,
+        items=1,
+        completed=1 if db_item.status_code == TodoItemStatusCode.COMPLETED.value else 0,
+    )
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id)
+    await db.refresh(db_item)
+    return db_item
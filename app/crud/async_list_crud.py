@@ -0,0 +1,355 @@
+import functools
+import hashlib
+import logging
+import operator
+
+from fastapi import HTTPException, status
+
+from app import const
+from app.cache import entity_cache
+from app.const import TodoItemStatusCode
+from app.database import AsyncSessionLocal, current_timestamp
+from app.jobs import JobStatus, create_job, update_job
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+from app.pagination import decode_cursor
+
+from app.schemas.list_schema import NewTodoList, ResponseTodoList, UpdateTodoList
+
+from sqlalchemy import BigInteger, case, cast, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+# list_crudの非同期版。APIのリクエスト処理からはこちらを利用する
+
+logger = logging.getLogger(__name__)
+
+# TODOリストのETagの元にするカラム。件数カウンタの更新ではupdated_atが変わらないため、件数も含める
+LIST_VERSION_COLUMNS = ("id", "updated_at", "item_count", "completed_count")
+
+# 一覧の1ページ分を取得する文を組み立てる。一覧の取得とバージョンの取得で同じページの範囲を使う
+def _todo_lists_page(
+    stmt,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+):
+    stmt = stmt.order_by(ListModel.id)
+    if cursor is not None:
+        last_id = decode_cursor(cursor)["id"]
+        stmt = stmt.where(ListModel.id > last_id)
+    else:
+        stmt = stmt.offset((page - 1) * per_page)
+    return stmt.limit(per_page)
+
+# TODOリスト一覧を取得するエンドポイント
+# fieldsが指定された場合は、指定されたカラム(とバージョンのカラム)のみをSELECTする
+async def get_todo_lists(
+    db: AsyncSession,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
+):
+    stmt = select(ListModel)
+    if fields is not None:
+        columns = {*fields, *LIST_VERSION_COLUMNS}
+        stmt = stmt.options(load_only(*(getattr(ListModel, x) for x in columns), raiseload=True))
+    db_lists = await db.scalars(_todo_lists_page(stmt, page, per_page, cursor))
+    return db_lists.all()
+
+# TODOリスト一覧の1ページのバージョン
+# 行ごとのバージョンのカラムのハッシュをXORで畳み込み、ページに含まれる行の増減と各行の更新を検知する
+# 合計値では、ページ内の複数のTODOリストの件数カウンタの増減が打ち消し合った場合に変化しないため、行ごとの値から作成する
+# CRC32はXORに対して線形で、同じ長さの行の変更が打ち消し合うため、MD5の先頭52ビット(倍精度でも正確に扱える桁数)を使う
+ROW_HASH_HEX_DIGITS = 13
+
+def _todo_lists_version(count, checksum, updated_at):
+    return {"count": count, "checksum": int(checksum or 0), "updated_at": updated_at}
+
+# MySQLのCONV(SUBSTRING(MD5(CONCAT_WS(',', ...)), 1, 13), 16, 10)と同じ値を求める
+# CONCAT_WSと同様にNULLの値は除き、日時は秒精度の文字列にする
+def _row_checksum(todo_list):
+    values = (getattr(todo_list, x) for x in LIST_VERSION_COLUMNS)
+    digest = hashlib.md5(",".join(str(x) for x in values if x is not None).encode(), usedforsecurity=False).hexdigest()
+    return int(digest[:ROW_HASH_HEX_DIGITS], 16)
+
+# 取得済みのTODOリスト一覧からバージョンを求める
+def todo_lists_version(db_lists):
+    return _todo_lists_version(
+        len(db_lists),
+        functools.reduce(operator.xor, (_row_checksum(x) for x in db_lists), 0),
+        max((x.updated_at for x in db_lists), default=None),
+    )
+
+# TODOリスト一覧の1ページのバージョンを、ページの範囲の集計1回で取得する
+# 条件付きリクエストで、一覧の取得・変換・シリアライズの前に304を返せるかを判定するために使う
+async def get_todo_lists_version(
+    db: AsyncSession,
+    page: int,
+    per_page: int,
+    cursor: str | None = None,
+):
+    page_rows = _todo_lists_page(select(*(getattr(ListModel, x) for x in LIST_VERSION_COLUMNS)), page, per_page, cursor).subquery()
+    row_hash = func.md5(func.concat_ws(",", *(page_rows.c[x] for x in LIST_VERSION_COLUMNS)))
+    row_checksum = cast(func.conv(func.substring(row_hash, 1, ROW_HASH_HEX_DIGITS), 16, 10), BigInteger)
+    row = (await db.execute(select(
+        func.count(),
+        func.bit_xor(row_checksum),
+        func.max(page_rows.c.updated_at),
+    ))).one()
+    return _todo_lists_version(*row)
+
+# TODOリストごとのTODO項目の件数を取得する
+# ページ内のTODOリストをまとめて1回のGROUP BYで集計する(todo_list_id, status_code, due_atのインデックスのみで完結する)
+async def get_todo_list_stats(
+    db: AsyncSession,
+    todo_list_ids: list[int],
+):
+    stats = {x: {"total": 0, "completed": 0, "overdue": 0} for x in todo_list_ids}
+    if not todo_list_ids:
+        return stats
+    not_completed = ItemModel.status_code == TodoItemStatusCode.NOT_COMPLETED.value
+    stmt = select(
+        ItemModel.todo_list_id,
+        func.count().label("total"),
+        func.sum(case((ItemModel.status_code == TodoItemStatusCode.COMPLETED.value, 1), else_=0)).label("completed"),
+        func.sum(case((not_completed & (ItemModel.due_at < current_timestamp()), 1), else_=0)).label("overdue"),
+    ).where(ItemModel.todo_list_id.in_(todo_list_ids)).group_by(ItemModel.todo_list_id)
+    for row in await db.execute(stmt):
+        stats[row.todo_list_id] = {"total": row.total, "completed": int(row.completed), "overdue": int(row.overdue)}
+    return stats
+
+async def _get_todo_list(
+    todo_list_id: int,
+    db: AsyncSession
+):
+    db_list = await db.scalar(select(ListModel).where(ListModel.id == todo_list_id))
+    if db_list is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo List not found"
+        )
+    return db_list
+
+# TODOリストのバージョン(ETagの元にする値)を返す
+def todo_list_version(todo_list):
+    return {x: getattr(todo_list, x) for x in LIST_VERSION_COLUMNS}
+
+# TODOリストのバージョンを取得する
+# キャッシュに載っている場合はDBにアクセスせず、載っていない場合もバージョンのカラムのみをSELECTする
+async def get_todo_list_version(
+    todo_list_id: int,
+    db: AsyncSession
+):
+    cached_list = await entity_cache.get(entity_cache.list_key(todo_list_id), ResponseTodoList)
+    if cached_list is not None:
+        return todo_list_version(cached_list)
+    row = (await db.execute(
+        select(*(getattr(ListModel, x) for x in LIST_VERSION_COLUMNS)).where(ListModel.id == todo_list_id),
+    )).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo List not found"
+        )
+    return todo_list_version(row)
+
+# TODOリストを取得するエンドポイント
+# キャッシュにない場合のみDBから取得し、レスポンススキーマの形でキャッシュする
+# レプリカから取得した値は反映の遅延で古い可能性があり、更新したクライアントにも返してしまうためキャッシュしない
+async def get_todo_list(
+    todo_list_id: int,
+    db: AsyncSession
+):
+    cache_key = entity_cache.list_key(todo_list_id)
+    cached_list = await entity_cache.get(cache_key, ResponseTodoList)
+    if cached_list is not None:
+        return cached_list
+    todo_list = ResponseTodoList.model_validate(await _get_todo_list(todo_list_id, db), from_attributes=True)
+    if "replica" not in db.info:
+        await entity_cache.set(cache_key, todo_list)
+    return todo_list
+
+# 新規TODOリストを登録するエンドポイント
+async def create_todo_list(
+    data: NewTodoList,
+    db: AsyncSession,
+):
+    new_db_list = ListModel(
+        title=data.title,
+        description=data.description,
+    )
+    if const.LEAN_WRITES:
+        # 登録日時をアプリ側で設定し、refreshによるSELECTを省略する
+        new_db_list.created_at = new_db_list.updated_at = current_timestamp()
+    db.add(new_db_list)
+    await db.commit()
+    if not const.LEAN_WRITES:
+        await db.refresh(new_db_list)
+    return new_db_list
+
+# TODOリストを更新するエンドポイント
+async def update_todo_list(
+    todo_list_id: int,
+    data: UpdateTodoList,
+    db: AsyncSession,
+):
+    db_list = await _get_todo_list(todo_list_id, db)
+    if data.title is not None:
+        db_list.title = data.title
+    if data.description is not None:
+        db_list.description = data.description
+
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id)
+    await db.refresh(db_list)
+    return db_list
+
+# 論理削除されたTODOリストの行をトランザクションの終了までロックする。復元されている(削除日時がない)場合はFalseを返す
+# ロック中の復元はチャンクの削除のコミットまで待たされるため、チャンクの削除とTODOリストの復元が交錯しない
+async def _lock_deleted_todo_list(
+    db: AsyncSession,
+    todo_list_id: int,
+):
+    todo_lists = ListModel.__table__
+    locked_id = await db.scalar(
+        select(todo_lists.c.id)
+        .where(todo_lists.c.id == todo_list_id, todo_lists.c.deleted_at.is_not(None))
+        .with_for_update(),
+    )
+    return locked_id is not None
+
+# TODOリストの件数カウンタを、論理削除されていないTODO項目から数え直す
+async def _recount_counters(
+    db: AsyncSession,
+    todo_list_id: int,
+):
+    todo_lists = ListModel.__table__
+    todo_items = ItemModel.__table__
+    alive_items = select(func.count()).where(todo_items.c.todo_list_id == todo_list_id, todo_items.c.deleted_at.is_(None))
+    await db.execute(update(todo_lists).where(todo_lists.c.id == todo_list_id).values(
+        item_count=alive_items.scalar_subquery(),
+        completed_count=alive_items.where(todo_items.c.status_code == TodoItemStatusCode.COMPLETED.value).scalar_subquery(),
+        updated_at=todo_lists.c.updated_at,
+    ))
+
+# TODOリストに属するTODO項目をDELETE_CHUNK_SIZE件ずつ、チャンクごとに短いトランザクションで物理削除する
+# 1つのトランザクションで全件を削除すると、件数の多いTODOリストでは行ロックを長時間保持してしまう
+# 論理削除済みのTODO項目も削除するため、include_deletedを指定する
+# チャンクごとにTODOリストが論理削除されたままであることを確認し、復元されていれば削除を中止する
+async def _purge_todo_items_in_chunks(
+    db: AsyncSession,
+    todo_list_id: int,
+    on_progress=None,
+):
+    deleted = 0
+    while True:
+        if not await _lock_deleted_todo_list(db, todo_list_id):
+            await db.rollback()
+            return deleted
+        ids = await db.scalars(
+            select(ItemModel.id)
+            .where(ItemModel.todo_list_id == todo_list_id)
+            .order_by(ItemModel.id)
+            .limit(const.DELETE_CHUNK_SIZE)
+            .execution_options(include_deleted=True),
+        )
+        ids = ids.all()
+        if not ids:
+            await db.rollback()
+            return deleted
+        await db.execute(delete(ItemModel.__table__).where(ItemModel.id.in_(ids)))
+        await db.commit()
+        deleted += len(ids)
+        if on_progress is not None:
+            await on_progress(deleted)
+
+# TODO項目を物理削除した後にTODOリストを物理削除し、削除したTODO項目の件数を返す
+# 削除中に追加されたTODO項目は、ON DELETE CASCADEによってTODOリストと共に削除される
+# 削除の途中でTODOリストが復元された場合は、TODOリストを削除せずに残ったTODO項目で件数カウンタを数え直し、Noneを返す
+async def purge_todo_list(
+    db: AsyncSession,
+    todo_list_id: int,
+    on_progress=None,
+):
+    todo_lists = ListModel.__table__
+    deleted = await _purge_todo_items_in_chunks(db, todo_list_id, on_progress)
+    result = await db.execute(delete(todo_lists).where(todo_lists.c.id == todo_list_id, todo_lists.c.deleted_at.is_not(None)))
+    restored = result.rowcount == 0
+    if restored:
+        await _recount_counters(db, todo_list_id)
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id, items=True)
+    return None if restored else deleted
+
+# TODOリストを削除するエンドポイント
+# 削除日時を設定するUPDATE 1文のみで論理削除し、TODO項目には触れない(TODOリストと共にAPIから参照できなくなる)
+# 物理削除はapp.purgerがPURGE_RETENTION_SECONDSの経過後にまとめて行う
+async def delete_todo_list(
+    todo_list_id: int,
+    db: AsyncSession
+):
+    todo_lists = ListModel.__table__
+    result = await db.execute(
+        update(todo_lists)
+        .where(todo_lists.c.id == todo_list_id, todo_lists.c.deleted_at.is_(None))
+        .values(deleted_at=current_timestamp()),
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo List not found"
+        )
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id, items=True)
+    return {}
+
+# 論理削除されたTODOリストを復元するエンドポイント。物理削除済みの場合は404を返す
+async def restore_todo_list(
+    todo_list_id: int,
+    db: AsyncSession
+):
+    todo_lists = ListModel.__table__
+    result = await db.execute(
+        update(todo_lists)
+        .where(todo_lists.c.id == todo_list_id, todo_lists.c.deleted_at.is_not(None))
+        .values(deleted_at=None),
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted Todo List not found"
+        )
+    await db.commit()
+    await entity_cache.invalidate_list(todo_list_id, items=True)
+    return await _get_todo_list(todo_list_id, db)
+
+# TODOリストを論理削除し、物理削除のジョブを作成する。物理削除はrun_todo_list_deletionで行う
+async def start_todo_list_deletion(
+    todo_list_id: int,
+    db: AsyncSession
+):
+    await delete_todo_list(todo_list_id, db)
+    return await create_job("delete_todo_list", todo_list_id=todo_list_id, deleted_items=0)
+
+# TODOリストの物理削除ジョブを実行する
+# レスポンスの送信後に実行されるため、リクエストのセッションとは別にセッションを開く
+async def run_todo_list_deletion(
+    job: dict
+):
+    await update_job(job, status=JobStatus.RUNNING)
+
+    async def on_progress(deleted: int) -> None:
+        await update_job(job, deleted_items=deleted)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            deleted = await purge_todo_list(db, job["todo_list_id"], on_progress)
+    except Exception as e:
+        logger.exception("failed to delete todo list %s", job["todo_list_id"])
+        await update_job(job, status=JobStatus.FAILED, error=type(e).__name__)
+        return
+    await update_job(job, status=JobStatus.COMPLETED if deleted is not None else JobStatus.CANCELLED)
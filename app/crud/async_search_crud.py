@@ -0,0 +1,67 @@
+from fastapi import HTTPException, status
+
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+from app.pagination import decode_cursor
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# TODOリスト・TODO項目の全文検索
+# title・descriptionのFULLTEXTインデックス(ngramパーサー)を MATCH ... AGAINST で検索し、関連度(score)の高い順に返す
+# ngramのトークンは2文字(ngram_token_size)のため、1文字の検索語には一致しない
+
+# カーソルのソートキー。同じ関連度の行はidの昇順に並べる
+SEARCH_CURSOR_KEYS = ("score", "id")
+
+# 関連度を丸める小数点以下の桁数。カーソルに保存した値と再計算した値を確実に比較できるようにする
+SCORE_DIGITS = 6
+
+async def _search(
+    db: AsyncSession,
+    model,
+    q: str,
+    per_page: int,
+    cursor: str | None,
+    conditions: list,
+):
+    relevance = match(model.title, model.description, against=q).in_natural_language_mode()
+    score = func.round(relevance, SCORE_DIGITS)
+    stmt = select(*model.__table__.columns, score.label("score"))\
+        .where(relevance, *conditions)\
+        .order_by(score.desc(), model.id)
+    if cursor is not None:
+        values = decode_cursor(cursor, SEARCH_CURSOR_KEYS)
+        if not isinstance(values["score"], int | float):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        stmt = stmt.where(or_(score < values["score"], and_(score == values["score"], model.id > values["id"])))
+    result = await db.execute(stmt.limit(per_page))
+    return result.all()
+
+# TODOリストを検索するエンドポイント
+async def search_todo_lists(
+    db: AsyncSession,
+    q: str,
+    per_page: int = 10,
+    cursor: str | None = None,
+):
+    return await _search(db, ListModel, q, per_page, cursor, [ListModel.deleted_at.is_(None)])
+
+# TODO項目を検索するエンドポイント。todo_list_idを指定した場合はそのTODOリスト内のみを検索する
+async def search_todo_items(
+    db: AsyncSession,
+    q: str,
+    per_page: int = 10,
+    cursor: str | None = None,
+    todo_list_id: int | None = None,
+):
+    # 論理削除されたTODO項目と、論理削除されたTODOリストに属するTODO項目は除外する
+    alive_lists = select(ListModel.id).where(ListModel.deleted_at.is_(None))
+    conditions = [ItemModel.deleted_at.is_(None), ItemModel.todo_list_id.in_(alive_lists)]
+    if todo_list_id is not None:
+        conditions.append(ItemModel.todo_list_id == todo_list_id)
+    return await _search(db, ItemModel, q, per_page, cursor, conditions)
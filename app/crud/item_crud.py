@@ -1,29 +1,40 @@
 from fastapi import Depends, HTTPException, status
 
 from app.const import TodoItemStatusCode
+from app.database import current_timestamp
 from app.dependencies import get_db
 
 from app.models.item_model import ItemModel
 from app.models.list_model import ListModel
+from app.pagination import decode_cursor
 
 from app.schemas.item_schema import NewTodoItem, UpdateTodoItem
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 # TODOリストに紐づくTODOアイテムを取得するエンドポイント
+# 論理削除されたTODOリストの項目を除外するため、TODOリストを結合する
+# fieldsが指定された場合は、指定されたカラムのみをSELECTする
 def get_todo_items(
     db: Session, 
     todo_list_id: int,
     page: int = 1,
-    per_page: int = 10
+    per_page: int = 10,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
 ):
-    offset = (page - 1) * per_page
-    db_items = db.query(ItemModel)\
-                 .filter(ItemModel.todo_list_id == todo_list_id)\
-                 .order_by(ItemModel.id)\
-                 .limit(per_page)\
-                 .offset(offset)\
-                 .all()
+    query = db.query(ItemModel)\
+              .join(ListModel, ListModel.id == ItemModel.todo_list_id)\
+              .filter(ItemModel.todo_list_id == todo_list_id)\
+              .order_by(ItemModel.id)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(ItemModel, x) for x in fields), raiseload=True))
+    if cursor is not None:
+        last_id = decode_cursor(cursor)["id"]
+        query = query.filter(ItemModel.id > last_id)
+    else:
+        query = query.offset((page - 1) * per_page)
+    db_items = query.limit(per_page).all()
     if db_items is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,12 +42,27 @@ def get_todo_items(
         )
     return db_items
 
+# TODOリストの件数カウンタ(item_count・completed_count)をSQL上で加算する
+# カウンタはTODOリスト自体の更新ではないため、ON UPDATE CURRENT_TIMESTAMPによるupdated_atの更新を抑止する
+def _increment_counters(
+    db: Session,
+    todo_list_id: int,
+    items: int = 0,
+    completed: int = 0
+):
+    db.query(ListModel).filter(ListModel.id == todo_list_id, ListModel.deleted_at.is_(None)).update({
+        ListModel.item_count: ListModel.item_count + items,
+        ListModel.completed_count: ListModel.completed_count + completed,
+        ListModel.updated_at: ListModel.updated_at,
+    }, synchronize_session=False)
+
 def get_todo_item(
     db: Session,
     todo_list_id: int,
     todo_item_id: int
 ):
-    db_item = db.query(ItemModel).filter(ItemModel.todo_list_id == todo_list_id,ItemModel.id == todo_item_id ).first()
+    db_item = db.query(ItemModel).join(ListModel, ListModel.id == ItemModel.todo_list_id)\
+                .filter(ItemModel.todo_list_id == todo_list_id,ItemModel.id == todo_item_id ).first()
     if db_item is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -63,6 +89,7 @@ def post_todo_item(
         due_at=data.due_at,
         status_code=TodoItemStatusCode.NOT_COMPLETED.value 
     )
+    _increment_counters(db, todo_list_id, items=1)
     db.add(new_db_item)
     db.commit()
     db.refresh(new_db_item)
@@ -75,7 +102,12 @@ def update_todo_item(
     todo_item_id: int,
     data: UpdateTodoItem
 ):
-    db_item = db.query(ItemModel).filter(ItemModel.todo_list_id == todo_list_id, ItemModel.id == todo_item_id).first()
+    query = db.query(ItemModel)\
+              .join(ListModel, ListModel.id == ItemModel.todo_list_id)\
+              .filter(ItemModel.todo_list_id == todo_list_id, ItemModel.id == todo_item_id)
+    if data.complete is not None:
+        query = query.with_for_update()
+    db_item = query.first()
     if db_item is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,25 +120,39 @@ def update_todo_item(
     if data.due_at is not None:
         db_item.due_at = data.due_at
     if data.complete is not None:
-        db_item.status_code = TodoItemStatusCode.COMPLETED.value if data.complete else TodoItemStatusCode.NOT_COMPLETED.value
+        status_code = TodoItemStatusCode.COMPLETED.value if data.complete else TodoItemStatusCode.NOT_COMPLETED.value
+        if db_item.status_code != status_code:
+            _increment_counters(db, todo_list_id, completed=1 if data.complete else -1)
+        db_item.status_code = status_code
     
     db.commit()
     db.refresh(db_item)
     return db_item
 
 # TODO項目削除エンドポイント
+# 削除日時を設定して論理削除する
 def delete_todo_item(
     db: Session,
     todo_list_id: int,
     todo_item_id:int
 ):
-    db_item = db.query(ItemModel).filter(ItemModel.todo_list_id == todo_list_id, ItemModel.id == todo_item_id).first()
+    db_item = db.query(ItemModel)\
+                .join(ListModel, ListModel.id == ItemModel.todo_list_id)\
+                .filter(ItemModel.todo_list_id == todo_list_id, ItemModel.id == todo_item_id)\
+                .with_for_update()\
+                .first()
     if db_item is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Todo Item not found"
         ) 
     
-    db.delete(db_item)
+    db_item.deleted_at = current_timestamp()
+    _increment_counters(
+        db,
+        todo_list_id,
+        items=-1,
+        completed=-1 if db_item.status_code == TodoItemStatusCode.COMPLETED.value else 0,
+    )
     db.commit()
     return {}
\ No newline at end of file
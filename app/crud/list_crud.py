@@ -1,25 +1,34 @@
 from fastapi import Depends, HTTPException, status
 
+from app.database import current_timestamp
 from app.dependencies import get_db
 
 from app.models.list_model import ListModel
+from app.pagination import decode_cursor
 
 from app.schemas.list_schema import NewTodoList, UpdateTodoList
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 # TODO リスト一覧取得用関数にて、pageおよびper_pageを引数として受け取るようにして、これら2つの引数を基にデータを返却するように処理の記述
+# cursorが指定された場合はOFFSETを使わず、idをキーにしたキーセットページネーションで取得する
+# fieldsが指定された場合は、指定されたカラムのみをSELECTする
 def get_todo_lists(
     db: Session,
     page: int,
-    per_page: int
+    per_page: int,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
 ):
-    offset = (page - 1) * per_page
-    db_lists = db.query(ListModel)\
-                 .order_by(ListModel.id)\
-                 .limit(per_page)\
-                 .offset(offset)\
-                 .all()
+    query = db.query(ListModel).order_by(ListModel.id)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(ListModel, x) for x in fields), raiseload=True))
+    if cursor is not None:
+        last_id = decode_cursor(cursor)["id"]
+        query = query.filter(ListModel.id > last_id)
+    else:
+        query = query.offset((page - 1) * per_page)
+    db_lists = query.limit(per_page).all()
     return db_lists
 
 # TODOリストを取得するエンドポイント
@@ -73,6 +82,7 @@ def update_todo_list(
     return db_item
 
 # TODOリストを削除するエンドポイント
+# 削除日時を設定して論理削除する。TODO項目を含む物理削除はapp.purgerで行う
 def delete_todo_list(
     todo_list_id: int,
     db: Session
@@ -83,7 +93,7 @@ def delete_todo_list(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Todo List not found"
         )
-    
-    db.delete(db_list)
+
+    db_list.deleted_at = current_timestamp()
     db.commit()
     return {}
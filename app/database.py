@@ -1,17 +1,33 @@
 """SQLAlchemy用."""
 
+from datetime import UTC, datetime
+
 from debug_toolbar.panels.sqlalchemy import SQLAlchemyPanel as BasePanel
 from fastapi import Request
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+from sqlalchemy import Column, DateTime, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base, scoped_session, sessionmaker, with_loader_criteria
+from sqlalchemy.pool import NullPool
 
 from app import const
+from app.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 DATABASE_URL = f"mysql+pymysql://{const.DB_USER}:{const.DB_PASS}@{const.DB_HOST}/{const.DB_NAME}?charset=utf8"
+ASYNC_DATABASE_URL = f"mysql+aiomysql://{const.DB_USER}:{const.DB_PASS}@{const.DB_HOST}/{const.DB_NAME}?charset=utf8"
+
+POOL_OPTIONS = {
+    "pool_size": const.DB_POOL_SIZE,
+    "max_overflow": const.DB_MAX_OVERFLOW,
+    "pool_timeout": const.DB_POOL_TIMEOUT,
+    "pool_recycle": const.DB_POOL_RECYCLE,
+    "pool_pre_ping": const.DB_POOL_PRE_PING,
+}
 
 engine = create_engine(
     DATABASE_URL,
     echo=False,
+    poolclass=TimedQueuePool,
+    **POOL_OPTIONS,
 )
 
 SessionLocal = scoped_session(
@@ -22,10 +38,54 @@ SessionLocal = scoped_session(
     ),
 )
 
+# APIのリクエスト処理はイベントループをブロックしないよう非同期エンジンを使用する
+ASYNC_ENGINE_OPTIONS = {"poolclass": NullPool} if const.DB_ASYNC_NULL_POOL else {"poolclass": TimedAsyncAdaptedQueuePool, **POOL_OPTIONS}
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **ASYNC_ENGINE_OPTIONS,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    bind=async_engine,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
+def current_timestamp() -> datetime:
+    """DBのCURRENT_TIMESTAMPと同じ形式(UTC・秒精度)の現在時刻を返す."""
+    return datetime.now(UTC).replace(tzinfo=None, microsecond=0)
+
+
+class SoftDeleteMixin:
+    """論理削除するモデル用. 削除日時が設定された行はORMのSELECTから除外される."""
+    deleted_at = Column("deleted_at", DateTime)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_deleted_rows(state: ORMExecuteState) -> None:
+    """ORMのSELECTに、論理削除された行を除外する条件を追加する.
+
+    削除済みの行を扱う場合(復元・物理削除)は、execution_options(include_deleted=True)を指定する。
+    Coreのテーブルに対するSELECT・UPDATEには追加されないため、呼び出し側で条件を指定する。
+    """
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get("include_deleted", False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True),
+        )
+
+
 class SQLAlchemyPanel(BasePanel):
     """FastAPI Debug BarにSQLAlchemyクエリ実行結果表示パネルを追加するための記述."""
     async def add_engines(self, _: Request) -> None:  # noqa: D102
         self.engines.add(engine)
+        self.engines.add(async_engine.sync_engine)
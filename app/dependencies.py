@@ -1,4 +1,11 @@
-from .database import SessionLocal
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError
+
+from .database import AsyncSessionLocal, SessionLocal
+from .replicas import has_recent_write, mark_recent_write, replicas
+
+# 更新を伴わないHTTPメソッド
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
 
 
 def get_db():
@@ -7,3 +14,40 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# プライマリに接続するセッション
+# 更新系のリクエストが成功した場合は、同じクライアントからの直後の読み取りをプライマリに送るよう記録する
+async def get_async_db(request: Request):
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+    if request.method not in READ_METHODS:
+        await mark_recent_write(request)
+
+
+# 読み取り専用のエンドポイント用のセッション
+# レプリカが利用可能で、クライアントが直前に更新していなければレプリカに接続する
+# レプリカに接続した場合は、session.info["replica"]にレプリカ名を設定する
+# レプリカへの接続はここで確立し、接続できなければリクエストを失敗させずにレプリカを振り分けから外してプライマリから読み取る
+async def get_async_read_db(request: Request):
+    replica = None
+    if replicas.replicas and not await has_recent_write(request):
+        replica = replicas.choose()
+    db = None
+    if replica is not None:
+        db = AsyncSessionLocal(bind=replica.engine, info={"replica": replica.name})
+        try:
+            await db.connection()
+        except DBAPIError:
+            await db.close()
+            replica.mark_unavailable()
+            db = None
+    if db is None:
+        db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
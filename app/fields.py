@@ -0,0 +1,57 @@
+"""スパースフィールドセット(?fields=)・関連データの追加取得(?include=)用モジュール."""
+
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter, create_model
+
+# カーソルの作成に使うため、fieldsの指定によらず常に取得する項目
+REQUIRED_FIELDS = ("id",)
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """カンマ区切りの項目名をレスポンススキーマの定義順に並べて返す.
+
+    未指定の場合はNoneを、スキーマにない項目名が含まれる場合は400を返す。
+    """
+    if fields is None:
+        return None
+    names = {x.strip() for x in fields.split(",")} - {""}
+    unknown_fields = names - set(schema.model_fields)
+    if not names or unknown_fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown_fields))}" if unknown_fields else "No fields specified",
+        )
+    names.update(REQUIRED_FIELDS)
+    return tuple(x for x in schema.model_fields if x in names)
+
+
+def parse_include(include: str | None, allowed: tuple[str, ...]) -> frozenset[str]:
+    """カンマ区切りの追加取得項目名を返す. 許可されていない項目名が含まれる場合は400を返す."""
+    if include is None:
+        return frozenset()
+    names = frozenset(x.strip() for x in include.split(",")) - {""}
+    unknown_names = names - set(allowed)
+    if unknown_names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown_names))}",
+        )
+    return names
+
+
+@lru_cache(maxsize=256)
+def fields_schema(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """指定された項目のみを持つレスポンススキーマを作成する."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=schema.model_config,
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def fields_list_adapter(schema: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    """指定された項目のみを持つレスポンススキーマの一覧用TypeAdapterを返す."""
+    return TypeAdapter(list[fields_schema(schema, fields)])
@@ -0,0 +1,97 @@
+"""リクエストごとのSQL実行回数・実行時間の計測用モジュール.
+
+全エンジンのbefore_cursor_execute・after_cursor_executeイベントで、リクエスト処理中に実行されたSQLの
+件数と合計時間を記録し、Server-Timing・X-DB-Queriesヘッダとしてレスポンスに付与する。
+実行件数がSQL_N_PLUS_ONE_THRESHOLDを超えたリクエストはN+1クエリの疑いとして、ヘッダを付与してログに出力する。
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import const
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """1リクエスト分のSQLの実行件数と合計時間."""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, PLR0913
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, PLR0913
+    stats = _current_stats.get()
+    started_at = conn.info.get("query_started_at")
+    if stats is None or not started_at:
+        return
+    stats.count += 1
+    stats.seconds += time.perf_counter() - started_at.pop()
+    stats.statements[statement] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:  # noqa: ANN001
+    # 失敗したSQLの開始時刻が残らないようにする
+    if context.connection is not None and context.connection.info.get("query_started_at"):
+        context.connection.info["query_started_at"].pop()
+
+
+class SQLInstrumentationMiddleware:
+    """リクエストごとにSQLの実行件数・合計時間を集計し、レスポンスヘッダに付与するASGIミドルウェア.
+
+    ヘッダはレスポンスの送信開始時点の値で付与するため、ストリーミングレスポンスの送信中に実行されたSQLは含まれない。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:  # noqa: D102
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started_at) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries", total;dur={total_ms:.1f}')
+                headers.append("X-DB-Queries", str(stats.count))
+                if stats.count > const.SQL_N_PLUS_ONE_THRESHOLD:
+                    headers.append("X-DB-N-Plus-One-Suspect", "true")
+                    statement, repeated = stats.statements.most_common(1)[0]
+                    logger.warning(
+                        "possible N+1 queries: %s %s executed %d queries (%.1f ms); repeated %d times: %s",
+                        scope["method"], scope["path"], stats.count, stats.seconds * 1000, repeated, statement,
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
@@ -0,0 +1,106 @@
+"""TODO項目インポート用のNDJSON・CSVパーサー."""
+
+import csv
+import json
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import HTTPException, status
+
+CSV_COLUMNS = ("title", "description", "due_at")
+
+
+class RecordError(ValueError):
+    """1行分のデータが解析できない場合のエラー."""
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str | RecordError]]:
+    """受信したチャンクを行に分割し、行番号と共に順次返す."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, _decode(line)
+    if buffer:
+        yield line_no + 1, _decode(buffer)
+
+
+def _decode(line: bytes) -> str | RecordError:
+    try:
+        return line.rstrip(b"\r").decode("utf-8")
+    except UnicodeDecodeError:
+        return RecordError("invalid UTF-8 sequence")
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict | RecordError]]:
+    """NDJSONを1行ずつ解析し、行番号とデータを返す. 空行は読み飛ばす."""
+    async for line_no, line in _iter_lines(chunks):
+        if isinstance(line, RecordError):
+            yield line_no, line
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, RecordError(f"invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line_no, RecordError("each line must be a JSON object")
+            continue
+        yield line_no, record
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict | RecordError]]:
+    """ヘッダ行付きのCSVを1レコードずつ解析し、開始行番号とデータを返す.
+
+    引用符で囲まれた値に改行が含まれる場合は、引用符の数が偶数になるまで行を連結して1レコードとする。
+    """
+    header = None
+    record_lines: list[str] = []
+    record_line_no = 0
+    async for line_no, line in _iter_lines(chunks):
+        if isinstance(line, RecordError):
+            yield line_no, line
+            continue
+        if not record_lines:
+            record_line_no = line_no
+        record_lines.append(line)
+        if sum(x.count('"') for x in record_lines) % 2 == 1:
+            continue
+        record = "\n".join(record_lines)
+        record_lines = []
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [x.strip() for x in values]
+            unknown_columns = set(header) - set(CSV_COLUMNS)
+            if unknown_columns:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown CSV columns: {', '.join(sorted(unknown_columns))}",
+                )
+            continue
+        if len(values) != len(header):
+            yield record_line_no, RecordError(f"expected {len(header)} columns but got {len(values)}")
+            continue
+        # 空文字は未指定として扱う
+        yield record_line_no, {key: value for key, value in zip(header, values, strict=True) if value != ""}
+    if record_lines:
+        yield record_line_no, RecordError("unterminated quoted value")
+
+
+def get_record_parser(content_type: str) -> Callable[[AsyncIterator[bytes]], AsyncIterator[tuple[int, dict | RecordError]]]:
+    """Content-Typeに対応するパーサーを返す."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in ("application/x-ndjson", "application/jsonl"):
+        return iter_ndjson_records
+    if media_type == "text/csv":
+        return iter_csv_records
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Content-Type must be application/x-ndjson or text/csv",
+    )
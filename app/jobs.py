@@ -0,0 +1,56 @@
+"""バックグラウンドジョブの状態管理用モジュール.
+
+ジョブの状態はキャッシュとは別の、件数上限で破棄されない状態保存用のストアに保存する。
+CACHE_REDIS_URLを設定すればジョブを実行したワーカー以外のプロセスからも状態を参照できる。
+"""
+
+import json
+import uuid
+from datetime import datetime
+from enum import StrEnum
+
+from app import const
+from app.cache import state_store
+from app.database import current_timestamp
+
+
+class JobStatus(StrEnum):
+    """ジョブの状態."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    # 実行中に対象が復元されるなどして中止された
+    CANCELLED = "cancelled"
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+async def save_job(job: dict) -> None:
+    """ジョブの状態を保存する."""
+    job["updated_at"] = current_timestamp()
+    await state_store.set(_job_key(job["id"]), json.dumps(job, default=datetime.isoformat).encode(), ex=const.JOB_TTL_SECONDS)
+
+
+async def create_job(kind: str, **params) -> dict:  # noqa: ANN003
+    """実行待ちのジョブを作成する."""
+    now = current_timestamp()
+    job = {"id": uuid.uuid4().hex, "kind": kind, "status": JobStatus.PENDING, "error": None, "created_at": now, **params}
+    await save_job(job)
+    return job
+
+
+async def update_job(job: dict, **changes) -> dict:  # noqa: ANN003
+    """ジョブの状態を更新する."""
+    job.update(changes)
+    await save_job(job)
+    return job
+
+
+async def get_job(job_id: str) -> dict | None:
+    """ジョブの状態を返す. 存在しないか保持期間を過ぎた場合はNoneを返す."""
+    raw = await state_store.get(_job_key(job_id))
+    return json.loads(raw) if raw is not None else None
@@ -1,18 +1,56 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
-from .routers import list_router, item_router
+from .database import async_engine, engine
+from . import const
+from .instrumentation import SQLInstrumentationMiddleware
+from .metrics import MetricsMiddleware, render, run_snapshot_writer
+from .pool import pool_status
+from .purger import run_purger
+from .replicas import replicas
+from .routers import list_router, item_router, overdue_router, search_router
 
 
 DEBUG = os.environ.get("DEBUG", "") == "true"
 
+# 起動中は論理削除された行の物理削除と、複数ワーカー用のメトリクスの書き出しをバックグラウンドで実行する
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    tasks = []
+    if const.PURGE_ENABLED:
+        tasks.append(asyncio.create_task(run_purger()))
+    if const.METRICS_ENABLED and const.METRICS_MULTIPROC_DIR:
+        tasks.append(asyncio.create_task(run_snapshot_writer()))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+# dictやレスポンスモデルを返すエンドポイントのJSON出力をorjsonで行う
 app = FastAPI(
     title="Python Backend Stations",
     debug=DEBUG,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.include_router(list_router.router)
 app.include_router(item_router.router)
+app.include_router(overdue_router.router)
+app.include_router(search_router.router)
+
+# SQLの実行件数・合計時間をレスポンスヘッダで返す。DEBUG時のSQLAlchemyPanelと異なり、本番環境でも有効にできる
+if const.SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(SQLInstrumentationMiddleware)
+
+# ルートごとのリクエスト数・処理時間を記録する。記録した値は/metricsで公開する
+if const.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 if DEBUG:
     from debug_toolbar.middleware import DebugToolbarMiddleware
@@ -32,5 +70,18 @@ def get_echo(message: str, name: str):
 def get_health():
     return{"status": "ok"}
 
+# コネクションプールの利用状況と取得待ち時間のパーセンタイルを返す
+# リードレプリカを設定している場合は、レプリカごとの振り分け可否と応答時間の移動平均も返す
+@app.get("/health/pool", tags=["System"])
+def get_health_pool():
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool),
+        "replicas": replicas.status(),
+    }
 
-
+# Prometheusのテキスト形式でメトリクスを返す
+# メトリクスの値はイベントループ上でのみ更新するため、スレッドプールではなくイベントループ上で読み出す
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,252 @@
+"""Prometheusのテキスト形式で公開するメトリクスの収集用モジュール.
+
+ルートのテンプレート(/lists/{todo_list_id}など)ごとのリクエスト数・処理時間のヒストグラム、処理中のリクエスト数、
+コネクションプールの利用状況、キャッシュのヒット率を収集する。
+値はイベントループ上でのみ更新するため、ロックを使わずに加算している。
+
+複数のワーカープロセスで動かす場合はMETRICS_MULTIPROC_DIRに全ワーカーで共有するディレクトリを指定する。
+各ワーカーはMETRICS_SNAPSHOT_INTERVAL_SECONDSごとに自身の値をプロセスIDのファイルに書き出し、
+/metricsを処理したワーカーが全ファイルを合算して返す。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import const
+from app.cache import entity_cache
+from app.database import async_engine, engine
+from app.pool import pool_status
+from app.replicas import replicas
+
+logger = logging.getLogger(__name__)
+
+# 処理時間のヒストグラムのバケット(秒)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# どのルートにも一致しなかったリクエストのrouteラベル。パスをそのまま使うとラベルの種類が際限なく増える
+UNMATCHED_ROUTE = "<unmatched>"
+
+# 書き出しから一定時間が経過したスナップショットは、終了したワーカーのものとみなしてゲージを集計しない
+STALE_SNAPSHOT_INTERVALS = 3
+
+
+class Histogram:
+    """固定バケットのヒストグラム."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self) -> None:
+        # 末尾は+Infのバケット
+        self.counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """値を1件記録する."""
+        self.counts[bisect_left(DURATION_BUCKETS, value)] += 1
+        self.sum += value
+
+
+class RequestMetrics:
+    """1プロセス分のリクエストのメトリクス."""
+
+    def __init__(self) -> None:
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.durations: dict[tuple[str, str], Histogram] = {}
+        self.in_progress = 0
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        """完了したリクエストを1件記録する."""
+        key = (method, route, str(status_code))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.durations.get((method, route))
+        if histogram is None:
+            histogram = self.durations[(method, route)] = Histogram()
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict:
+        """JSONに変換できる形式で現在の値を返す."""
+        pools = {"sync": pool_status(engine.pool), "async": pool_status(async_engine.sync_engine.pool)}
+        for replica in replicas.replicas:
+            pools[replica.name] = pool_status(replica.engine.sync_engine.pool)
+        return {
+            "pid": os.getpid(),
+            "written_at": time.time(),
+            "requests": [[*key, value] for key, value in self.requests.items()],
+            "durations": [[*key, x.counts, x.sum] for key, x in self.durations.items()],
+            "in_progress": self.in_progress,
+            "pools": pools,
+            "cache": {"hits": entity_cache.hits, "misses": entity_cache.misses},
+        }
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """リクエスト数・処理時間・処理中のリクエスト数を記録するASGIミドルウェア."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:  # noqa: D102
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+        request_metrics.in_progress += 1
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.in_progress -= 1
+            # ルーティング後のscopeには一致したルートが設定されている
+            route = scope.get("route")
+            request_metrics.observe(
+                scope["method"],
+                getattr(route, "path_format", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - started_at,
+            )
+
+
+def _snapshot_path(pid: int) -> Path:
+    return Path(const.METRICS_MULTIPROC_DIR) / f"metrics_{pid}.json"
+
+
+def write_snapshot() -> None:
+    """このプロセスの値をMETRICS_MULTIPROC_DIRに書き出す. 読み込み中のワーカーが途中の内容を読まないよう、置き換えで書き込む."""
+    path = _snapshot_path(os.getpid())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(request_metrics.snapshot()))
+    tmp_path.replace(path)
+
+
+async def run_snapshot_writer() -> None:
+    """METRICS_SNAPSHOT_INTERVAL_SECONDSごとにスナップショットを書き出す. キャンセルされるまで終了しない."""
+    try:
+        while True:
+            try:
+                write_snapshot()
+            except OSError:
+                logger.exception("failed to write metrics snapshot")
+            await asyncio.sleep(const.METRICS_SNAPSHOT_INTERVAL_SECONDS)
+    finally:
+        # 終了したワーカーのカウンタも合計に残るよう、最後の値を書き出しておく
+        write_snapshot()
+
+
+def _collect_snapshots() -> list[dict]:
+    """全ワーカーのスナップショットを返す. このプロセスの分はファイルではなく現在の値を使う."""
+    current = request_metrics.snapshot()
+    if not const.METRICS_MULTIPROC_DIR:
+        return [current]
+    snapshots = [current]
+    for path in Path(const.METRICS_MULTIPROC_DIR).glob("metrics_*.json"):
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if snapshot["pid"] != current["pid"]:
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """全ワーカーの値を合算し、Prometheusのテキスト形式で返す."""
+    snapshots = _collect_snapshots()
+    stale_before = time.time() - const.METRICS_SNAPSHOT_INTERVAL_SECONDS * STALE_SNAPSHOT_INTERVALS
+    live_snapshots = [x for x in snapshots if x["written_at"] >= stale_before]
+
+    requests: dict[tuple, int] = {}
+    durations: dict[tuple, tuple[list[int], float]] = {}
+    for snapshot in snapshots:
+        for *key, value in snapshot["requests"]:
+            requests[tuple(key)] = requests.get(tuple(key), 0) + value
+        for method, route, counts, total in snapshot["durations"]:
+            merged_counts, merged_total = durations.get((method, route), ([0] * len(counts), 0.0))
+            durations[(method, route)] = ([a + b for a, b in zip(merged_counts, counts, strict=True)], merged_total + total)
+    cache_hits = sum(x["cache"]["hits"] for x in snapshots)
+    cache_misses = sum(x["cache"]["misses"] for x in snapshots)
+
+    lines = [
+        "# HELP http_requests_total Total number of HTTP requests.",
+        "# TYPE http_requests_total counter",
+    ]
+    lines.extend(
+        f"http_requests_total{_labels(method=method, route=route, status=status)} {value}"
+        for (method, route, status), value in sorted(requests.items())
+    )
+
+    lines.extend([
+        "# HELP http_request_duration_seconds HTTP request latency in seconds.",
+        "# TYPE http_request_duration_seconds histogram",
+    ])
+    for (method, route), (counts, total) in sorted(durations.items()):
+        cumulative = 0
+        for le, count in zip((*map(str, DURATION_BUCKETS), "+Inf"), counts, strict=True):
+            cumulative += count
+            lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {_format_value(total)}")
+        lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {cumulative}")
+
+    lines.extend([
+        "# HELP http_requests_in_progress Number of HTTP requests being processed.",
+        "# TYPE http_requests_in_progress gauge",
+        f"http_requests_in_progress {sum(x['in_progress'] for x in live_snapshots)}",
+    ])
+
+    # プールの値はワーカーごとに異なるため、合算せずpidラベルを付けて出力する
+    for name, help_text in (
+        ("size", "Configured size of the DB connection pool."),
+        ("checked_out", "DB connections currently checked out."),
+        ("idle", "Idle DB connections in the pool."),
+        ("overflow", "DB connections opened beyond the pool size."),
+    ):
+        lines.extend([f"# HELP db_pool_{name} {help_text}", f"# TYPE db_pool_{name} gauge"])
+        lines.extend(
+            f"db_pool_{name}{_labels(engine=engine_name, pid=snapshot['pid'])} {status[name]}"
+            for snapshot in live_snapshots
+            for engine_name, status in snapshot["pools"].items()
+            if name in status
+        )
+
+    lines.extend([
+        "# HELP cache_requests_total Entity cache lookups by result.",
+        "# TYPE cache_requests_total counter",
+        f"cache_requests_total{_labels(result='hit')} {cache_hits}",
+        f"cache_requests_total{_labels(result='miss')} {cache_misses}",
+    ])
+    if cache_hits + cache_misses:
+        lines.extend([
+            "# HELP cache_hit_ratio Ratio of entity cache lookups that were hits.",
+            "# TYPE cache_hit_ratio gauge",
+            f"cache_hit_ratio {_format_value(cache_hits / (cache_hits + cache_misses))}",
+        ])
+    return "\n".join(lines) + "\n"
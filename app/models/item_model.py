@@ -1,16 +1,25 @@
 from typing import ClassVar
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func, text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func, text
 
-from app.database import Base
+from app.database import Base, SoftDeleteMixin
 
 
-class ItemModel(Base):
+class ItemModel(SoftDeleteMixin, Base):
     """アイテムモデル."""
     __tablename__ = "todo_items"
-    __table_args__: ClassVar[dict[str]] = {
-        "comment": "アイテムテーブル",
-    }
+    __table_args__: ClassVar[tuple] = (
+        Index("ix_todo_items_todo_list_id_id", "todo_list_id", "id"),
+        Index("ix_todo_items_todo_list_id_status_code_due_at", "todo_list_id", "status_code", "due_at"),
+        Index("ix_todo_items_todo_list_id_due_at", "todo_list_id", "due_at"),
+        Index("ix_todo_items_status_code_due_at", "status_code", "due_at"),
+        Index("ix_todo_items_updated_at", "updated_at"),
+        Index("ix_todo_items_deleted_at", "deleted_at"),
+        Index("ft_todo_items_title_description", "title", "description", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        {
+            "comment": "アイテムテーブル",
+        },
+    )
 
     id = Column("id", Integer, primary_key=True, autoincrement=True)
     todo_list_id = Column("todo_list_id", Integer, ForeignKey("todo_lists.id"), nullable=False)
@@ -1,22 +1,31 @@
 from typing import ClassVar
 
-from sqlalchemy import Column, DateTime, Integer, String, func, text
+from sqlalchemy import Column, DateTime, Index, Integer, String, func, text
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, SoftDeleteMixin
 
 
-class ListModel(Base):
+class ListModel(SoftDeleteMixin, Base):
     """TODOリストモデル."""
 
     __tablename__ = "todo_lists"
-    __table_args__: ClassVar[dict[str]] = {
-        "comment": "TODOリストテーブル",
-    }
+    __table_args__: ClassVar[tuple] = (
+        Index("ix_todo_lists_updated_at", "updated_at"),
+        Index("ix_todo_lists_deleted_at", "deleted_at"),
+        Index("ft_todo_lists_title_description", "title", "description", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        {
+            "comment": "TODOリストテーブル",
+        },
+    )
 
     id = Column("id", Integer, primary_key=True, autoincrement=True)
     title = Column("title", String(50), nullable=False)
     description = Column("description", String(200))
+    # TODO項目の件数。TODO項目の登録・完了状態の変更・削除と同じトランザクションで更新する
+    item_count = Column("item_count", Integer, nullable=False, default=0, server_default=text("0"))
+    completed_count = Column("completed_count", Integer, nullable=False, default=0, server_default=text("0"))
     created_at = Column("created_at", DateTime, server_default=func.now())
     updated_at = Column("updated_at", DateTime, server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
-    items = relationship("ItemModel", backref="todo_lists")
+    # TODO項目の物理削除はDBのON DELETE CASCADEに任せ、TODOリストの削除時にTODO項目を読み込まない
+    items = relationship("ItemModel", backref="todo_lists", passive_deletes=True)
@@ -0,0 +1,41 @@
+"""キーセット(カーソル)ページネーション用モジュール."""
+
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: dict) -> str:
+    """ソートキーの値を不透明なカーソル文字列に変換する."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: tuple[str, ...] = ("id",)) -> dict:
+    """カーソル文字列をソートキーの値に戻す.
+
+    不正なカーソルや、キーがkeysと一致しない(他の並び順で発行された)カーソルが渡された場合は400を返す。
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+    if not isinstance(values, dict) or set(values) != set(keys) or not isinstance(values.get("id"), int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values
+
+
+def set_next_cursor(response: Response, rows: list, per_page: int, keys: tuple[str, ...] = ("id",)) -> None:
+    """ページが埋まっている場合、最終行のソートキーを次ページのカーソルとしてヘッダに設定する."""
+    if per_page <= 0 or len(rows) < per_page:
+        return
+    last_row = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor({key: getattr(last_row, key) for key in keys})
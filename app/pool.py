@@ -0,0 +1,78 @@
+"""コネクションプールの統計情報収集用モジュール."""
+
+import time
+from collections import deque
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# 待ち時間のパーセンタイル計算に使う直近のチェックアウト件数
+CHECKOUT_WAIT_WINDOW = 1000
+
+
+class CheckoutWaitRecorder:
+    """直近のコネクション取得待ち時間を記録する."""
+
+    def __init__(self, maxlen: int = CHECKOUT_WAIT_WINDOW) -> None:
+        self._waits: deque[float] = deque(maxlen=maxlen)
+
+    def record(self, seconds: float) -> None:
+        """待ち時間を1件記録する."""
+        self._waits.append(seconds)
+
+    def summary(self) -> dict:
+        """待ち時間(ミリ秒)のパーセンタイルを返す."""
+        waits = sorted(self._waits)
+        if not waits:
+            return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+        return {
+            "count": len(waits),
+            "p50": _percentile(waits, 50),
+            "p95": _percentile(waits, 95),
+            "p99": _percentile(waits, 99),
+            "max": round(waits[-1] * 1000, 3),
+        }
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    """ソート済みの値から最近傍順位法でパーセンタイル(ミリ秒)を求める."""
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return round(sorted_values[index] * 1000, 3)
+
+
+class _CheckoutTimerMixin:
+    """プールからのコネクション取得にかかった時間を記録する."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_waits = CheckoutWaitRecorder()
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_waits.record(time.perf_counter() - started_at)
+
+
+class TimedQueuePool(_CheckoutTimerMixin, QueuePool):
+    """取得待ち時間を記録するQueuePool."""
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimerMixin, AsyncAdaptedQueuePool):
+    """取得待ち時間を記録するAsyncAdaptedQueuePool."""
+
+
+def pool_status(pool: Pool) -> dict:
+    """プールの利用状況を返す."""
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    status = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, _CheckoutTimerMixin):
+        status["checkout_wait_ms"] = pool.checkout_waits.summary()
+    return status
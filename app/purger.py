@@ -0,0 +1,84 @@
+"""論理削除されたTODOリスト・TODO項目の物理削除.
+
+削除からPURGE_RETENTION_SECONDS秒が経過した行を、PURGE_INTERVAL_SECONDSごとにPURGE_BATCH_SIZE件ずつ物理削除する。
+バッチの間はPURGE_BATCH_PAUSE_SECONDS秒待ち、コネクションプールの使用率が高い間は次の周期まで見送る。
+複数のワーカーで実行しても、同じ行を削除しようとした側の削除件数が0になるだけで整合性は崩れない。
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import const
+from app.crud.async_list_crud import purge_todo_list
+from app.database import AsyncSessionLocal, async_engine, current_timestamp
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+from app.pool import pool_status
+
+logger = logging.getLogger(__name__)
+
+
+def is_low_load() -> bool:
+    """APIが利用するコネクションプールの使用率がPURGE_MAX_POOL_USAGE以下であればTrueを返す."""
+    status = pool_status(async_engine.sync_engine.pool)
+    if "size" not in status:
+        # コネクションをプールしない場合は使用率が分からないため、常に低負荷とみなす
+        return True
+    capacity = status["size"] + const.DB_MAX_OVERFLOW
+    return status["checked_out"] <= capacity * const.PURGE_MAX_POOL_USAGE
+
+
+async def purge_deleted_rows(db: AsyncSession, retention_seconds: int, batch_size: int) -> tuple[int, int]:
+    """削除からretention_seconds秒以上経過した行をbatch_size件まで物理削除し、TODOリストとTODO項目の件数を返す.
+
+    TODOリストは属するTODO項目と共にDELETE_CHUNK_SIZE件ずつ削除する。
+    """
+    cutoff = current_timestamp() - timedelta(seconds=retention_seconds)
+    todo_lists = ListModel.__table__
+    todo_items = ItemModel.__table__
+
+    list_ids = await db.scalars(
+        select(todo_lists.c.id).where(todo_lists.c.deleted_at <= cutoff).order_by(todo_lists.c.deleted_at).limit(batch_size),
+    )
+    list_ids = list_ids.all()
+    for todo_list_id in list_ids:
+        await purge_todo_list(db, todo_list_id)
+
+    item_ids = await db.scalars(
+        select(todo_items.c.id).where(todo_items.c.deleted_at <= cutoff).order_by(todo_items.c.deleted_at).limit(batch_size),
+    )
+    item_ids = item_ids.all()
+    if item_ids:
+        await db.execute(delete(todo_items).where(todo_items.c.id.in_(item_ids)))
+    await db.commit()
+    return len(list_ids), len(item_ids)
+
+
+async def purge_while_low_load() -> tuple[int, int]:
+    """負荷が低い間、物理削除の対象がなくなるまでバッチを繰り返し、削除した件数の合計を返す."""
+    purged_lists = purged_items = 0
+    async with AsyncSessionLocal() as db:
+        while is_low_load():
+            lists, items = await purge_deleted_rows(db, const.PURGE_RETENTION_SECONDS, const.PURGE_BATCH_SIZE)
+            purged_lists += lists
+            purged_items += items
+            if lists < const.PURGE_BATCH_SIZE and items < const.PURGE_BATCH_SIZE:
+                break
+            await asyncio.sleep(const.PURGE_BATCH_PAUSE_SECONDS)
+    if purged_lists or purged_items:
+        logger.info("purged %d todo lists and %d todo items", purged_lists, purged_items)
+    return purged_lists, purged_items
+
+
+async def run_purger() -> None:
+    """PURGE_INTERVAL_SECONDSごとに物理削除を行う. キャンセルされるまで終了しない."""
+    while True:
+        await asyncio.sleep(const.PURGE_INTERVAL_SECONDS)
+        try:
+            await purge_while_low_load()
+        except Exception:
+            logger.exception("failed to purge deleted rows")
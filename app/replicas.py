@@ -0,0 +1,135 @@
+"""リードレプリカへの読み取りの振り分け用モジュール.
+
+読み取り専用のエンドポイントのセッションは、利用可能なレプリカのうち応答時間の移動平均が短い方に接続する。
+接続できない・切断されたレプリカはDB_REPLICA_RETRY_SECONDSの間振り分けから外し、利用可能なレプリカがなければプライマリから読み取る。
+更新系のリクエストを送ったクライアントは、DB_REPLICA_STICKY_SECONDSの間は読み取りもプライマリに送り、自身の更新が見えるようにする。
+"""
+
+import random
+import time
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import const
+from app.cache import state_store
+from app.database import ASYNC_ENGINE_OPTIONS
+from app.pool import pool_status
+
+# 応答時間の指数移動平均の平滑化係数
+LATENCY_EWMA_ALPHA = 0.2
+
+# 接続を拒否された(2003)・ホスト名を解決できない(2005)場合のMySQLのエラーコード。SQLAlchemyは切断として扱わない
+CONNECTION_ERROR_CODES = frozenset((2003, 2005))
+
+
+def is_connection_error(context: ExceptionContext) -> bool:
+    """レプリカに接続できない・切断された場合はTrueを返す.
+
+    ロック待ちやタイムアウトなどのOperationalErrorはレプリカ自体の障害ではないため含めない。
+    """
+    if context.is_disconnect:
+        return True
+    args = getattr(context.original_exception, "args", ())
+    return bool(args) and args[0] in CONNECTION_ERROR_CODES
+
+
+class Replica:
+    """リードレプリカ1台分のエンジンと稼働状況."""
+
+    def __init__(self, url: str) -> None:
+        self.engine = create_async_engine(url, echo=False, **ASYNC_ENGINE_OPTIONS)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.latency_ms: float | None = None
+        self.unavailable_until = 0.0
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(self.engine.sync_engine, "handle_error", self._handle_error)
+
+    def is_available(self) -> bool:
+        """振り分けの対象であればTrueを返す."""
+        return self.unavailable_until <= time.monotonic()
+
+    def mark_unavailable(self) -> None:
+        """DB_REPLICA_RETRY_SECONDSの間、振り分けの対象から外す."""
+        self.unavailable_until = time.monotonic() + const.DB_REPLICA_RETRY_SECONDS
+
+    def status(self) -> dict:
+        """稼働状況を返す."""
+        return {
+            "name": self.name,
+            "available": self.is_available(),
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            **pool_status(self.engine.sync_engine.pool),
+        }
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, PLR0913
+        conn.info.setdefault("replica_query_started_at", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, PLR0913
+        elapsed_ms = (time.perf_counter() - conn.info["replica_query_started_at"].pop()) * 1000
+        if self.latency_ms is None:
+            self.latency_ms = elapsed_ms
+        else:
+            self.latency_ms += LATENCY_EWMA_ALPHA * (elapsed_ms - self.latency_ms)
+
+    def _handle_error(self, context: ExceptionContext) -> None:
+        if context.connection is not None:
+            started_at = context.connection.info.get("replica_query_started_at")
+            if started_at:
+                started_at.pop()
+        # SQLの誤りやロック待ちなどではなく、接続できない・切断された場合のみ振り分けから外す
+        if is_connection_error(context):
+            self.mark_unavailable()
+
+
+class ReplicaSet:
+    """リードレプリカの集合."""
+
+    def __init__(self, urls: list[str]) -> None:
+        self.replicas = [Replica(x) for x in urls]
+
+    def choose(self) -> Replica | None:
+        """読み取りに使うレプリカを返す. 利用可能なレプリカがなければNoneを返す.
+
+        無作為に選んだ2台のうち、応答時間の移動平均が短い方を選ぶ。
+        全台を比較すると、移動平均が更新されるまで最速の1台に読み取りが集中してしまう。
+        """
+        available = [x for x in self.replicas if x.is_available()]
+        if len(available) <= 1:
+            return available[0] if available else None
+        return min(random.sample(available, 2), key=lambda x: x.latency_ms or 0.0)
+
+    def status(self) -> list[dict]:
+        """全レプリカの稼働状況を返す."""
+        return [x.status() for x in self.replicas]
+
+
+replicas = ReplicaSet(const.DB_REPLICA_URLS)
+
+
+def _client_key(request: Request) -> str:
+    """クライアントを識別するキーを返す.
+
+    ロードバランサの背後では接続元IPアドレスが全クライアントで共通になるため、
+    X-Client-Idがなければロードバランサが付与するX-Forwarded-Forの先頭(元のクライアント)のアドレスを使う。
+    偽装されても、そのクライアントの読み取りがプライマリに送られるだけで済む。
+    """
+    client_id = request.headers.get("X-Client-Id")
+    if not client_id:
+        forwarded_for = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+        client_id = forwarded_for or (request.client.host if request.client else "")
+    return f"recent_write:{client_id}"
+
+
+async def mark_recent_write(request: Request) -> None:
+    """クライアントが更新したことを記録する."""
+    if replicas.replicas and const.DB_REPLICA_STICKY_SECONDS > 0:
+        await state_store.set(_client_key(request), b"1", ex=const.DB_REPLICA_STICKY_SECONDS)
+
+
+async def has_recent_write(request: Request) -> bool:
+    """クライアントがDB_REPLICA_STICKY_SECONDS以内に更新していればTrueを返す."""
+    return await state_store.get(_client_key(request)) is not None
@@ -1,54 +1,168 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from datetime import datetime
+from typing import Literal
 
-from app.crud import item_crud
-from app.schemas.item_schema import NewTodoItem, UpdateTodoItem, ResponseTodoItem
+from fastapi import APIRouter, Body, Depends, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import const
+from app.const import TodoItemStatusCode
+from app.dependencies import get_async_db, get_async_read_db
+
+from app.conditional import conditional_response, is_conditional, make_etag, not_modified
+from app.crud import async_item_crud
+from app.fields import fields_list_adapter, parse_fields
+from app.item_import import get_record_parser
+from app.pagination import set_next_cursor
+from app.schemas.item_schema import BulkUpdateTodoItems, NewTodoItem, UpdateTodoItem, ResponseBulkUpdateTodoItems, ResponseImportTodoItems, ResponseTodoItem
 
 router = APIRouter(
     prefix="/lists/{todo_list_id}/items",
     tags=["Todo Items"],
 )
 
-@router.get("/")
+todo_items_adapter = TypeAdapter(list[ResponseTodoItem])
 
-def get_todo_items(
+# ETag・Last-Modifiedを付与し、If-None-Match・If-Modified-Sinceに一致する場合は304を返す
+# ETagはページの範囲の集計(件数・更新日時の最大値など)から作成し、条件付きリクエストは一覧を取得する前に判定する
+# response_modelはOpenAPIのスキーマ用で、ボディはjsonable_encoderを通さずTypeAdapterでORMから直接JSONに変換する
+# fieldsにカンマ区切りで項目名を指定すると、指定された項目(とid)のみをSELECTして返す
+# statusでステータス、due_after以上・due_before未満で期限日時を絞り込む。期限のない項目は期限日時の絞り込みに一致しない
+# sort=due_atを指定すると期限日時順(期限なしが先頭)に並べる。カーソルは並び順ごとに異なる
+@router.get("/", response_model=list[ResponseTodoItem])
+async def get_todo_items(
+    request: Request,
     todo_list_id: int,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_read_db),
     page: int = 1,
     per_page: int = 10,
+    cursor: str | None = None,
+    fields: str | None = None,
+    status: TodoItemStatusCode | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    sort: Literal["id", "due_at"] = "id",
 ):
-    return item_crud.get_todo_items(session, todo_list_id, page, per_page)
+    selected_fields = parse_fields(fields, ResponseTodoItem)
+    # fieldsでupdated_atを除いた場合は、レスポンスに含まれない更新日時をLast-Modifiedとして返さない
+    has_updated_at = selected_fields is None or "updated_at" in selected_fields
+    if is_conditional(request):
+        version = await async_item_crud.get_todo_items_version(
+            session, todo_list_id, page, per_page, cursor, status, due_before, due_after, sort,
+        )
+        last_modified = version["updated_at"] if has_updated_at else None
+        response = not_modified(request, make_etag(version, selected_fields), last_modified, use_if_modified_since=False)
+        if response is not None:
+            return response
+    adapter = todo_items_adapter if selected_fields is None else fields_list_adapter(ResponseTodoItem, selected_fields)
+    db_items = await async_item_crud.get_todo_items(
+        session, todo_list_id, page, per_page, cursor, selected_fields, status, due_before, due_after, sort,
+    )
+    version = async_item_crud.todo_items_version(db_items)
+    response = conditional_response(
+        request,
+        adapter.dump_json(adapter.validate_python(db_items, from_attributes=True)),
+        make_etag(version, selected_fields),
+        version["updated_at"] if has_updated_at else None,
+        use_if_modified_since=False,
+    )
+    set_next_cursor(response, db_items, per_page, async_item_crud.DUE_AT_CURSOR_KEYS if sort == "due_at" else ("id",))
+    return response
 
-@router.get("/{todo_item_id}")
-def get_todo_item(
+# リスト内の全項目をNDJSONで出力する。件数によらずメモリ使用量は一定で、取得の途中から送信を始める
+# クライアントが途中で切断した場合、StreamingResponseはジェネレータを閉じないため、送信の終了後のバックグラウンドタスクで閉じて接続を返却する
+@router.get("/export")
+async def export_todo_items(
+    todo_list_id: int,
+    session: AsyncSession = Depends(get_async_db),
+):
+    await async_item_crud.ensure_todo_list(session, todo_list_id)
+    content = async_item_crud.export_todo_items(todo_list_id)
+    return StreamingResponse(
+        content,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="todo_list_{todo_list_id}_items.ndjson"'},
+        background=BackgroundTask(content.aclose),
+    )
+
+# 条件付きリクエストはTODO項目を取得する前にバージョンで判定し、キャッシュに載っている場合はDBにアクセスせずに304を返せる
+@router.get("/{todo_item_id}", response_model=ResponseTodoItem)
+async def get_todo_item(
+    request: Request,
     todo_list_id: int,
     todo_item_id: int,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_read_db),
 ):
-    return item_crud.get_todo_item(session, todo_list_id, todo_item_id)
+    if is_conditional(request):
+        version = await async_item_crud.get_todo_item_version(session, todo_list_id, todo_item_id)
+        response = not_modified(request, make_etag(version), version["updated_at"])
+        if response is not None:
+            return response
+    todo_item = await async_item_crud.get_todo_item(session, todo_list_id, todo_item_id)
+    etag = make_etag(async_item_crud.todo_item_version(todo_item))
+    return conditional_response(request, todo_item.model_dump_json().encode(), etag, todo_item.updated_at)
 
 @router.post("/", response_model=ResponseTodoItem)
 async def post_todo_item(
     todo_list_id: int,
     data: NewTodoItem,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    return item_crud.post_todo_item(session, todo_list_id, data)
+    return await async_item_crud.post_todo_item(session, todo_list_id, data)
+
+# 親リストの確認は1回のみ行い、複数行INSERTを1トランザクションで実行する
+@router.post("/bulk", response_model=list[ResponseTodoItem])
+async def post_todo_items(
+    todo_list_id: int,
+    data: list[NewTodoItem] = Body(min_length=1, max_length=const.BULK_MAX_ITEMS),
+    session: AsyncSession = Depends(get_async_db),
+):
+    return await async_item_crud.post_todo_items(session, todo_list_id, data)
+
+# NDJSON(application/x-ndjson)またはヘッダ付きCSV(text/csv)のボディを受信しながら登録する
+# 不正な行はエラーとして報告し、残りの行の登録は継続する
+@router.post("/import", response_model=ResponseImportTodoItems)
+async def import_todo_items(
+    todo_list_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_db),
+):
+    parse_records = get_record_parser(request.headers.get("content-type", ""))
+    return await async_item_crud.import_todo_items(session, todo_list_id, parse_records(request.stream()))
+
+# 対象をidの一覧またはstatus_codeで指定し、1文のUPDATEでまとめて更新する
+@router.patch("/bulk", response_model=ResponseBulkUpdateTodoItems)
+async def patch_todo_items(
+    todo_list_id: int,
+    data: BulkUpdateTodoItems,
+    session: AsyncSession = Depends(get_async_db),
+):
+    return await async_item_crud.update_todo_items(session, todo_list_id, data)
 
 @router.put("/{todo_item_id}", response_model=ResponseTodoItem)
 async def put_todo_item(
     todo_list_id: int,
     todo_item_id: int,
     data: UpdateTodoItem,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    return item_crud.update_todo_item(session, todo_list_id, todo_item_id, data)
+    return await async_item_crud.update_todo_item(session, todo_list_id, todo_item_id, data)
 
+# 論理削除のみ行い、物理削除はPURGE_RETENTION_SECONDSの経過後にバックグラウンドで行う
 @router.delete("/{todo_item_id}")
-def delete_todo_item(
+async def delete_todo_item(
+    todo_list_id: int,
+    todo_item_id: int,
+    session: AsyncSession = Depends(get_async_db),
+):
+    return await async_item_crud.delete_todo_item(session, todo_list_id, todo_item_id)
+
+# 論理削除されたTODO項目を復元する
+@router.post("/{todo_item_id}/restore", response_model=ResponseTodoItem)
+async def restore_todo_item(
     todo_list_id: int,
     todo_item_id: int,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    return item_crud.delete_todo_item(session, todo_list_id, todo_item_id)
\ No newline at end of file
+    return await async_item_crud.restore_todo_item(session, todo_list_id, todo_item_id)
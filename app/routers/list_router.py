@@ -1,50 +1,185 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_async_db, get_async_read_db
 
-from app.crud import list_crud
-from app.schemas.list_schema import NewTodoList, UpdateTodoList, ResponseTodoList
+from app.conditional import conditional_response, is_conditional, make_etag, not_modified
+from app.crud import async_item_crud, async_list_crud
+from app.fields import fields_list_adapter, fields_schema, parse_fields, parse_include
+from app.jobs import get_job
+from app.pagination import set_next_cursor
+from app.schemas.job_schema import ResponseDeletionJob
+from app.schemas.list_schema import NewTodoList, UpdateTodoList, ResponseTodoList, ResponseTodoListWithIncludes
 
 router = APIRouter(
     prefix="/lists",
     tags=["Todo List"],
 )
 
-# GET /listsのエンドポイントを実装しているパスオペレーション関数に、pageとper_pageのクエリ文字列を追加する
+todo_lists_adapter = TypeAdapter(list[ResponseTodoList])
+
+# includeで指定できる項目
+INCLUDES = ("stats", "items")
 
-@router.get("/")
-def get_todo_lists(
-    session: Session = Depends(get_db),
+# TODOリストにincludeで指定された項目を付与する
+# ページ内の全TODOリストについて、項目ごとに1回のクエリでまとめて取得する
+async def _add_includes(
+    session: AsyncSession,
+    todo_lists: list,
+    column_names: tuple[str, ...],
+    includes: frozenset[str],
+    items_limit: int,
+):
+    todo_list_ids = [x.id for x in todo_lists]
+    stats = await async_list_crud.get_todo_list_stats(session, todo_list_ids) if "stats" in includes else None
+    items = await async_item_crud.get_todo_items_for_lists(session, todo_list_ids, items_limit) if "items" in includes else None
+    rows = []
+    for todo_list in todo_lists:
+        row = {name: getattr(todo_list, name) for name in column_names}
+        if stats is not None:
+            row["stats"] = stats[todo_list.id]
+        if items is not None:
+            row["items"] = items[todo_list.id]
+        rows.append(row)
+    return rows
+
+# GET /listsのエンドポイントを実装しているパスオペレーション関数に、pageとper_pageのクエリ文字列を追加する
+# cursorを指定するとキーセットページネーションになり、次ページのカーソルはX-Next-Cursorヘッダで返す
+# ETag・Last-Modifiedを付与し、If-None-Match・If-Modified-Sinceに一致する場合は304を返す
+# ETagはページの範囲の集計(件数・更新日時の最大値など)から作成し、条件付きリクエストは一覧を取得する前に判定する
+# includeを指定した場合はTODO項目の更新もレスポンスに含まれるため、ボディからETagを作成する
+# response_modelはOpenAPIのスキーマ用で、ボディはjsonable_encoderを通さずTypeAdapterでORMから直接JSONに変換する
+# fieldsにカンマ区切りで項目名を指定すると、指定された項目(とid)のみをSELECTして返す
+# include=statsを指定すると、各TODOリストにTODO項目の件数(全体・完了・期限切れ)をstatsとして付与する
+# include=itemsを指定すると、各TODOリストに先頭からitems_limit件のTODO項目をitemsとして付与する
+@router.get("/", response_model=list[ResponseTodoList])
+async def get_todo_lists(
+    request: Request,
+    session: AsyncSession = Depends(get_async_read_db),
     page: int = 1,
     per_page: int = 10,
+    cursor: str | None = None,
+    fields: str | None = None,
+    include: str | None = None,
+    items_limit: int = Query(default=5, ge=1, le=100),
 ):
-    return list_crud.get_todo_lists(session, page, per_page)
+    selected_fields = parse_fields(fields, ResponseTodoList)
+    # fieldsでupdated_atを除いた場合は、レスポンスに含まれない更新日時をLast-Modifiedとして返さない
+    has_updated_at = selected_fields is None or "updated_at" in selected_fields
+    includes = parse_include(include, INCLUDES)
+    if not includes and is_conditional(request):
+        version = await async_list_crud.get_todo_lists_version(session, page, per_page, cursor)
+        last_modified = version["updated_at"] if has_updated_at else None
+        response = not_modified(request, make_etag(version, selected_fields), last_modified, use_if_modified_since=False)
+        if response is not None:
+            return response
+    db_lists = await async_list_crud.get_todo_lists(session, page, per_page, cursor, selected_fields)
+    version = async_list_crud.todo_lists_version(db_lists)
+    if includes:
+        column_names = selected_fields or tuple(ResponseTodoList.model_fields)
+        rows = await _add_includes(session, db_lists, column_names, includes, items_limit)
+        adapter = fields_list_adapter(ResponseTodoListWithIncludes, (*column_names, *(x for x in INCLUDES if x in includes)))
+        etag = None
+    else:
+        rows = db_lists
+        adapter = todo_lists_adapter if selected_fields is None else fields_list_adapter(ResponseTodoList, selected_fields)
+        etag = make_etag(version, selected_fields)
+    response = conditional_response(
+        request,
+        adapter.dump_json(adapter.validate_python(rows, from_attributes=True)),
+        etag,
+        version["updated_at"] if has_updated_at else None,
+        use_if_modified_since=False,
+    )
+    set_next_cursor(response, db_lists, per_page)
+    return response
 
+# 条件付きリクエストはTODOリストを取得する前にバージョンで判定し、キャッシュに載っている場合はDBにアクセスせずに304を返せる
+# includeの指定は一覧と同じ
+# TODO項目の更新による件数カウンタの更新ではTODOリストの更新日時が変わらないため、If-Modified-Sinceでは判定せずETagのみで判定する
 @router.get("/{todo_list_id}", response_model=ResponseTodoList)
 async def get_todo_list(
+    request: Request,
     todo_list_id: int,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_read_db),
+    include: str | None = None,
+    items_limit: int = Query(default=5, ge=1, le=100),
 ):
-    return list_crud.get_todo_list(todo_list_id, session)
+    includes = parse_include(include, INCLUDES)
+    if not includes and is_conditional(request):
+        version = await async_list_crud.get_todo_list_version(todo_list_id, session)
+        response = not_modified(request, make_etag(version), version["updated_at"], use_if_modified_since=False)
+        if response is not None:
+            return response
+    todo_list = await async_list_crud.get_todo_list(todo_list_id, session)
+    if not includes:
+        etag = make_etag(async_list_crud.todo_list_version(todo_list))
+        return conditional_response(
+            request,
+            todo_list.model_dump_json().encode(),
+            etag,
+            todo_list.updated_at,
+            use_if_modified_since=False,
+        )
+    column_names = tuple(ResponseTodoList.model_fields)
+    rows = await _add_includes(session, [todo_list], column_names, includes, items_limit)
+    schema = fields_schema(ResponseTodoListWithIncludes, (*column_names, *(x for x in INCLUDES if x in includes)))
+    body = schema.model_validate(rows[0], from_attributes=True).model_dump_json().encode()
+    return conditional_response(request, body, last_modified=todo_list.updated_at, use_if_modified_since=False)
 
 @router.post("/", response_model=ResponseTodoList)
 async def post_todo_list(
     data: NewTodoList,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    return list_crud.create_todo_list(data, session)
+    return await async_list_crud.create_todo_list(data, session)
 
 @router.put("/{todo_list_id}", response_model=ResponseTodoList)
-def put_todo_list(
+async def put_todo_list(
     todo_list_id: int,
     data: UpdateTodoList,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
-    return list_crud.update_todo_list(todo_list_id, data, session)
+    return await async_list_crud.update_todo_list(todo_list_id, data, session)
 
+# 論理削除のみ行い、TODO項目を含む物理削除はPURGE_RETENTION_SECONDSの経過後にバックグラウンドで行う
+# async=trueを指定すると、論理削除の後すぐに物理削除をバックグラウンドで実行して202を返す。進捗はLocationヘッダのURLで確認できる
+# 物理削除ではTODO項目をDELETE_CHUNK_SIZE件ずつ短いトランザクションで削除する
 @router.delete("/{todo_list_id}")
-def delete_todo_list(
+async def delete_todo_list(
     todo_list_id: int,
-    session: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_db),
+    run_async: bool = Query(default=False, alias="async"),
+):
+    if not run_async:
+        return await async_list_crud.delete_todo_list(todo_list_id, session)
+    job = await async_list_crud.start_todo_list_deletion(todo_list_id, session)
+    background_tasks.add_task(async_list_crud.run_todo_list_deletion, job)
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=ResponseDeletionJob.model_validate(job).model_dump(mode="json"),
+        headers={"Location": router.url_path_for("get_deletion_job", job_id=job["id"])},
+    )
+
+# 論理削除されたTODOリストを、属するTODO項目と共に復元する
+@router.post("/{todo_list_id}/restore", response_model=ResponseTodoList)
+async def restore_todo_list(
+    todo_list_id: int,
+    session: AsyncSession = Depends(get_async_db),
+):
+    return await async_list_crud.restore_todo_list(todo_list_id, session)
+
+# TODOリストの削除ジョブの状態を返す
+@router.get("/deletions/{job_id}", response_model=ResponseDeletionJob)
+async def get_deletion_job(
+    job_id: str,
 ):
-    return list_crud.delete_todo_list(todo_list_id, session)
\ No newline at end of file
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
\ No newline at end of file
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_async_read_db
+
+from app.crud import async_item_crud
+from app.pagination import set_next_cursor
+from app.schemas.item_schema import ResponseTodoItem
+
+router = APIRouter(
+    prefix="/items",
+    tags=["Todo Items"],
+)
+
+todo_items_adapter = TypeAdapter(list[ResponseTodoItem])
+
+# 全TODOリストの期限切れ(未完了かつ期限日時が現在より前)のTODO項目を、期限日時の古い順に返す
+# 次ページのカーソルはX-Next-Cursorヘッダで返す
+@router.get("/overdue", response_model=list[ResponseTodoItem])
+async def get_overdue_todo_items(
+    session: AsyncSession = Depends(get_async_read_db),
+    per_page: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = None,
+):
+    db_items = await async_item_crud.get_overdue_todo_items(session, per_page, cursor)
+    todo_items = todo_items_adapter.validate_python(db_items, from_attributes=True)
+    response = Response(content=todo_items_adapter.dump_json(todo_items), media_type="application/json")
+    set_next_cursor(response, db_items, per_page, async_item_crud.DUE_AT_CURSOR_KEYS)
+    return response
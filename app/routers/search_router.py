@@ -0,0 +1,45 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_async_read_db
+
+from app.crud import async_search_crud
+from app.pagination import set_next_cursor
+from app.schemas.search_schema import ResponseTodoItemSearchResult, ResponseTodoListSearchResult
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"],
+)
+
+search_lists_adapter = TypeAdapter(list[ResponseTodoListSearchResult])
+search_items_adapter = TypeAdapter(list[ResponseTodoItemSearchResult])
+
+# title・descriptionを全文検索し、関連度の高い順に返す
+# targetで検索対象(TODO項目またはTODOリスト)を、todo_list_idでTODO項目の検索範囲を指定する
+# 次ページのカーソルはX-Next-Cursorヘッダで返す
+@router.get("/", response_model=list[ResponseTodoItemSearchResult] | list[ResponseTodoListSearchResult])
+async def search(
+    q: str = Query(min_length=1, max_length=100),
+    target: Literal["items", "lists"] = "items",
+    todo_list_id: int | None = None,
+    per_page: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_read_db),
+):
+    if target == "lists":
+        if todo_list_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="todo_list_id can only be used with target=items",
+            )
+        rows = await async_search_crud.search_todo_lists(session, q, per_page, cursor)
+        adapter = search_lists_adapter
+    else:
+        rows = await async_search_crud.search_todo_items(session, q, per_page, cursor, todo_list_id)
+        adapter = search_items_adapter
+    response = Response(content=adapter.dump_json(adapter.validate_python(rows, from_attributes=True)), media_type="application/json")
+    set_next_cursor(response, rows, per_page, async_search_crud.SEARCH_CURSOR_KEYS)
+    return response
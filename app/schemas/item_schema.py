@@ -1,6 +1,6 @@
 import os 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.const import TodoItemStatusCode
 
@@ -22,7 +22,23 @@ class UpdateTodoItem(BaseModel):
     complete: bool | None = Field(default=None, title="Set Todo Item status as completed")
 
 
+class BulkUpdateTodoItems(BaseModel):
+    """TODO項目一括更新時のスキーマ.
+
+    ids・status_codeのどちらも指定しない場合はTODOリスト内の全項目が対象となる。
+    """
+
+    ids: list[int] | None = Field(default=None, title="Target Todo Item IDs", min_length=1)
+    status_code: TodoItemStatusCode | None = Field(default=None, title="Target Todo Status Code")
+    patch: UpdateTodoItem = Field(title="Fields to update")
+    return_items: bool = Field(default=False, title="Return updated items")
+
+
 class ResponseTodoItem(BaseModel):
+    """TODO項目のレスポンススキーマ."""
+
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     todo_list_id: int
     title: str = Field(title="Todo Item Title", min_length=1, max_length=100)
@@ -33,3 +49,25 @@ class ResponseTodoItem(BaseModel):
     updated_at: datetime = Field(title="datetime that the item was updated")
 
 
+class ResponseBulkUpdateTodoItems(BaseModel):
+    """TODO項目一括更新のレスポンススキーマ."""
+
+    updated: int = Field(title="Number of matched items")
+    items: list[ResponseTodoItem] | None = Field(default=None, title="Updated items")
+
+
+class ImportRowError(BaseModel):
+    """TODO項目インポート時の行ごとのエラー."""
+
+    line: int = Field(title="Line number in the uploaded file")
+    errors: list[str] = Field(title="Error messages")
+
+
+class ResponseImportTodoItems(BaseModel):
+    """TODO項目インポートのレスポンススキーマ."""
+
+    imported: int = Field(title="Number of imported items")
+    failed: int = Field(title="Number of rejected rows")
+    errors: list[ImportRowError] = Field(title="Rejected rows (truncated to IMPORT_MAX_ERRORS)")
+    elapsed_seconds: float = Field(title="Elapsed time of the import")
+    rows_per_second: float = Field(title="Throughput of the import")
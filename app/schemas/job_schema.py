@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.jobs import JobStatus
+
+
+class ResponseDeletionJob(BaseModel):
+    """TODOリスト削除ジョブのレスポンススキーマ."""
+
+    id: str = Field(title="Job ID")
+    status: JobStatus = Field(title="Job Status")
+    todo_list_id: int = Field(title="Target Todo List ID")
+    deleted_items: int = Field(default=0, title="Number of items deleted so far")
+    error: str | None = Field(default=None, title="Error message of a failed job")
+    created_at: datetime = Field(title="datetime that the job was created")
+    updated_at: datetime = Field(title="datetime that the job was updated")
@@ -1,7 +1,9 @@
 import os
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.item_schema import ResponseTodoItem
 
 
 class NewTodoList(BaseModel):
@@ -21,8 +23,30 @@ class UpdateTodoList(BaseModel):
 class ResponseTodoList(BaseModel):
     """TODOリストのレスポンススキーマ."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     title: str = Field(title="Todo List Title", min_length=1, max_length=100)
     description: str | None = Field(default=None, title="Todo List Description", min_length=1, max_length=200)
+    item_count: int = Field(default=0, title="Number of items in the list")
+    completed_count: int = Field(default=0, title="Number of completed items in the list")
     created_at: datetime = Field(title="datetime that the item was created")
-    updated_at: datetime = Field(title="datetime that the item was updated")
\ No newline at end of file
+    updated_at: datetime = Field(title="datetime that the item was updated")
+
+
+class TodoListStats(BaseModel):
+    """TODOリストに属するTODO項目の件数."""
+
+    total: int = Field(title="Number of items")
+    completed: int = Field(title="Number of completed items")
+    overdue: int = Field(title="Number of not completed items past their due")
+
+
+class ResponseTodoListWithIncludes(ResponseTodoList):
+    """includeを指定した場合のTODOリストのレスポンススキーマ.
+
+    includeで指定されなかった項目はレスポンスから除かれる。
+    """
+
+    stats: TodoListStats = Field(title="Item counts")
+    items: list[ResponseTodoItem] = Field(title="First items of the list")
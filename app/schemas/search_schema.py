@@ -0,0 +1,16 @@
+from pydantic import Field
+
+from app.schemas.item_schema import ResponseTodoItem
+from app.schemas.list_schema import ResponseTodoList
+
+
+class ResponseTodoListSearchResult(ResponseTodoList):
+    """TODOリストの検索結果のレスポンススキーマ."""
+
+    score: float = Field(title="Relevance score")
+
+
+class ResponseTodoItemSearchResult(ResponseTodoItem):
+    """TODO項目の検索結果のレスポンススキーマ."""
+
+    score: float = Field(title="Relevance score")
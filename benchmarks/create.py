@@ -0,0 +1,99 @@
+"""TODOリスト・TODO項目の登録のレイテンシを、LEAN_WRITESの無効・有効で比較するベンチマーク.
+
+DB_*の環境変数で指定したデータベースに対して、登録処理(async_list_crud.create_todo_list・async_item_crud.post_todo_item)を
+繰り返し実行し、1件あたりに実行されたSQLの件数と所要時間のパーセンタイルを出力する。
+LEAN_WRITESを無効にした場合が変更前(親の確認のSELECT・登録後のrefresh)、有効にした場合が1回のINSERTのみの登録に当たる。
+計測で登録した行は最後に物理削除する。
+
+実行方法: python -m benchmarks.create --iterations 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, event
+
+from app import const
+from app.crud import async_item_crud, async_list_crud
+from app.database import AsyncSessionLocal, async_engine, engine
+from app.models.list_model import ListModel
+from app.schemas.item_schema import NewTodoItem
+from app.schemas.list_schema import NewTodoList
+
+
+async def _measure(create, iterations: int) -> dict:
+    """登録をiterations回実行し、1件あたりのSQLの件数と所要時間(ミリ秒)のパーセンタイルを返す."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001, PLR0913
+        statements.append(statement)
+
+    timings = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        for i in range(iterations):
+            async with AsyncSessionLocal() as db:
+                started_at = time.perf_counter()
+                await create(db, i)
+                timings.append((time.perf_counter() - started_at) * 1000)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return {
+        "statements": round(len(statements) / iterations, 2),
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+async def run(iterations: int) -> list[dict]:
+    """登録の種類とLEAN_WRITESの設定ごとの計測結果を返す."""
+    created_lists = []
+
+    async def create_list(db, i: int) -> None:
+        todo_list = await async_list_crud.create_todo_list(NewTodoList(title=f"benchmark list {i}"), db)
+        created_lists.append(todo_list.id)
+
+    async with AsyncSessionLocal() as db:
+        parent = await async_list_crud.create_todo_list(NewTodoList(title="benchmark parent"), db)
+    created_lists.append(parent.id)
+
+    async def create_item(db, i: int) -> None:
+        await async_item_crud.post_todo_item(db, parent.id, NewTodoItem(title=f"benchmark item {i}"))
+
+    results = []
+    lean_writes = const.LEAN_WRITES
+    try:
+        for name, create in (("POST /lists", create_list), ("POST /lists/{id}/items", create_item)):
+            for enabled in (False, True):
+                const.LEAN_WRITES = enabled
+                # 接続の確立やステートメントのキャッシュの影響を除くため、計測の前に数回実行する
+                await _measure(create, min(iterations, 5))
+                results.append({"path": name, "lean_writes": enabled, **await _measure(create, iterations)})
+    finally:
+        const.LEAN_WRITES = lean_writes
+        cleanup(created_lists)
+    return results
+
+
+def cleanup(list_ids: list[int]) -> None:
+    """計測で登録したTODOリストを、属するTODO項目と共に物理削除する."""
+    with engine.begin() as conn:
+        conn.execute(delete(ListModel.__table__).where(ListModel.id.in_(list_ids)))
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="number of creates per path and setting")
+    args = parser.parse_args()
+
+    print(f"{'path':<26}{'lean_writes':<13}{'statements':>11}{'p50_ms':>10}{'p95_ms':>10}{'max_ms':>10}")  # noqa: T201
+    for result in asyncio.run(run(args.iterations)):
+        print(f"{result['path']:<26}{result['lean_writes']!s:<13}{result['statements']:>11}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['max_ms']:>10}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
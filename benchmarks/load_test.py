@@ -0,0 +1,431 @@
+"""TODOリスト・TODO項目の全エンドポイントに並行してリクエストを送る負荷試験.
+
+--concurrency個の非同期クライアントが--duration秒の間、MIXの比率でエンドポイントを選んでリクエストを送り続け、
+ルートごとのスループットとレイテンシのパーセンタイルをJSONで出力する。
+--base-urlを指定しない場合は、サーバーを起動せずにアプリをプロセス内で呼び出す(ネットワークの時間は含まれない)。
+計測の前に、TODOリストが--seed-lists件になるまでTODOリストとTODO項目を登録する。
+計測中に登録したTODOリスト・TODO項目は、実行のたびに計測対象のデータが変わらないよう、終了時に物理削除する。
+
+--baselineを指定すると保存済みの結果と比較し、p95・p99のレイテンシが(1 + --tolerance)倍を超えたか、
+スループットが(1 - --tolerance)倍を下回ったルートがあれば終了コード1で終了する。
+--save-baselineを指定すると、今回の結果を比較用に保存する。
+
+実行方法: python -m benchmarks.load_test --duration 30 --concurrency 20 --baseline benchmarks/baselines/load_test.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+from sqlalchemy import delete, func, insert, select
+
+from app.const import TodoItemStatusCode
+from app.database import current_timestamp, engine
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+
+SEED_BATCH_SIZE = 5000
+# 計測に使うTODOリスト・TODO項目のidの件数
+SAMPLE_IDS = 1000
+
+# シナリオごとの実行比率。読み取りを中心に、全ルートを1回以上実行する
+MIX = {
+    "get_lists": 20,
+    "get_lists_include": 5,
+    "get_list": 15,
+    "get_items": 20,
+    "get_items_filtered": 5,
+    "get_item": 15,
+    "export_items": 1,
+    "create_update_delete_list": 3,
+    "delete_list_async": 1,
+    "create_update_delete_item": 8,
+    "bulk_items": 2,
+    "import_items": 1,
+}
+
+WORDS = ["買い物", "会議", "資料", "掃除", "予約", "支払い", "report", "meeting", "review", "deploy", "invoice", "plan"]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(num_of_lists: int, items_per_list: int) -> None:
+    """TODOリストがnum_of_lists件になるまで、TODOリストとitems_per_list件ずつのTODO項目を登録する.
+
+    TODO項目の3割を完了済みにし、半数に前後30日の期限日時を設定する。件数カウンタも合わせて設定する。
+    """
+    rng = random.Random(0)
+    now = current_timestamp()
+    with engine.connect() as conn:
+        existing = conn.scalar(select(func.count()).select_from(ListModel.__table__).where(ListModel.__table__.c.deleted_at.is_(None)))
+    lists_per_batch = max(SEED_BATCH_SIZE // items_per_list, 1)
+    for start in range(existing, num_of_lists, lists_per_batch):
+        batch_size = min(lists_per_batch, num_of_lists - start)
+        items = [[{
+            "title": _text(rng, 3),
+            "description": _text(rng, 8),
+            "status_code": TodoItemStatusCode.COMPLETED.value if rng.random() < 0.3 else TodoItemStatusCode.NOT_COMPLETED.value,
+            "due_at": now + timedelta(hours=rng.randint(-720, 720)) if rng.random() < 0.5 else None,
+        } for _ in range(items_per_list)] for _ in range(batch_size)]
+        with engine.begin() as conn:
+            result = conn.execute(insert(ListModel.__table__).values([{
+                "title": _text(rng, 2),
+                "description": _text(rng, 4),
+                "item_count": items_per_list,
+                "completed_count": sum(x["status_code"] == TodoItemStatusCode.COMPLETED.value for x in list_items),
+            } for list_items in items]))
+            # 1文の複数行INSERTで採番されるidは連番となる
+            first_list_id = result.lastrowid
+            conn.execute(insert(ItemModel.__table__).values([
+                {"todo_list_id": first_list_id + i, **item} for i, list_items in enumerate(items) for item in list_items
+            ]))
+        print(f"seeded {start + batch_size} / {num_of_lists} lists", end="\r", file=sys.stderr, flush=True)  # noqa: T201
+    print(file=sys.stderr)  # noqa: T201
+
+
+def sample_ids() -> dict[str, list]:
+    """計測で参照するTODOリストのidと、(TODOリストのid, TODO項目のid)の組を返す."""
+    todo_lists = ListModel.__table__
+    todo_items = ItemModel.__table__
+    with engine.connect() as conn:
+        list_ids = conn.scalars(
+            select(todo_lists.c.id).where(todo_lists.c.deleted_at.is_(None)).order_by(todo_lists.c.id).limit(SAMPLE_IDS),
+        ).all()
+        item_ids = conn.execute(
+            select(todo_items.c.todo_list_id, todo_items.c.id)
+            .where(todo_items.c.todo_list_id.in_(list_ids), todo_items.c.deleted_at.is_(None))
+            .order_by(todo_items.c.id)
+            .limit(SAMPLE_IDS),
+        ).all()
+    if not list_ids or not item_ids:
+        msg = "no todo lists or todo items to measure; run with --seed-lists"
+        raise SystemExit(msg)
+    return {"lists": list_ids, "items": [tuple(x) for x in item_ids]}
+
+
+class Recorder:
+    """ルートごとのレイテンシとエラー件数、計測中に登録したTODOリスト・TODO項目のidを記録する."""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.created_lists: list[int] = []
+        self.created_items: list[int] = []
+
+    async def request(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> httpx.Response | None:  # noqa: ANN003
+        """リクエストを送り、routeの名前でレイテンシを記録する.
+
+        ステータスが400以上の場合と、タイムアウトなどで応答を受け取れなかった場合はエラーとして数える。
+        応答を受け取れなかった場合はNoneを返す。
+        """
+        started_at = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.timings.setdefault(route, []).append((time.perf_counter() - started_at) * 1000)
+        if response is None or response.status_code >= httpx.codes.BAD_REQUEST:
+            self.errors[route] = self.errors.get(route, 0) + 1
+        return response
+
+
+def _succeeded(response: httpx.Response | None) -> bool:
+    return response is not None and response.is_success
+
+
+async def _send(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response | None:  # noqa: ANN003
+    """計測しない準備・後片付けのリクエストを送る. 失敗した場合はNoneを返す."""
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError:
+        return None
+    return response if response.is_success else None
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, dict, random.Random], Awaitable[None]]
+
+
+async def _get_lists(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    await recorder.request(client, "GET /lists/", "GET", "/lists/", params={"page": rng.randint(1, 10)})
+
+
+async def _get_lists_include(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    await recorder.request(client, "GET /lists/?include", "GET", "/lists/", params={"include": "stats,items", "items_limit": 5})
+
+
+async def _get_list(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    await recorder.request(client, "GET /lists/{todo_list_id}", "GET", f"/lists/{rng.choice(ids['lists'])}")
+
+
+async def _get_items(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    await recorder.request(client, "GET /lists/{todo_list_id}/items/", "GET", f"/lists/{rng.choice(ids['lists'])}/items/")
+
+
+async def _get_items_filtered(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    await recorder.request(
+        client,
+        "GET /lists/{todo_list_id}/items/?status&sort",
+        "GET",
+        f"/lists/{rng.choice(ids['lists'])}/items/",
+        params={"status": TodoItemStatusCode.NOT_COMPLETED.value, "sort": "due_at"},
+    )
+
+
+async def _get_item(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    todo_list_id, todo_item_id = rng.choice(ids["items"])
+    await recorder.request(client, "GET /lists/{todo_list_id}/items/{todo_item_id}", "GET", f"/lists/{todo_list_id}/items/{todo_item_id}")
+
+
+async def _export_items(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    await recorder.request(client, "GET /lists/{todo_list_id}/items/export", "GET", f"/lists/{rng.choice(ids['lists'])}/items/export")
+
+
+async def _create_update_delete_list(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    # 計測用のデータを減らさないよう、登録したTODOリストを更新・削除・復元してから削除する
+    response = await recorder.request(client, "POST /lists/", "POST", "/lists/", json={"title": _text(rng, 2)})
+    if not _succeeded(response):
+        return
+    todo_list_id = response.json()["id"]
+    recorder.created_lists.append(todo_list_id)
+    await recorder.request(client, "PUT /lists/{todo_list_id}", "PUT", f"/lists/{todo_list_id}", json={"description": _text(rng, 4)})
+    await recorder.request(client, "DELETE /lists/{todo_list_id}", "DELETE", f"/lists/{todo_list_id}")
+    await recorder.request(client, "POST /lists/{todo_list_id}/restore", "POST", f"/lists/{todo_list_id}/restore")
+    await _send(client, "DELETE", f"/lists/{todo_list_id}")
+
+
+async def _delete_list_async(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    response = await _send(client, "POST", "/lists/", json={"title": _text(rng, 2)})
+    if response is None:
+        return
+    todo_list_id = response.json()["id"]
+    recorder.created_lists.append(todo_list_id)
+    await _send(client, "POST", f"/lists/{todo_list_id}/items/bulk", json=[{"title": _text(rng, 3)} for _ in range(20)])
+    response = await recorder.request(client, "DELETE /lists/{todo_list_id}?async", "DELETE", f"/lists/{todo_list_id}", params={"async": "true"})
+    if not _succeeded(response) or "Location" not in response.headers:
+        return
+    await recorder.request(client, "GET /lists/deletions/{job_id}", "GET", response.headers["Location"])
+
+
+async def _create_update_delete_item(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    todo_list_id = rng.choice(ids["lists"])
+    items_url = f"/lists/{todo_list_id}/items"
+    response = await recorder.request(client, "POST /lists/{todo_list_id}/items/", "POST", f"{items_url}/", json={"title": _text(rng, 3)})
+    if not _succeeded(response):
+        return
+    recorder.created_items.append(response.json()["id"])
+    item_url = f"{items_url}/{response.json()['id']}"
+    await recorder.request(client, "PUT /lists/{todo_list_id}/items/{todo_item_id}", "PUT", item_url, json={"complete": True})
+    await recorder.request(client, "DELETE /lists/{todo_list_id}/items/{todo_item_id}", "DELETE", item_url)
+    await recorder.request(client, "POST /lists/{todo_list_id}/items/{todo_item_id}/restore", "POST", f"{item_url}/restore")
+    await _send(client, "DELETE", item_url)
+
+
+async def _bulk_items(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    todo_list_id = rng.choice(ids["lists"])
+    response = await recorder.request(
+        client,
+        "POST /lists/{todo_list_id}/items/bulk",
+        "POST",
+        f"/lists/{todo_list_id}/items/bulk",
+        json=[{"title": _text(rng, 3)} for _ in range(10)],
+    )
+    if not _succeeded(response):
+        return
+    created_ids = [x["id"] for x in response.json()]
+    recorder.created_items.extend(created_ids)
+    await recorder.request(
+        client,
+        "PATCH /lists/{todo_list_id}/items/bulk",
+        "PATCH",
+        f"/lists/{todo_list_id}/items/bulk",
+        json={"ids": created_ids, "patch": {"complete": True}},
+    )
+    for todo_item_id in created_ids:
+        await _send(client, "DELETE", f"/lists/{todo_list_id}/items/{todo_item_id}")
+
+
+async def _import_items(client, recorder, ids, rng) -> None:  # noqa: ANN001
+    response = await _send(client, "POST", "/lists/", json={"title": _text(rng, 2)})
+    if response is None:
+        return
+    todo_list_id = response.json()["id"]
+    recorder.created_lists.append(todo_list_id)
+    body = "".join(json.dumps({"title": _text(rng, 3)}, ensure_ascii=False) + "\n" for _ in range(100))
+    await recorder.request(
+        client,
+        "POST /lists/{todo_list_id}/items/import",
+        "POST",
+        f"/lists/{todo_list_id}/items/import",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    await _send(client, "DELETE", f"/lists/{todo_list_id}")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "get_lists": _get_lists,
+    "get_lists_include": _get_lists_include,
+    "get_list": _get_list,
+    "get_items": _get_items,
+    "get_items_filtered": _get_items_filtered,
+    "get_item": _get_item,
+    "export_items": _export_items,
+    "create_update_delete_list": _create_update_delete_list,
+    "delete_list_async": _delete_list_async,
+    "create_update_delete_item": _create_update_delete_item,
+    "bulk_items": _bulk_items,
+    "import_items": _import_items,
+}
+
+
+def cleanup(list_ids: list[int], item_ids: list[int]) -> None:
+    """計測中に登録したTODOリスト・TODO項目を物理削除する.
+
+    TODOリストに属するTODO項目はON DELETE CASCADEで削除される。
+    既存のTODOリストに登録したTODO項目は、APIで論理削除して件数カウンタを戻したもののみを削除する。
+    """
+    todo_lists = ListModel.__table__
+    todo_items = ItemModel.__table__
+    for start in range(0, len(item_ids), SEED_BATCH_SIZE):
+        with engine.begin() as conn:
+            conn.execute(delete(todo_items).where(
+                todo_items.c.id.in_(item_ids[start:start + SEED_BATCH_SIZE]),
+                todo_items.c.deleted_at.is_not(None),
+            ))
+    for start in range(0, len(list_ids), SEED_BATCH_SIZE):
+        with engine.begin() as conn:
+            conn.execute(delete(todo_lists).where(todo_lists.c.id.in_(list_ids[start:start + SEED_BATCH_SIZE])))
+
+
+async def _worker(client: httpx.AsyncClient, recorder: Recorder, ids: dict, mix: dict[str, int], deadline: float, seed: int) -> None:
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        await SCENARIOS[rng.choices(names, weights)[0]](client, recorder, ids, rng)
+
+
+def _summarize(timings: list[float], errors: int, duration: float) -> dict:
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "throughput_rps": round(len(timings) / duration, 2),
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "p99_ms": round(percentiles[98], 2),
+    }
+
+
+async def run(base_url: str | None, duration: float, concurrency: int, mix: dict[str, int], ids: dict) -> dict:
+    """負荷試験を実行し、ルートごとと全体の計測結果を返す."""
+    if base_url is None:
+        from app.main import app  # noqa: PLC0415
+
+        # サーバーを起動した場合と同様に、アプリの例外は500の応答として受け取る
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://load-test"
+    else:
+        transport = httpx.AsyncHTTPTransport(retries=0)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    recorder = Recorder()
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=30) as client:
+        started_at = time.perf_counter()
+        deadline = started_at + duration
+        try:
+            await asyncio.gather(*(_worker(client, recorder, ids, mix, deadline, seed) for seed in range(concurrency)))
+            elapsed = time.perf_counter() - started_at
+        finally:
+            # アプリをプロセス内で呼び出す場合、削除ジョブが行ロックを保持したまま同じイベントループ上で動いているため、
+            # イベントループを止めないよう別スレッドで削除する
+            await asyncio.to_thread(cleanup, recorder.created_lists, recorder.created_items)
+
+    return {
+        "config": {"base_url": base_url, "duration": duration, "concurrency": concurrency, "mix": mix},
+        "total": _summarize([x for timings in recorder.timings.values() for x in timings], sum(recorder.errors.values()), elapsed),
+        "routes": {
+            route: _summarize(timings, recorder.errors.get(route, 0), elapsed)
+            for route, timings in sorted(recorder.timings.items())
+        },
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """基準の結果と比較し、悪化したルートの説明を返す. 基準にないルートは比較しない."""
+    regressions = []
+    for route, current in {"total": result["total"], **result["routes"]}.items():
+        expected = baseline["total"] if route == "total" else baseline["routes"].get(route)
+        if expected is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if current[key] > expected[key] * (1 + tolerance):
+                regressions.append(f"{route}: {key} {expected[key]} -> {current[key]}")
+        if current["throughput_rps"] < expected["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{route}: throughput_rps {expected['throughput_rps']} -> {current['throughput_rps']}")
+        if current["errors"] > expected["errors"]:
+            regressions.append(f"{route}: errors {expected['errors']} -> {current['errors']}")
+    return regressions
+
+
+def _parse_mix(values: list[str] | None) -> dict[str, int]:
+    if not values:
+        return MIX
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS or not weight.isdigit():
+            msg = f"invalid --mix {value!r}; expected one of {', '.join(SCENARIOS)} as name=weight"
+            raise SystemExit(msg)
+        mix[name] = int(weight)
+    return mix
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="URL of a running server; the app is called in-process when omitted")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to send requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="number of concurrent clients")
+    parser.add_argument("--mix", nargs="+", metavar="SCENARIO=WEIGHT", help="scenario weights (default: MIX)")
+    parser.add_argument("--seed-lists", type=int, default=1000, help="number of todo lists to prepare before measuring")
+    parser.add_argument("--items-per-list", type=int, default=50, help="number of todo items per seeded todo list")
+    parser.add_argument("--output", type=Path, help="write the result JSON to this file instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="fail if the result regressed from this result JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression against the baseline")
+    parser.add_argument("--save-baseline", type=Path, help="also write the result JSON to this file as the new baseline")
+    args = parser.parse_args()
+
+    mix = _parse_mix(args.mix)
+    if args.seed_lists:
+        seed(args.seed_lists, args.items_per_list)
+    result = asyncio.run(run(args.base_url, args.duration, args.concurrency, mix, sample_ids()))
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)  # noqa: T201
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(output + "\n")
+
+    if args.baseline:
+        regressions = compare(result, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)  # noqa: T201
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
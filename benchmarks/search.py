@@ -0,0 +1,129 @@
+"""全文検索(GET /search)のレイテンシを計測するベンチマーク.
+
+DB_*の環境変数で指定したデータベースに対して検索を繰り返し、検索語ごとの所要時間のパーセンタイルを出力する。
+--seedを指定すると、計測の前にTODOリスト(100項目ずつ)とTODO項目を指定件数まで登録する。
+--compare-likeを指定すると、LIKE '%検索語%' による検索の所要時間も併せて計測する。
+
+実行方法: python -m benchmarks.search --seed 1000000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import func, insert, or_, select
+
+from app.const import TodoItemStatusCode
+from app.crud import async_search_crud
+from app.database import AsyncSessionLocal, engine
+from app.models.item_model import ItemModel
+from app.models.list_model import ListModel
+
+ITEMS_PER_LIST = 100
+SEED_BATCH_SIZE = 5000
+DEFAULT_TERMS = ["買い物", "会議", "資料", "掃除", "report", "meeting"]
+WORDS = [
+    "買い物", "牛乳", "卵", "会議", "資料", "作成", "掃除", "洗濯", "予約", "病院", "支払い", "提出",
+    "report", "meeting", "review", "deploy", "invoice", "groceries", "call", "email", "draft", "plan",
+]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(rows: int) -> None:
+    """TODO項目がrows件になるまでTODOリストとTODO項目を登録する."""
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count()).select_from(ItemModel.__table__))
+    for start in range(existing, rows, ITEMS_PER_LIST * (SEED_BATCH_SIZE // ITEMS_PER_LIST)):
+        num_of_lists = min(SEED_BATCH_SIZE, rows - start) // ITEMS_PER_LIST or 1
+        with engine.begin() as conn:
+            result = conn.execute(insert(ListModel.__table__).values([{
+                "title": _text(rng, 2),
+                "description": _text(rng, 4),
+                "item_count": ITEMS_PER_LIST,
+            } for _ in range(num_of_lists)]))
+            first_list_id = result.lastrowid
+            conn.execute(insert(ItemModel.__table__).values([{
+                "todo_list_id": todo_list_id,
+                "title": _text(rng, 3),
+                "description": _text(rng, 8),
+                "status_code": TodoItemStatusCode.NOT_COMPLETED.value,
+            } for todo_list_id in range(first_list_id, first_list_id + num_of_lists) for _ in range(ITEMS_PER_LIST)]))
+        print(f"seeded {start + num_of_lists * ITEMS_PER_LIST} / {rows} items", end="\r", flush=True)  # noqa: T201
+    print()  # noqa: T201
+
+
+async def _measure(search, iterations: int) -> dict:
+    """検索をiterations回実行し、所要時間(ミリ秒)のパーセンタイルを返す."""
+    timings = []
+    rows = 0
+    for _ in range(iterations):
+        async with AsyncSessionLocal() as db:
+            started_at = time.perf_counter()
+            rows = len(await search(db))
+            timings.append((time.perf_counter() - started_at) * 1000)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return {
+        "rows": rows,
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+async def _like_search(db, term: str, per_page: int) -> list:
+    pattern = f"%{term}%"
+    result = await db.execute(
+        select(ItemModel.id)
+        .where(or_(ItemModel.title.like(pattern), ItemModel.description.like(pattern)))
+        .order_by(ItemModel.id)
+        .limit(per_page),
+    )
+    return result.all()
+
+
+async def run(terms: list[str], iterations: int, per_page: int, *, compare_like: bool) -> list[dict]:
+    """検索語ごとの計測結果を返す."""
+    results = []
+    for term in terms:
+        results.append({
+            "term": term,
+            "method": "fulltext",
+            **await _measure(lambda db, term=term: async_search_crud.search_todo_items(db, term, per_page), iterations),
+        })
+        if compare_like:
+            results.append({
+                "term": term,
+                "method": "like",
+                **await _measure(lambda db, term=term: _like_search(db, term, per_page), iterations),
+            })
+    return results
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="number of todo items to prepare before measuring")
+    parser.add_argument("--terms", nargs="+", default=DEFAULT_TERMS, help="search terms")
+    parser.add_argument("--iterations", type=int, default=20, help="number of searches per term")
+    parser.add_argument("--per-page", type=int, default=10, help="page size of each search")
+    parser.add_argument("--compare-like", action="store_true", help="also measure LIKE '%%term%%' searches")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed)
+    with engine.connect() as conn:
+        total = conn.scalar(select(func.count()).select_from(ItemModel.__table__))
+
+    print(f"todo_items: {total}")  # noqa: T201
+    print(f"{'term':<12}{'method':<10}{'rows':>6}{'p50_ms':>10}{'p95_ms':>10}{'max_ms':>10}")  # noqa: T201
+    for result in asyncio.run(run(args.terms, args.iterations, args.per_page, compare_like=args.compare_like)):
+        print(f"{result['term']:<12}{result['method']:<10}{result['rows']:>6}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['max_ms']:>10}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
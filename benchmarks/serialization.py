@@ -0,0 +1,96 @@
+"""TODO項目一覧のレスポンス生成時間を計測するベンチマーク.
+
+DBには接続せず、メモリ上に作成したItemModelを以下の方法でJSONに変換する時間を比較する。
+
+- jsonable_encoder: response_modelを指定しない場合のFastAPIの変換(ORMオブジェクト → jsonable_encoder → JSONResponse)
+- orjson_response: response_modelで検証した値をORJSONResponseで出力する場合
+- type_adapter: TypeAdapterでORMオブジェクトから直接JSONのバイト列を作成する場合(一覧エンドポイントの実装)
+
+実行方法: python -m benchmarks.serialization --sizes 1 100 10000
+"""
+
+import argparse
+import statistics
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.const import TodoItemStatusCode
+from app.models.item_model import ItemModel
+from app.schemas.item_schema import ResponseTodoItem
+
+todo_items_adapter = TypeAdapter(list[ResponseTodoItem])
+
+
+def build_items(count: int) -> list[ItemModel]:
+    """計測用のTODO項目を作成する."""
+    now = datetime(2024, 9, 8, 16, 47, 23)
+    return [
+        ItemModel(
+            id=i + 1,
+            todo_list_id=1,
+            title=f"benchmark item {i}",
+            description="description " * 10,
+            status_code=TodoItemStatusCode.NOT_COMPLETED.value,
+            due_at=now + timedelta(days=i % 30) if i % 2 == 0 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def serialize_jsonable_encoder(items: list[ItemModel]) -> bytes:  # noqa: D103
+    return JSONResponse(content=jsonable_encoder(items)).body
+
+
+def serialize_orjson_response(items: list[ItemModel]) -> bytes:  # noqa: D103
+    todo_items = todo_items_adapter.validate_python(items, from_attributes=True)
+    return ORJSONResponse(content=todo_items_adapter.dump_python(todo_items, mode="json")).body
+
+
+def serialize_type_adapter(items: list[ItemModel]) -> bytes:  # noqa: D103
+    return todo_items_adapter.dump_json(todo_items_adapter.validate_python(items, from_attributes=True))
+
+
+SERIALIZERS = {
+    "jsonable_encoder": serialize_jsonable_encoder,
+    "orjson_response": serialize_orjson_response,
+    "type_adapter": serialize_type_adapter,
+}
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    """件数・変換方法ごとの1回あたりの所要時間(ミリ秒)の中央値を返す."""
+    results = []
+    for size in sizes:
+        items = build_items(size)
+        # 件数が多いほど1回の計測に時間がかかるため、合計の実行回数を揃える
+        number = max(1, 1000 // size)
+        for name, serialize in SERIALIZERS.items():
+            timings = timeit.repeat(lambda serialize=serialize: serialize(items), number=number, repeat=repeat)
+            results.append({
+                "rows": size,
+                "serializer": name,
+                "median_ms": round(statistics.median(timings) / number * 1000, 3),
+                "bytes": len(serialize(items)),
+            })
+    return results
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000], help="number of rows")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements per serializer")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6}  {'serializer':<18}{'median_ms':>12}{'bytes':>12}")  # noqa: T201
+    for result in run(args.sizes, args.repeat):
+        print(f"{result['rows']:>6}  {result['serializer']:<18}{result['median_ms']:>12}{result['bytes']:>12}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""add performance indexes
+
+Revision ID: 6d05d3d06635
+Revises: 3f0b5fa5c5e1
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d05d3d06635'
+down_revision: Union[str, None] = '3f0b5fa5c5e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (todo_list_id, id) が todo_list_id_fk の外部キー用インデックスを兼ねるため、
+    # MySQLが自動で作成したインデックスはこのインデックスの作成時に削除される
+    op.create_index('ix_todo_items_todo_list_id_id', 'todo_items', ['todo_list_id', 'id'])
+    op.create_index('ix_todo_items_todo_list_id_status_code_due_at', 'todo_items', ['todo_list_id', 'status_code', 'due_at'])
+    op.create_index('ix_todo_items_updated_at', 'todo_items', ['updated_at'])
+    op.create_index('ix_todo_lists_updated_at', 'todo_lists', ['updated_at'])
+
+
+def downgrade() -> None:
+    # 外部キー制約にはインデックスが必須のため、先に単独のインデックスを戻してから削除する
+    op.create_index('todo_list_id_fk', 'todo_items', ['todo_list_id'])
+    op.drop_index('ix_todo_lists_updated_at', table_name='todo_lists')
+    op.drop_index('ix_todo_items_updated_at', table_name='todo_items')
+    op.drop_index('ix_todo_items_todo_list_id_status_code_due_at', table_name='todo_items')
+    op.drop_index('ix_todo_items_todo_list_id_id', table_name='todo_items')
@@ -0,0 +1,39 @@
+"""add item counters to todo_lists
+
+Revision ID: a4c2e8f1b7d3
+Revises: 6d05d3d06635
+Create Date: 2026-10-18 11:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c2e8f1b7d3'
+down_revision: Union[str, None] = '6d05d3d06635'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('todo_lists', sa.Column('item_count', sa.Integer, nullable=False, server_default=sa.text('0')))
+    op.add_column('todo_lists', sa.Column('completed_count', sa.Integer, nullable=False, server_default=sa.text('0')))
+    # 既存のTODO項目から件数を集計する。updated_atは集計によって更新しない
+    # 件数の多い環境では python -m app.commands.reconcile_counters でTODOリストを分割して集計し直せる
+    op.execute(
+        """
+        UPDATE todo_lists
+        SET
+            item_count = (SELECT COUNT(*) FROM todo_items WHERE todo_items.todo_list_id = todo_lists.id),
+            completed_count = (SELECT COUNT(*) FROM todo_items WHERE todo_items.todo_list_id = todo_lists.id AND todo_items.status_code = 2),
+            updated_at = updated_at
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('todo_lists', 'completed_count')
+    op.drop_column('todo_lists', 'item_count')
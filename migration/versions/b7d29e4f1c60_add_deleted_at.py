@@ -0,0 +1,35 @@
+"""add deleted_at
+
+Revision ID: b7d29e4f1c60
+Revises: e52b7c0d4a18
+Create Date: 2026-10-18 16:21:37.590312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d29e4f1c60'
+down_revision: Union[str, None] = 'e52b7c0d4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 論理削除日時。NULLの行のみAPIから参照できる
+    # MySQLには部分インデックスがないため、既存のインデックスはそのまま使い、deleted_atは絞り込み後に判定する
+    op.add_column('todo_lists', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('todo_items', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # 物理削除の対象(削除日時が一定より前の行)の検索用
+    op.create_index('ix_todo_lists_deleted_at', 'todo_lists', ['deleted_at'])
+    op.create_index('ix_todo_items_deleted_at', 'todo_items', ['deleted_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todo_items_deleted_at', table_name='todo_items')
+    op.drop_index('ix_todo_lists_deleted_at', table_name='todo_lists')
+    op.drop_column('todo_items', 'deleted_at')
+    op.drop_column('todo_lists', 'deleted_at')
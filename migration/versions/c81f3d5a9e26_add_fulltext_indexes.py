@@ -0,0 +1,29 @@
+"""add fulltext indexes
+
+Revision ID: c81f3d5a9e26
+Revises: a4c2e8f1b7d3
+Create Date: 2026-10-18 13:25:09.771342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3d5a9e26'
+down_revision: Union[str, None] = 'a4c2e8f1b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 日本語の文章は空白で単語が区切られないため、ngramパーサーで2文字ずつに分割してインデックスを作成する
+    op.create_index('ft_todo_lists_title_description', 'todo_lists', ['title', 'description'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    op.create_index('ft_todo_items_title_description', 'todo_items', ['title', 'description'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+
+
+def downgrade() -> None:
+    op.drop_index('ft_todo_items_title_description', table_name='todo_items')
+    op.drop_index('ft_todo_lists_title_description', table_name='todo_lists')
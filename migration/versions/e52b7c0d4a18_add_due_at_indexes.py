@@ -0,0 +1,30 @@
+"""add due_at indexes
+
+Revision ID: e52b7c0d4a18
+Revises: c81f3d5a9e26
+Create Date: 2026-10-18 14:03:51.208476
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e52b7c0d4a18'
+down_revision: Union[str, None] = 'c81f3d5a9e26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ステータスを指定せずに期限日時順に並べる場合用
+    op.create_index('ix_todo_items_todo_list_id_due_at', 'todo_items', ['todo_list_id', 'due_at'])
+    # TODOリストをまたいだ期限切れ項目の検索用
+    op.create_index('ix_todo_items_status_code_due_at', 'todo_items', ['status_code', 'due_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todo_items_status_code_due_at', table_name='todo_items')
+    op.drop_index('ix_todo_items_todo_list_id_due_at', table_name='todo_items')
@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 from sqlalchemy import inspect
 
+from app.cache import entity_cache
 from app.database import SessionLocal, engine
 from app.models import item_model, list_model
 
@@ -31,3 +34,6 @@ def _reset_records(db) -> None:
 
     if is_deleted:
         db.commit()
+
+    # テストで直接変更したレコードの古いキャッシュが残らないようにする
+    asyncio.run(entity_cache.clear())
@@ -0,0 +1,147 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.const import TodoItemStatusCode
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+NUM_OF_RECORDS = 25
+
+
+def test_post_todo_items_bulk(db_session) -> None:
+    """TODO項目を一括で登録できることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_list = list_model.ListModel(title="bulk_test", description="A test record for bulk items.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    # ******************
+    # テスト実行
+    # ******************
+    target_todo_list_id = db_todo_list.id
+    response = client.post(f"/lists/{target_todo_list_id}/items/bulk", json=[{
+        "title": f"bulk_test_{str(i).zfill(3)}",
+        "description": "A test record for bulk items.",
+        "due_at": "2024-09-08T16:47:23",
+    } for i in range(NUM_OF_RECORDS)])
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    db_session.reset()
+
+    assert response.status_code == status.HTTP_200_OK
+
+    response_body = response.json()
+    assert [x["title"] for x in response_body] == [f"bulk_test_{str(i).zfill(3)}" for i in range(NUM_OF_RECORDS)]
+    assert all(x["todo_list_id"] == target_todo_list_id for x in response_body)
+    assert all(x["status_code"] == TodoItemStatusCode.NOT_COMPLETED.value for x in response_body)
+
+    db_todo_items = db_session.query(item_model.ItemModel).filter(item_model.ItemModel.todo_list_id == target_todo_list_id).all()
+    assert sorted([x["id"] for x in response_body]) == sorted([x.id for x in db_todo_items])
+
+
+def test_post_todo_items_bulk_404_list_not_found() -> None:
+    """存在しないTODOリストへの一括登録が404となることの確認."""
+    response = client.post("/lists/-1/items/bulk", json=[{"title": "bulk_test"}])
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_post_todo_items_bulk_422_validation_error(db_session) -> None:
+    """1件でも不正な項目が含まれる場合に422となることの確認."""
+    db_todo_list = list_model.ListModel(title="bulk_test", description="A test record for bulk items.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    response = client.post(f"/lists/{db_todo_list.id}/items/bulk", json=[{"title": "bulk_test"}, {"title": ""}])
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_patch_todo_items_bulk_by_status(db_session) -> None:
+    """未完了の項目をまとめて完了に更新できることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_list = list_model.ListModel(title="bulk_test", description="A test record for bulk items.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_todo_items = [item_model.ItemModel(
+        todo_list_id=db_todo_list.id,
+        title=f"bulk_test_{str(i).zfill(3)}",
+        description="A test record for bulk items.",
+        status_code=TodoItemStatusCode.COMPLETED.value if i % 3 == 0 else TodoItemStatusCode.NOT_COMPLETED.value,
+    ) for i in range(NUM_OF_RECORDS)]
+    db_session.add_all(db_todo_items)
+    db_session.commit()
+    not_completed_ids = sorted([x.id for x in db_todo_items if x.status_code == TodoItemStatusCode.NOT_COMPLETED.value])
+
+    # ******************
+    # テスト実行
+    # ******************
+    target_todo_list_id = db_todo_list.id
+    response = client.patch(f"/lists/{target_todo_list_id}/items/bulk", json={
+        "status_code": TodoItemStatusCode.NOT_COMPLETED.value,
+        "patch": {"complete": True},
+        "return_items": True,
+    })
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    db_session.reset()
+
+    assert response.status_code == status.HTTP_200_OK
+
+    response_body = response.json()
+    assert response_body["updated"] == len(not_completed_ids)
+    assert [x["id"] for x in response_body["items"]] == not_completed_ids
+    assert all(x["status_code"] == TodoItemStatusCode.COMPLETED.value for x in response_body["items"])
+
+    db_todo_items = db_session.query(item_model.ItemModel).filter(item_model.ItemModel.todo_list_id == target_todo_list_id).all()
+    assert all(x.status_code == TodoItemStatusCode.COMPLETED.value for x in db_todo_items)
+
+
+def test_patch_todo_items_bulk_by_ids(db_session) -> None:
+    """指定したidの項目のみが更新されることの確認."""
+    db_todo_list = list_model.ListModel(title="bulk_test", description="A test record for bulk items.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_todo_items = [item_model.ItemModel(
+        todo_list_id=db_todo_list.id,
+        title=f"bulk_test_{str(i).zfill(3)}",
+        status_code=TodoItemStatusCode.NOT_COMPLETED.value) for i in range(3)]
+    db_session.add_all(db_todo_items)
+    db_session.commit()
+    target_ids = [db_todo_items[0].id, db_todo_items[2].id]
+
+    response = client.patch(f"/lists/{db_todo_list.id}/items/bulk", json={
+        "ids": target_ids,
+        "patch": {"title": "bulk_test_updated"},
+    })
+
+    db_session.reset()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"updated": 2, "items": None}
+
+    db_todo_items = db_session.query(item_model.ItemModel).filter(item_model.ItemModel.todo_list_id == db_todo_list.id).all()
+    assert sorted([x.id for x in db_todo_items if x.title == "bulk_test_updated"]) == sorted(target_ids)
+
+
+def test_patch_todo_items_bulk_404_list_not_found() -> None:
+    """存在しないTODOリストへの一括更新が404となることの確認."""
+    response = client.patch("/lists/-1/items/bulk", json={"patch": {"complete": True}})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,155 @@
+import asyncio
+import fnmatch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.cache import EntityCache, LRUCache, RedisCache
+from app.main import app
+from app.models import item_model, list_model
+from app.schemas.list_schema import ResponseTodoList
+
+client = TestClient(app)
+
+
+class FakeRedis:
+    """テスト用のRedisクライアントの代替."""
+
+    def __init__(self) -> None:
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.store):
+            if fnmatch.fnmatchcase(key, match or "*"):
+                yield key
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """件数上限を超えた場合に最も使われていないエントリが破棄されることの確認."""
+    async def _run():
+        cache = LRUCache(maxsize=2)
+        await cache.set("a", b"1")
+        await cache.set("b", b"2")
+        await cache.get("a")
+        await cache.set("c", b"3")
+        return await cache.get("a"), await cache.get("b"), await cache.get("c")
+
+    assert asyncio.run(_run()) == (b"1", None, b"3")
+
+
+def test_lru_cache_expires_entries() -> None:
+    """TTLを過ぎたエントリが返らないことの確認."""
+    async def _run():
+        cache = LRUCache(maxsize=10, ttl=60)
+        await cache.set("a", b"1", ex=0)
+        await cache.set("b", b"2")
+        return await cache.get("a"), await cache.get("b")
+
+    assert asyncio.run(_run()) == (None, b"2")
+
+
+def test_lru_cache_without_maxsize_keeps_entries_until_expiry() -> None:
+    """件数上限なしの場合、エントリが件数では破棄されず、期限切れのエントリのみが削除されることの確認."""
+    async def _run():
+        cache = LRUCache(maxsize=None)
+        await cache.set("expired", b"0", ex=0)
+        for i in range(2000):
+            await cache.set(f"job:{i}", b"1", ex=60)
+        return await cache.get("job:0"), "expired" in cache._entries, len(cache._entries)
+
+    assert asyncio.run(_run()) == (b"1", False, 2000)
+
+
+def test_entity_cache_with_redis_backend() -> None:
+    """Redisバックエンドで項目の世代による無効化が機能することの確認."""
+    async def _run():
+        cache = EntityCache(RedisCache(FakeRedis()))
+        todo_list = ResponseTodoList(id=1, title="cache_test", created_at="2024-09-08T16:47:23", updated_at="2024-09-08T16:47:23")
+        item_key = await cache.item_key(1, 10)
+        await cache.set(item_key, todo_list)
+        cached_before = await cache.get(item_key, ResponseTodoList)
+        await cache.invalidate_list(1, items=True)
+        cached_after = await cache.get(await cache.item_key(1, 10), ResponseTodoList)
+        return cached_before, cached_after
+
+    cached_before, cached_after = asyncio.run(_run())
+    assert cached_before.title == "cache_test"
+    assert cached_after is None
+
+
+def test_redis_cache_clear_keeps_other_keys() -> None:
+    """全削除で接頭辞の付いたキーのみが削除され、同じRedisの他のキーが残ることの確認."""
+    async def _run():
+        client = FakeRedis()
+        client.store["other_app:key"] = b"1"
+        cache = RedisCache(client, prefix="todo_api:")
+        await cache.set("todo_list:1", b"2")
+        await cache.clear()
+        return client.store
+
+    assert asyncio.run(_run()) == {"other_app:key": b"1"}
+
+
+def test_entity_cache_generation_eviction_does_not_resurrect_entries() -> None:
+    """世代のキーがLRUから破棄されても、無効化済みの古いTODO項目が再び返らないことの確認."""
+    async def _run():
+        cache = EntityCache(LRUCache(maxsize=10))
+        todo_list = ResponseTodoList(id=1, title="cache_test", created_at="2024-09-08T16:47:23", updated_at="2024-09-08T16:47:23")
+        await cache.set(await cache.item_key(1, 10), todo_list)
+        await cache.invalidate_list(1, items=True)
+        stale_key = await cache.item_key(1, 10)
+        await cache.set(stale_key, todo_list)
+        await cache.invalidate_list(1, items=True)
+        # 世代のキーのみが破棄された状態
+        await cache.backend.delete("todo_list_gen:1")
+        return await cache.item_key(1, 10) != stale_key, await cache.get(await cache.item_key(1, 10), ResponseTodoList)
+
+    assert asyncio.run(_run()) == (True, None)
+
+
+def test_get_todo_list_after_update_is_not_stale(db_session) -> None:
+    """更新APIの実行後にキャッシュされた古いTODOリストが返らないことの確認."""
+    db_todo_list = list_model.ListModel(title="cache_test", description="A test record for cache.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+    target_todo_list_id = db_todo_list.id
+
+    # キャッシュに載せる
+    assert client.get(f"/lists/{target_todo_list_id}").json()["title"] == "cache_test"
+
+    client.put(f"/lists/{target_todo_list_id}", json={"title": "updated_cache_test"})
+    response = client.get(f"/lists/{target_todo_list_id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "updated_cache_test"
+
+
+def test_get_todo_item_after_delete_is_not_stale(db_session) -> None:
+    """削除APIの実行後にキャッシュされたTODO項目が返らないことの確認."""
+    db_todo_list = list_model.ListModel(title="cache_test", description="A test record for cache.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_todo_item = item_model.ItemModel(todo_list_id=db_todo_list.id, title="cache_test", status_code=1)
+    db_session.add(db_todo_item)
+    db_session.commit()
+    db_session.refresh(db_todo_item)
+
+    target_url = f"/lists/{db_todo_list.id}/items/{db_todo_item.id}"
+    assert client.get(target_url).status_code == status.HTTP_200_OK
+
+    client.delete(target_url)
+    response = client.get(target_url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,229 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+
+from app.cache import entity_cache
+from app.database import async_engine
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+@contextmanager
+def _capture_statements():
+    """実行されたSQLを記録する."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@pytest.fixture
+def todo_item(db_session):
+    db_todo_list = list_model.ListModel(title="etag_test", description="A test record for conditional requests.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_todo_item = item_model.ItemModel(todo_list_id=db_todo_list.id, title="etag_test", status_code=1)
+    db_session.add(db_todo_item)
+    db_session.commit()
+    db_session.refresh(db_todo_item)
+    return db_todo_list.id, db_todo_item.id
+
+
+@pytest.mark.parametrize("path", [
+    "/lists",
+    "/lists/{todo_list_id}",
+    "/lists/{todo_list_id}/items",
+    "/lists/{todo_list_id}/items/{todo_item_id}",
+])
+def test_get_with_if_none_match(path: str, todo_item) -> None:
+    """ETagが一致する場合に304がボディなしで返ることの確認."""
+    todo_list_id, todo_item_id = todo_item
+    url = path.format(todo_list_id=todo_list_id, todo_item_id=todo_item_id)
+
+    # ******************
+    # テスト実行
+    # ******************
+    first_response = client.get(url)
+    etag = first_response.headers["ETag"]
+    second_response = client.get(url, headers={"If-None-Match": etag})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert first_response.status_code == status.HTTP_200_OK
+    assert "Last-Modified" in first_response.headers
+    assert second_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second_response.content == b""
+    assert second_response.headers["ETag"] == etag
+
+
+def test_get_todo_item_with_if_modified_since(todo_item) -> None:
+    """Last-Modified以降に更新がない場合に304が返ることの確認."""
+    todo_list_id, todo_item_id = todo_item
+    url = f"/lists/{todo_list_id}/items/{todo_item_id}"
+
+    first_response = client.get(url)
+    second_response = client.get(url, headers={"If-Modified-Since": first_response.headers["Last-Modified"]})
+
+    assert second_response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_get_todo_list_ignores_if_modified_since_after_item_added(todo_item) -> None:
+    """TODO項目の追加で件数だけが変わったTODOリストは、If-Modified-Sinceを指定しても更新後の件数で200が返ることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id, _ = todo_item
+    first_response = client.get(f"/lists/{todo_list_id}")
+
+    # ******************
+    # テスト実行
+    # ******************
+    client.post(f"/lists/{todo_list_id}/items", json={"title": "etag_test_added"})
+    second_response = client.get(f"/lists/{todo_list_id}", headers={"If-Modified-Since": first_response.headers["Last-Modified"]})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response.json()["item_count"] == first_response.json()["item_count"] + 1
+
+
+def test_get_todo_list_etag_changes_after_update(todo_item) -> None:
+    """更新後は古いETagで200が返ることの確認."""
+    todo_list_id, _ = todo_item
+
+    etag = client.get(f"/lists/{todo_list_id}").headers["ETag"]
+    client.put(f"/lists/{todo_list_id}", json={"title": "updated_etag_test"})
+    response = client.get(f"/lists/{todo_list_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "updated_etag_test"
+
+
+@pytest.mark.parametrize("path", [
+    "/lists",
+    "/lists/{todo_list_id}",
+    "/lists/{todo_list_id}/items",
+    "/lists/{todo_list_id}/items/{todo_item_id}",
+])
+def test_not_modified_without_reading_entities(path: str, todo_item, db_session) -> None:
+    """304を返す場合は、バージョンのカラムのみをSELECTし、エンティティ全体を取得しないことの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id, todo_item_id = todo_item
+    # 直近に更新された行はボディで判定するため、更新日時を過去にする
+    for model in (list_model.ListModel, item_model.ItemModel):
+        db_session.execute(update(model).values(updated_at=datetime(2024, 9, 8, 16, 47, 23)))
+    db_session.commit()
+    url = path.format(todo_list_id=todo_list_id, todo_item_id=todo_item_id)
+    etag = client.get(url).headers["ETag"]
+    asyncio.run(entity_cache.clear())
+
+    # ******************
+    # テスト実行
+    # ******************
+    with _capture_statements() as statements:
+        response = client.get(url, headers={"If-None-Match": etag})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(statements) == 1
+    assert "title" not in statements[0]
+
+
+@pytest.mark.parametrize("path", ["/lists", "/lists/{todo_list_id}"])
+def test_get_todo_list_etag_changes_after_item_added(path: str, todo_item, db_session) -> None:
+    """TODO項目の追加で件数が変わった場合は、TODOリストの更新日時が変わらなくても古いETagで200が返ることの確認."""
+    todo_list_id, _ = todo_item
+    url = path.format(todo_list_id=todo_list_id)
+    db_session.execute(update(list_model.ListModel).values(updated_at=datetime(2024, 9, 8, 16, 47, 23)))
+    db_session.commit()
+
+    first_response = client.get(url)
+    client.post(f"/lists/{todo_list_id}/items", json={"title": "etag_test_added"})
+    second_response = client.get(url, headers={"If-None-Match": first_response.headers["ETag"]})
+
+    assert first_response.headers["ETag"].startswith("W/")
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response.headers["ETag"] != first_response.headers["ETag"]
+
+
+def test_get_todo_items_etag_changes_after_item_added(todo_item) -> None:
+    """一覧のページにTODO項目が追加された場合は古いETagで200が返ることの確認."""
+    todo_list_id, _ = todo_item
+
+    etag = client.get(f"/lists/{todo_list_id}/items").headers["ETag"]
+    client.post(f"/lists/{todo_list_id}/items", json={"title": "etag_test_added"})
+    response = client.get(f"/lists/{todo_list_id}/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 2
+
+
+def test_get_todo_items_etag_changes_after_item_deleted(todo_item, db_session) -> None:
+    """論理削除されたTODO項目がページのバージョンから除かれ、古いETagで200が返ることの確認."""
+    todo_list_id, todo_item_id = todo_item
+    db_session.execute(update(item_model.ItemModel).values(updated_at=datetime(2024, 9, 8, 16, 47, 23)))
+    db_session.commit()
+
+    etag = client.get(f"/lists/{todo_list_id}/items").headers["ETag"]
+    client.delete(f"/lists/{todo_list_id}/items/{todo_item_id}")
+    response = client.get(f"/lists/{todo_list_id}/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+def test_get_todo_lists_etag_changes_when_counters_cancel_out(db_session) -> None:
+    """ページ内の2つのTODOリストで完了件数の増減が打ち消し合っても、古いETagで200が返ることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_ids = [client.post("/lists/", json={"title": f"etag_test_{i}"}).json()["id"] for i in range(2)]
+    todo_item_ids = [client.post(f"/lists/{x}/items", json={"title": "etag_test"}).json()["id"] for x in todo_list_ids]
+    client.put(f"/lists/{todo_list_ids[0]}/items/{todo_item_ids[0]}", json={"complete": True})
+    db_session.execute(update(list_model.ListModel).values(updated_at=datetime(2024, 9, 8, 16, 47, 23)))
+    db_session.commit()
+    etag = client.get("/lists").headers["ETag"]
+
+    # ******************
+    # テスト実行
+    # ******************
+    client.put(f"/lists/{todo_list_ids[0]}/items/{todo_item_ids[0]}", json={"complete": False})
+    client.put(f"/lists/{todo_list_ids[1]}/items/{todo_item_ids[1]}", json={"complete": True})
+    response = client.get("/lists", headers={"If-None-Match": etag})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert etag.startswith("W/")
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["completed_count"] for x in response.json()] == [0, 1]
+
+
+def test_get_todo_lists_etag_depends_on_fields(todo_item) -> None:
+    """fieldsの指定でレスポンスの形が変わる場合はETagも変わることの確認."""
+    etag = client.get("/lists").headers["ETag"]
+    response = client.get("/lists", params={"fields": "title"}, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0].keys() == {"id", "title"}
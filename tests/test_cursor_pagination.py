@@ -0,0 +1,86 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+NUM_OF_RECORDS = 15
+
+
+def test_get_todo_lists_cursor_pagination(db_session) -> None:
+    """カーソル指定でTODOリスト一覧を最後まで辿れることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_lists = [list_model.ListModel(
+        title=f"cursor_test_{str(i).zfill(3)}",
+        description="A test record for cursor pagination.") for i in range(NUM_OF_RECORDS)]
+    db_session.add_all(db_todo_lists)
+    db_session.commit()
+    for x in db_todo_lists:
+        db_session.refresh(x)
+
+    # ******************
+    # テスト実行
+    # ******************
+    first_response = client.get("/lists", params={"per_page": 10})
+    next_cursor = first_response.headers["X-Next-Cursor"]
+    second_response = client.get("/lists", params={"per_page": 10, "cursor": next_cursor})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert first_response.status_code == status.HTTP_200_OK
+    assert second_response.status_code == status.HTTP_200_OK
+
+    actual_data_ids = [x["id"] for x in first_response.json() + second_response.json()]
+    expected_data_ids = sorted([x.id for x in db_todo_lists])
+    assert actual_data_ids == expected_data_ids
+
+    # 最終ページでは次のカーソルが返らないことの確認
+    assert "X-Next-Cursor" not in second_response.headers
+
+
+def test_get_todo_items_cursor_pagination(db_session) -> None:
+    """カーソル指定でTODO項目一覧を取得できることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_list = list_model.ListModel(title="cursor_test", description="A test record for cursor pagination.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_todo_items = [item_model.ItemModel(
+        todo_list_id=db_todo_list.id,
+        title=f"cursor_test_{str(i).zfill(3)}",
+        description="A test record for cursor pagination.", status_code=1) for i in range(NUM_OF_RECORDS)]
+    db_session.add_all(db_todo_items)
+    db_session.commit()
+    for x in db_todo_items:
+        db_session.refresh(x)
+
+    # ******************
+    # テスト実行
+    # ******************
+    todo_list_id = db_todo_list.id
+    first_response = client.get(f"/lists/{todo_list_id}/items", params={"per_page": 5})
+    next_cursor = first_response.headers["X-Next-Cursor"]
+    second_response = client.get(f"/lists/{todo_list_id}/items", params={"per_page": 5, "cursor": next_cursor})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert second_response.status_code == status.HTTP_200_OK
+
+    expected_data_ids = sorted([x.id for x in db_todo_items])
+    assert [x["id"] for x in second_response.json()] == expected_data_ids[5:10]
+
+
+def test_get_todo_lists_invalid_cursor() -> None:
+    """不正なカーソルを指定した場合に400となることの確認."""
+    response = client.get("/lists", params={"cursor": "invalid-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
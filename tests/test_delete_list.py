@@ -0,0 +1,140 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app import const
+from app.crud import async_list_crud
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+NUM_OF_ITEMS = 25
+
+
+def _seed(db_session) -> int:
+    db_todo_list = list_model.ListModel(title="delete_test", description="A test record for chunked deletion.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.add_all([item_model.ItemModel(todo_list_id=db_todo_list.id, title=f"delete_test_{i}", status_code=1) for i in range(NUM_OF_ITEMS)])
+    db_session.commit()
+    return db_todo_list.id
+
+
+def test_delete_todo_list_is_soft_delete(db_session) -> None:
+    """TODOリストの削除では削除日時のみ設定され、TODO項目は残ることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id = _seed(db_session)
+
+    # ******************
+    # テスト実行
+    # ******************
+    response = client.delete(f"/lists/{todo_list_id}")
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    db_session.reset()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {}
+    assert db_session.query(list_model.ListModel).filter(list_model.ListModel.id == todo_list_id).count() == 0
+    db_list = db_session.query(list_model.ListModel)\
+        .filter(list_model.ListModel.id == todo_list_id)\
+        .execution_options(include_deleted=True)\
+        .one()
+    assert db_list.deleted_at is not None
+    assert db_session.query(item_model.ItemModel)\
+        .filter(item_model.ItemModel.todo_list_id == todo_list_id)\
+        .execution_options(include_deleted=True)\
+        .count() == NUM_OF_ITEMS
+
+
+def test_delete_todo_list_async(db_session, monkeypatch) -> None:
+    """async=trueで物理削除のジョブが作成され、TODO項目がチャンクごとに削除されることの確認."""
+    monkeypatch.setattr(const, "DELETE_CHUNK_SIZE", 10)
+    todo_list_id = _seed(db_session)
+
+    response = client.delete(f"/lists/{todo_list_id}", params={"async": "true"})
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["todo_list_id"] == todo_list_id
+
+    # TestClientではレスポンスを返す前にバックグラウンドタスクが完了している
+    response = client.get(response.headers["Location"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "completed"
+    assert response.json()["deleted_items"] == NUM_OF_ITEMS
+
+    db_session.reset()
+
+    assert db_session.query(list_model.ListModel)\
+        .filter(list_model.ListModel.id == todo_list_id)\
+        .execution_options(include_deleted=True)\
+        .count() == 0
+    assert db_session.query(item_model.ItemModel)\
+        .filter(item_model.ItemModel.todo_list_id == todo_list_id)\
+        .execution_options(include_deleted=True)\
+        .count() == 0
+
+
+def test_delete_todo_list_async_cancelled_by_restore(db_session, monkeypatch) -> None:
+    """物理削除のジョブの実行中にTODOリストが復元された場合、削除が中止され残りのTODO項目が残ることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    monkeypatch.setattr(const, "DELETE_CHUNK_SIZE", 10)
+    todo_list_id = _seed(db_session)
+    update_job = async_list_crud.update_job
+
+    # 最初のチャンクの削除が報告された時点で、別のセッションからTODOリストを復元する
+    async def update_job_and_restore(job, **fields) -> None:  # noqa: ANN001, ANN003
+        if fields.get("deleted_items"):
+            db_session.execute(update(list_model.ListModel.__table__)
+                               .where(list_model.ListModel.id == todo_list_id)
+                               .values(deleted_at=None))
+            db_session.commit()
+        await update_job(job, **fields)
+
+    monkeypatch.setattr(async_list_crud, "update_job", update_job_and_restore)
+
+    # ******************
+    # テスト実行
+    # ******************
+    response = client.delete(f"/lists/{todo_list_id}", params={"async": "true"})
+    job = client.get(response.headers["Location"])
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert job.json()["status"] == "cancelled"
+    assert job.json()["deleted_items"] == const.DELETE_CHUNK_SIZE
+
+    response = client.get(f"/lists/{todo_list_id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["item_count"] == NUM_OF_ITEMS - const.DELETE_CHUNK_SIZE
+
+    db_session.reset()
+
+    assert db_session.query(item_model.ItemModel)\
+        .filter(item_model.ItemModel.todo_list_id == todo_list_id)\
+        .count() == NUM_OF_ITEMS - const.DELETE_CHUNK_SIZE
+
+
+def test_delete_todo_list_async_404_list_not_found(db_session) -> None:
+    """存在しないTODOリストの削除ジョブは作成されないことの確認."""
+    response = client.delete("/lists/1", params={"async": "true"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_deletion_job_404_job_not_found() -> None:
+    """存在しない削除ジョブの取得が404となることの確認."""
+    response = client.get("/lists/deletions/unknown")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
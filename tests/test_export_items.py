@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+NUM_OF_RECORDS = 1200
+
+
+def test_export_todo_items(db_session) -> None:
+    """TODOリスト内の全項目がNDJSONで出力されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_list = list_model.ListModel(title="export_test", description="A test record for export.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_session.add_all([item_model.ItemModel(
+        todo_list_id=db_todo_list.id,
+        title=f"export_test_{str(i).zfill(4)}",
+        status_code=1) for i in range(NUM_OF_RECORDS)])
+    db_session.commit()
+
+    # ******************
+    # テスト実行
+    # ******************
+    response = client.get(f"/lists/{db_todo_list.id}/items/export")
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+
+    exported_items = [json.loads(x) for x in response.text.splitlines()]
+    assert [x["title"] for x in exported_items] == [f"export_test_{str(i).zfill(4)}" for i in range(NUM_OF_RECORDS)]
+    assert all(x["todo_list_id"] == db_todo_list.id for x in exported_items)
+
+
+async def _read_first_chunk_and_disconnect(path: str) -> bytes:
+    """ASGIアプリを直接呼び出し、最初のチャンクを受け取った時点でクライアントの切断を通知する."""
+    chunks = []
+    first_chunk_sent = asyncio.Event()
+    requested = False
+
+    async def receive() -> dict:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await first_chunk_sent.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.body" and message["body"]:
+            chunks.append(message["body"])
+            first_chunk_sent.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return chunks[0]
+
+
+def test_export_todo_items_returns_connection_on_disconnect(db_session) -> None:
+    """エクスポートの途中でクライアントが切断した場合も、DBの接続がプールに返却されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_list = list_model.ListModel(title="export_test", description="A test record for export.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_session.add_all([item_model.ItemModel(
+        todo_list_id=db_todo_list.id,
+        title=f"export_test_{str(i).zfill(4)}",
+        status_code=1) for i in range(NUM_OF_RECORDS)])
+    db_session.commit()
+    checked_out = client.get("/health/pool").json()["async"]["checked_out"]
+
+    # ******************
+    # テスト実行
+    # ******************
+    first_chunk = asyncio.run(_read_first_chunk_and_disconnect(f"/lists/{db_todo_list.id}/items/export"))
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert json.loads(first_chunk.splitlines()[0])["title"] == "export_test_0000"
+    assert client.get("/health/pool").json()["async"]["checked_out"] == checked_out
+
+
+def test_export_todo_items_404_list_not_found() -> None:
+    """存在しないTODOリストのエクスポートが404となることの確認."""
+    response = client.get("/lists/-1/items/export")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
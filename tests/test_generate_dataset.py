@@ -0,0 +1,55 @@
+import time
+
+from sqlalchemy import func, select
+
+from app.commands import generate_dataset
+from app.commands.reconcile_counters import reconcile_counters
+from app.models import item_model, list_model
+
+
+def test_plan_chunks() -> None:
+    """チャンクごとのidの範囲が重複せず連続し、偏ったTODO項目数でも全TODOリストが割り当てられることの確認."""
+    item_counts = generate_dataset.plan_item_counts(200, 50, 1.2, 1000, seed=0)
+
+    chunks = generate_dataset.plan_chunks(item_counts, first_list_id=11, first_item_id=101, chunk_rows=500)
+
+    assert max(item_counts) <= 1000
+    assert len(set(item_counts)) > 1
+    assert [count for _, _, counts in chunks for count in counts] == item_counts
+    next_list_id, next_item_id = 11, 101
+    for list_id, item_id, counts in chunks:
+        assert (list_id, item_id) == (next_list_id, next_item_id)
+        # 1件のTODOリストのTODO項目がchunk_rowsを超える場合を除き、chunk_rows以下にまとめる
+        assert len(counts) == 1 or sum(counts) <= 500
+        next_list_id += len(counts)
+        next_item_id += sum(counts)
+
+
+def test_load_chunk(db_session) -> None:
+    """生成したTODOリストが登録したTODO項目と一致する件数カウンタで登録されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    generate_dataset._init_worker("insert")
+    options = {
+        "now": int(time.time()),
+        "lang": "mixed",
+        "due_days": 30,
+        "completed_ratio": 0.3,
+        "due_ratio": 0.5,
+        "method": "insert",
+    }
+    chunk = (1, 1, [0, 3, 10])
+
+    # ******************
+    # テスト実行
+    # ******************
+    rows = generate_dataset.load_chunk(chunk, options, seed=0)
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert rows == 3 + 13
+    assert db_session.scalar(select(func.count()).select_from(list_model.ListModel)) == 3
+    assert db_session.scalar(select(func.count()).select_from(item_model.ItemModel)) == 13
+    assert reconcile_counters(db_session, dry_run=True) == (3, [])
@@ -0,0 +1,23 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_get_health_pool() -> None:
+    """コネクションプールの利用状況が取得できることの確認."""
+    # テスト実行
+    response = client.get("/health/pool")
+
+    # 実行結果の検証
+    assert response.status_code == status.HTTP_200_OK
+
+    response_body = response.json()
+    sync_pool = response_body["sync"]
+    assert sync_pool["pool"] == "TimedQueuePool"
+    for key in ("size", "checked_out", "idle", "overflow"):
+        assert sync_pool[key] >= 0
+    assert set(sync_pool["checkout_wait_ms"]) == {"count", "p50", "p95", "p99", "max"}
+    assert "async" in response_body
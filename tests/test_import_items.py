@@ -0,0 +1,73 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def _create_todo_list(db_session) -> int:
+    db_todo_list = list_model.ListModel(title="import_test", description="A test record for import.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+    return db_todo_list.id
+
+
+def test_import_todo_items_ndjson(db_session) -> None:
+    """NDJSONの不正な行を報告しつつ残りの行が登録されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id = _create_todo_list(db_session)
+    lines = [f'{{"title": "import_test_{i}"}}' for i in range(5)]
+    lines.insert(2, '{"title": ""}')
+    lines.insert(4, "not json")
+    body = "\n".join(lines).encode()
+
+    # ******************
+    # テスト実行
+    # ******************
+    response = client.post(f"/lists/{todo_list_id}/items/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    db_session.reset()
+
+    assert response.status_code == status.HTTP_200_OK
+
+    response_body = response.json()
+    assert response_body["imported"] == 5
+    assert response_body["failed"] == 2
+    assert [x["line"] for x in response_body["errors"]] == [3, 5]
+    assert response_body["rows_per_second"] > 0
+
+    db_todo_items = db_session.query(item_model.ItemModel).filter(item_model.ItemModel.todo_list_id == todo_list_id).order_by(item_model.ItemModel.id).all()
+    assert [x.title for x in db_todo_items] == [f"import_test_{i}" for i in range(5)]
+
+
+def test_import_todo_items_csv(db_session) -> None:
+    """改行を含む値のあるCSVが登録されることの確認."""
+    todo_list_id = _create_todo_list(db_session)
+    body = 'title,description,due_at\r\nimport_test_1,,\r\nimport_test_2,"multi\nline",2024-09-08T16:47:23\r\n'.encode()
+
+    response = client.post(f"/lists/{todo_list_id}/items/import", content=body, headers={"Content-Type": "text/csv"})
+
+    db_session.reset()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["imported"] == 2
+
+    db_todo_items = db_session.query(item_model.ItemModel).filter(item_model.ItemModel.todo_list_id == todo_list_id).order_by(item_model.ItemModel.id).all()
+    assert [(x.title, x.description) for x in db_todo_items] == [("import_test_1", None), ("import_test_2", "multi\nline")]
+
+
+def test_import_todo_items_415_unsupported_media_type(db_session) -> None:
+    """対応していない形式のアップロードが415となることの確認."""
+    todo_list_id = _create_todo_list(db_session)
+
+    response = client.post(f"/lists/{todo_list_id}/items/import", content=b"title", headers={"Content-Type": "text/plain"})
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
@@ -0,0 +1,80 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+NUM_OF_LISTS = 3
+NUM_OF_ITEMS = 4
+
+
+def _seed(db_session) -> list[int]:
+    db_todo_lists = [list_model.ListModel(title=f"include_test_{i}", description="A test record for include.") for i in range(NUM_OF_LISTS)]
+    db_session.add_all(db_todo_lists)
+    db_session.commit()
+    # 最後のTODOリストには項目を登録しない
+    db_session.add_all([item_model.ItemModel(
+        todo_list_id=x.id,
+        title=f"include_test_{i}",
+        status_code=1) for x in db_todo_lists[:-1] for i in range(NUM_OF_ITEMS)])
+    db_session.commit()
+    return [x.id for x in db_todo_lists]
+
+
+def test_get_todo_lists_include_items(db_session) -> None:
+    """include=itemsで各TODOリストの先頭items_limit件の項目が1回のクエリで付与されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_ids = _seed(db_session)
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "todo_" in statement:
+            statements.append(statement)
+
+    # ******************
+    # テスト実行
+    # ******************
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        response = client.get("/lists", params={"include": "items", "items_limit": 2, "per_page": 100})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_200_OK
+
+    items = {x["id"]: [y["title"] for y in x["items"]] for x in response.json()}
+    assert items[todo_list_ids[0]] == ["include_test_0", "include_test_1"]
+    assert items[todo_list_ids[1]] == ["include_test_0", "include_test_1"]
+    assert items[todo_list_ids[2]] == []
+
+    # TODOリスト一覧のSELECTとTODO項目のSELECTの2回のみ
+    assert len(statements) == 2
+
+
+def test_get_todo_list_include_items(db_session) -> None:
+    """TODOリストの取得でもinclude=itemsで項目が付与されることの確認."""
+    todo_list_ids = _seed(db_session)
+
+    response = client.get(f"/lists/{todo_list_ids[0]}", params={"include": "items"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == NUM_OF_ITEMS
+    assert "stats" not in response.json()
+
+
+def test_get_todo_list_422_items_limit_out_of_range(db_session) -> None:
+    """items_limitが範囲外の場合に422となることの確認."""
+    todo_list_ids = _seed(db_session)
+
+    response = client.get(f"/lists/{todo_list_ids[0]}", params={"include": "items", "items_limit": 0})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
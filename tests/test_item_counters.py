@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.commands.reconcile_counters import reconcile_counters
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def test_item_counters_follow_item_writes(db_session) -> None:
+    """TODO項目の登録・完了・削除に合わせて件数カウンタが更新されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    response = client.post("/lists", json={"title": "counter_test", "description": "A test record for counters."})
+    todo_list_id = response.json()["id"]
+    assert response.json()["item_count"] == 0
+    assert response.json()["completed_count"] == 0
+
+    # ******************
+    # テスト実行
+    # ******************
+    todo_item_ids = [client.post(f"/lists/{todo_list_id}/items", json={"title": f"counter_test_{i}"}).json()["id"] for i in range(3)]
+    client.post(f"/lists/{todo_list_id}/items/bulk", json=[{"title": "counter_test_bulk_1"}, {"title": "counter_test_bulk_2"}])
+    # 完了済みの項目を再度完了にしても件数は増えない
+    client.put(f"/lists/{todo_list_id}/items/{todo_item_ids[0]}", json={"complete": True})
+    client.put(f"/lists/{todo_list_id}/items/{todo_item_ids[0]}", json={"complete": True})
+    client.delete(f"/lists/{todo_list_id}/items/{todo_item_ids[0]}")
+    client.put(f"/lists/{todo_list_id}/items/{todo_item_ids[1]}", json={"complete": True})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    response = client.get(f"/lists/{todo_list_id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["item_count"] == 4
+    assert response.json()["completed_count"] == 1
+
+
+def test_item_counters_keep_list_updated_at(db_session) -> None:
+    """件数カウンタの更新・修正でTODOリストのupdated_atが変わらないことの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    updated_at = datetime(2024, 1, 1, 9, 0, 0)
+    db_todo_list = list_model.ListModel(title="counter_test", description="A test record for counters.", updated_at=updated_at)
+    db_session.add(db_todo_list)
+    db_session.commit()
+    # カウンタを経由せずに登録し、集計し直しの対象にする
+    db_session.add(item_model.ItemModel(todo_list_id=db_todo_list.id, title="counter_test_direct", status_code=1))
+    db_session.commit()
+
+    # ******************
+    # テスト実行
+    # ******************
+    todo_item_id = client.post(f"/lists/{db_todo_list.id}/items", json={"title": "counter_test"}).json()["id"]
+    client.put(f"/lists/{db_todo_list.id}/items/{todo_item_id}", json={"complete": True})
+    client.delete(f"/lists/{db_todo_list.id}/items/{todo_item_id}")
+    reconcile_counters(db_session)
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    db_session.refresh(db_todo_list)
+
+    assert db_todo_list.item_count == 1
+    assert db_todo_list.updated_at == updated_at
+
+
+def test_reconcile_counters(db_session) -> None:
+    """カウンタを経由せずに登録されたTODO項目の件数のずれが修正されることの確認."""
+    db_todo_list = list_model.ListModel(title="counter_test", description="A test record for counters.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.add_all([item_model.ItemModel(todo_list_id=db_todo_list.id, title=f"counter_test_{i}", status_code=i % 2 + 1) for i in range(3)])
+    db_session.commit()
+
+    checked, drifts = reconcile_counters(db_session, chunk_size=1, dry_run=True)
+
+    assert checked >= 1
+    assert {"todo_list_id": db_todo_list.id, "item_count": (0, 3), "completed_count": (0, 1)} in drifts
+
+    reconcile_counters(db_session, chunk_size=1)
+    db_session.refresh(db_todo_list)
+
+    assert (db_todo_list.item_count, db_todo_list.completed_count) == (3, 1)
+    assert reconcile_counters(db_session, chunk_size=1)[1] == []
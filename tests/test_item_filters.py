@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def _seed(db_session) -> tuple[int, dict]:
+    """期限日時・ステータスの異なるTODO項目を登録する."""
+    db_todo_lists = [list_model.ListModel(title=f"filter_test_{i}", description="A test record for filters.") for i in range(2)]
+    db_session.add_all(db_todo_lists)
+    db_session.commit()
+
+    now = datetime.utcnow().replace(microsecond=0)
+    db_todo_items = {
+        "no_due": item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="no_due", status_code=1),
+        "overdue": item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="overdue", status_code=1, due_at=now - timedelta(days=2)),
+        "completed": item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="completed", status_code=2, due_at=now - timedelta(days=1)),
+        "this_week": item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="this_week", status_code=1, due_at=now + timedelta(days=3)),
+        "next_month": item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="next_month", status_code=1, due_at=now + timedelta(days=30)),
+        "other_list": item_model.ItemModel(todo_list_id=db_todo_lists[1].id, title="other_list", status_code=1, due_at=now - timedelta(days=3)),
+    }
+    db_session.add_all(db_todo_items.values())
+    db_session.commit()
+    return db_todo_lists[0].id, now
+
+
+def _get_all_pages(path: str, params: dict) -> list[str]:
+    """カーソルをたどって全ページのTODO項目のタイトルを取得する."""
+    titles = []
+    cursor = None
+    while True:
+        response = client.get(path, params={**params, "cursor": cursor} if cursor else params)
+        assert response.status_code == status.HTTP_200_OK
+        titles += [x["title"] for x in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return titles
+
+
+def test_get_todo_items_sort_by_due_at(db_session) -> None:
+    """期限日時順(期限なしが先頭)にカーソルで全件取得できることの確認."""
+    todo_list_id, _ = _seed(db_session)
+
+    titles = _get_all_pages(f"/lists/{todo_list_id}/items", {"sort": "due_at", "per_page": 2})
+
+    assert titles == ["no_due", "overdue", "completed", "this_week", "next_month"]
+
+
+def test_get_todo_items_filter_by_status_and_due(db_session) -> None:
+    """ステータスと期限日時で絞り込めることの確認."""
+    todo_list_id, now = _seed(db_session)
+
+    response = client.get(f"/lists/{todo_list_id}/items", params={
+        "status": 1,
+        "due_after": now.isoformat(),
+        "due_before": (now + timedelta(days=7)).isoformat(),
+        "sort": "due_at",
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["title"] for x in response.json()] == ["this_week"]
+
+
+def test_get_overdue_todo_items(db_session) -> None:
+    """全TODOリストの期限切れのTODO項目が期限日時順に取得できることの確認."""
+    _seed(db_session)
+
+    titles = _get_all_pages("/items/overdue", {"per_page": 1})
+
+    assert titles == ["other_list", "overdue"]
+
+
+def test_get_todo_items_400_cursor_for_other_sort(db_session) -> None:
+    """並び順の異なるカーソルを指定すると400となることの確認."""
+    todo_list_id, _ = _seed(db_session)
+    response = client.get(f"/lists/{todo_list_id}/items", params={"per_page": 1})
+
+    response = client.get(f"/lists/{todo_list_id}/items", params={"sort": "due_at", "cursor": response.headers["X-Next-Cursor"]})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_todo_items_400_due_at_cursor_for_id_sort(db_session) -> None:
+    """期限日時順のカーソルをid順に指定すると400となることの確認."""
+    todo_list_id, _ = _seed(db_session)
+    response = client.get(f"/lists/{todo_list_id}/items", params={"sort": "due_at", "per_page": 1})
+
+    response = client.get(f"/lists/{todo_list_id}/items", params={"cursor": response.headers["X-Next-Cursor"]})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
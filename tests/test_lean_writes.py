@@ -0,0 +1,54 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.main import app
+from app.models import list_model
+
+client = TestClient(app)
+
+
+def _record_statements(statements):
+    """TODOテーブルに対して実行されたSQLの種類を記録する."""
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "todo_" in statement:
+            statements.append(statement.lstrip().split(" ", 1)[0].upper())
+    return _before_cursor_execute
+
+
+def test_post_todo_list_single_round_trip(db_session) -> None:
+    """TODOリストの登録がINSERT1回のみで完了することの確認."""
+    statements = []
+    listener = _record_statements(statements)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = client.post("/lists", json={"title": "lean_test", "description": "A test record for lean writes."})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert statements == ["INSERT"]
+    assert response.json()["created_at"] == response.json()["updated_at"]
+
+
+def test_post_todo_item_single_round_trip(db_session) -> None:
+    """TODO項目の登録が親リストのSELECTなしで完了することの確認.
+
+    親リストの存在確認は件数カウンタのUPDATEで兼ねる。
+    """
+    db_todo_list = list_model.ListModel(title="lean_test", description="A test record for lean writes.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    statements = []
+    listener = _record_statements(statements)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = client.post(f"/lists/{db_todo_list.id}/items", json={"title": "lean_test"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert statements == ["UPDATE", "INSERT"]
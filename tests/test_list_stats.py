@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def test_get_todo_lists_include_stats(db_session) -> None:
+    """include=statsでTODO項目の件数が1回の集計クエリで付与されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_lists = [list_model.ListModel(title=f"stats_test_{i}", description="A test record for stats.") for i in range(2)]
+    db_session.add_all(db_todo_lists)
+    db_session.commit()
+
+    now = datetime.utcnow()
+    db_session.add_all([
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="overdue", status_code=1, due_at=now - timedelta(days=1)),
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="completed", status_code=2, due_at=now - timedelta(days=1)),
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="not_due", status_code=1, due_at=now + timedelta(days=1)),
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="no_due", status_code=1),
+    ])
+    db_session.commit()
+
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "todo_" in statement:
+            statements.append(statement)
+
+    # ******************
+    # テスト実行
+    # ******************
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        response = client.get("/lists", params={"include": "stats", "per_page": 100})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_200_OK
+
+    stats = {x["id"]: x["stats"] for x in response.json()}
+    assert stats[db_todo_lists[0].id] == {"total": 4, "completed": 1, "overdue": 1}
+    assert stats[db_todo_lists[1].id] == {"total": 0, "completed": 0, "overdue": 0}
+
+    # TODOリスト一覧のSELECTと件数のGROUP BYの2回のみ
+    assert len(statements) == 2
+    assert "GROUP BY" in statements[1]
+
+
+def test_get_todo_lists_without_stats(db_session) -> None:
+    """includeを指定しない場合はstatsが付与されないことの確認."""
+    db_session.add(list_model.ListModel(title="stats_test", description="A test record for stats."))
+    db_session.commit()
+
+    response = client.get("/lists")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert all("stats" not in x for x in response.json())
+
+
+def test_get_todo_lists_400_unknown_include() -> None:
+    """未対応のincludeを指定すると400となることの確認."""
+    response = client.get("/lists", params={"include": "owner"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,91 @@
+import json
+import os
+import time
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app import const
+from app.main import app
+from app.metrics import DURATION_BUCKETS, write_snapshot
+
+client = TestClient(app)
+
+
+def _samples(body: str) -> dict[str, float]:
+    """メトリクスの行を名前とラベルをキーにした辞書に変換する."""
+    samples = {}
+    for line in body.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_get_metrics() -> None:
+    """ルートのテンプレートごとにリクエスト数と処理時間が記録されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    before = _samples(client.get("/metrics").text)
+
+    # ******************
+    # テスト実行
+    # ******************
+    client.get("/echo", params={"message": "hello", "name": "metrics"})
+    client.get("/echo", params={"message": "hello", "name": "metrics"})
+    client.get("/unknown/path")
+    response = client.get("/metrics")
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = _samples(response.text)
+
+    echo = 'method="GET",route="/echo"'
+    assert after[f'http_requests_total{{{echo},status="200"}}'] - before.get(f'http_requests_total{{{echo},status="200"}}', 0) == 2
+    assert after[f"http_request_duration_seconds_count{{{echo}}}"] - before.get(f"http_request_duration_seconds_count{{{echo}}}", 0) == 2
+    assert after[f'http_request_duration_seconds_bucket{{{echo},le="+Inf"}}'] == after[f"http_request_duration_seconds_count{{{echo}}}"]
+    buckets = [after[f'http_request_duration_seconds_bucket{{{echo},le="{le}"}}'] for le in DURATION_BUCKETS]
+    assert buckets == sorted(buckets)
+    # 一致しないパスはパスごとにラベルを作らない
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in after
+    assert not any("/unknown/path" in x for x in after)
+    # /metrics自身の処理中の1件
+    assert after["http_requests_in_progress"] == 1
+
+
+def test_get_metrics_multiprocess(tmp_path, monkeypatch) -> None:
+    """METRICS_MULTIPROC_DIRに書き出された他のワーカーの値が合算されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    monkeypatch.setattr(const, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    write_snapshot()
+    other_worker = {
+        "pid": os.getpid() + 1,
+        "written_at": time.time(),
+        "requests": [["GET", "/echo", "200", 5]],
+        "durations": [["GET", "/echo", [5] + [0] * len(DURATION_BUCKETS), 0.01]],
+        "in_progress": 2,
+        "pools": {"sync": {"size": 5, "checked_out": 3, "idle": 2, "overflow": 0}},
+        "cache": {"hits": 0, "misses": 0},
+    }
+    (tmp_path / f"metrics_{other_worker['pid']}.json").write_text(json.dumps(other_worker))
+    single = _samples(client.get("/metrics").text)
+    monkeypatch.setattr(const, "METRICS_MULTIPROC_DIR", None)
+
+    # ******************
+    # テスト実行
+    # ******************
+    local = _samples(client.get("/metrics").text)
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    echo = 'http_requests_total{method="GET",route="/echo",status="200"}'
+    assert single[echo] == local.get(echo, 0) + 5
+    assert single["http_requests_in_progress"] == local["http_requests_in_progress"] + 2
+    assert single[f'db_pool_checked_out{{engine="sync",pid="{other_worker["pid"]}"}}'] == 3
@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.const import TodoItemStatusCode
+from app.crud import async_item_crud, async_list_crud, item_crud, list_crud
+from app.database import AsyncSessionLocal, async_engine, engine
+from app.models import item_model, list_model
+from app.pagination import encode_cursor
+from app.schemas.item_schema import NewTodoItem, UpdateTodoItem
+from app.schemas.list_schema import NewTodoList, UpdateTodoList
+
+NUM_OF_RECORDS = 50
+
+
+@contextmanager
+def _capture_selects(target_engine=engine):
+    """実行されたSELECT文とパラメータを記録する."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(target_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _assert_no_full_scan(db_session, statements) -> None:
+    """EXPLAINの結果にフルテーブルスキャン(type=ALL)が含まれないことの確認."""
+    assert statements
+    for statement, parameters in statements:
+        plan = db_session.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+        for row in plan:
+            assert row["type"] != "ALL", f"full table scan on {row['table']}: {statement}"
+
+
+@pytest.fixture
+def seeded(db_session):
+    db_todo_lists = [list_model.ListModel(
+        title=f"plan_test_{str(i).zfill(3)}",
+        description="A test record for query plans.") for i in range(NUM_OF_RECORDS)]
+    db_session.add_all(db_todo_lists)
+    db_session.commit()
+
+    todo_list_id = db_todo_lists[0].id
+    db_todo_items = [item_model.ItemModel(
+        todo_list_id=todo_list_id,
+        title=f"plan_test_{str(i).zfill(3)}",
+        description="A test record for query plans.", status_code=1) for i in range(NUM_OF_RECORDS)]
+    db_session.add_all(db_todo_items)
+    db_session.commit()
+    return todo_list_id, db_todo_items[0].id
+
+
+def test_list_crud_queries_use_index(seeded, db_session) -> None:
+    """list_crudの各クエリがインデックスを利用していることの確認."""
+    todo_list_id, _ = seeded
+
+    with _capture_selects() as statements:
+        list_crud.get_todo_lists(db_session, 2, 10)
+        list_crud.get_todo_lists(db_session, 1, 10, encode_cursor({"id": todo_list_id}))
+        list_crud.get_todo_list(todo_list_id, db_session)
+        list_crud.update_todo_list(todo_list_id, UpdateTodoList(title="plan_test_updated"), db_session)
+        list_crud.create_todo_list(NewTodoList(title="plan_test_new"), db_session)
+
+    _assert_no_full_scan(db_session, statements)
+
+
+def test_item_crud_queries_use_index(seeded, db_session) -> None:
+    """item_crudの各クエリがインデックスを利用していることの確認."""
+    todo_list_id, todo_item_id = seeded
+
+    with _capture_selects() as statements:
+        item_crud.get_todo_items(db_session, todo_list_id, 2, 10)
+        item_crud.get_todo_items(db_session, todo_list_id, 1, 10, encode_cursor({"id": todo_item_id}))
+        item_crud.get_todo_item(db_session, todo_list_id, todo_item_id)
+        item_crud.update_todo_item(db_session, todo_list_id, todo_item_id, UpdateTodoItem(complete=True))
+        item_crud.post_todo_item(db_session, todo_list_id, NewTodoItem(title="plan_test_new"))
+        item_crud.delete_todo_item(db_session, todo_list_id, todo_item_id)
+
+    _assert_no_full_scan(db_session, statements)
+
+
+def test_async_crud_queries_use_index(seeded, db_session) -> None:
+    """APIから利用する非同期CRUDの各クエリがインデックスを利用していることの確認."""
+    todo_list_id, todo_item_id = seeded
+
+    async def _run_crud() -> None:
+        async with AsyncSessionLocal() as db:
+            await async_list_crud.get_todo_lists(db, 2, 10)
+            await async_list_crud.get_todo_lists(db, 1, 10, encode_cursor({"id": todo_list_id}))
+            await async_list_crud.get_todo_list(todo_list_id, db)
+            await async_list_crud.get_todo_list_stats(db, [todo_list_id])
+            await async_item_crud.get_todo_items(db, todo_list_id, 2, 10)
+            await async_item_crud.get_todo_items(db, todo_list_id, 1, 10, encode_cursor({"id": todo_item_id}))
+            await async_item_crud.get_todo_items(db, todo_list_id, 1, 10, None, None, TodoItemStatusCode.NOT_COMPLETED, datetime(2100, 1, 1), None, "due_at")
+            await async_item_crud.get_todo_items(db, todo_list_id, 1, 10, encode_cursor({"due_at": None, "id": todo_item_id}), sort="due_at")
+            await async_item_crud.get_overdue_todo_items(db, 10)
+            await async_item_crud.get_todo_item(db, todo_list_id, todo_item_id)
+            await async_item_crud.update_todo_item(db, todo_list_id, todo_item_id, UpdateTodoItem(complete=True))
+            await async_item_crud.post_todo_item(db, todo_list_id, NewTodoItem(title="plan_test_new"))
+            await async_item_crud.delete_todo_item(db, todo_list_id, todo_item_id)
+            await async_item_crud.restore_todo_item(db, todo_list_id, todo_item_id)
+
+    with _capture_selects(async_engine.sync_engine) as statements:
+        asyncio.run(_run_crud())
+
+    _assert_no_full_scan(db_session, statements)
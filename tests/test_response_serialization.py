@@ -0,0 +1,36 @@
+import json
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.item_schema import ResponseTodoItem
+from benchmarks import serialization
+
+client = TestClient(app)
+
+
+def test_openapi_declares_response_models() -> None:
+    """一覧・詳細取得エンドポイントのレスポンススキーマがOpenAPIに定義されていることの確認."""
+    response = client.get("/openapi.json")
+
+    assert response.status_code == status.HTTP_200_OK
+
+    paths = response.json()["paths"]
+
+    def response_schema(path: str) -> dict:
+        return paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert response_schema("/lists/")["items"]["$ref"] == "#/components/schemas/ResponseTodoList"
+    assert response_schema("/lists/{todo_list_id}/items/")["items"]["$ref"] == "#/components/schemas/ResponseTodoItem"
+    assert response_schema("/lists/{todo_list_id}/items/{todo_item_id}")["$ref"] == "#/components/schemas/ResponseTodoItem"
+
+
+def test_serializers_produce_same_json() -> None:
+    """ベンチマークの各変換方法が同じJSONを出力することの確認."""
+    items = serialization.build_items(3)
+
+    outputs = [json.loads(serialize(items)) for serialize in serialization.SERIALIZERS.values()]
+
+    assert all(x == outputs[0] for x in outputs)
+    assert set(outputs[0][0]) == set(ResponseTodoItem.model_fields)
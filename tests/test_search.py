@@ -0,0 +1,78 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def _seed(db_session) -> list[int]:
+    db_todo_lists = [
+        list_model.ListModel(title="週末の買い物", description="スーパーとドラッグストア"),
+        list_model.ListModel(title="仕事", description="来週の会議の準備"),
+    ]
+    db_session.add_all(db_todo_lists)
+    db_session.commit()
+    db_session.add_all([
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="牛乳を買う", description="買い物のついでに", status_code=1),
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="卵を買う", status_code=1),
+        item_model.ItemModel(todo_list_id=db_todo_lists[0].id, title="洗剤", description="ドラッグストアで買う", status_code=1),
+        item_model.ItemModel(todo_list_id=db_todo_lists[1].id, title="会議資料を買う", status_code=1),
+        item_model.ItemModel(todo_list_id=db_todo_lists[1].id, title="議事録", status_code=1),
+    ])
+    db_session.commit()
+    return [x.id for x in db_todo_lists]
+
+
+def test_search_todo_items(db_session) -> None:
+    """TODO項目が関連度順に検索され、カーソルで続きを取得できることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    _seed(db_session)
+
+    # ******************
+    # テスト実行
+    # ******************
+    first_page = client.get("/search", params={"q": "買う", "per_page": 2})
+    second_page = client.get("/search", params={"q": "買う", "per_page": 2, "cursor": first_page.headers["X-Next-Cursor"]})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert first_page.status_code == status.HTTP_200_OK
+    assert second_page.status_code == status.HTTP_200_OK
+
+    results = first_page.json() + second_page.json()
+    assert sorted(x["title"] for x in results) == ["会議資料を買う", "卵を買う", "洗剤", "牛乳を買う"]
+    assert len({x["id"] for x in results}) == len(results)
+    scores = [x["score"] for x in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_todo_items_in_list(db_session) -> None:
+    """todo_list_idを指定するとそのTODOリスト内のみが検索されることの確認."""
+    todo_list_ids = _seed(db_session)
+
+    response = client.get("/search", params={"q": "買う", "todo_list_id": todo_list_ids[1]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["title"] for x in response.json()] == ["会議資料を買う"]
+
+
+def test_search_todo_lists(db_session) -> None:
+    """TODOリストが検索できることの確認."""
+    todo_list_ids = _seed(db_session)
+
+    response = client.get("/search", params={"q": "ドラッグストア", "target": "lists"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["id"] for x in response.json()] == [todo_list_ids[0]]
+
+
+def test_search_400_todo_list_id_with_lists() -> None:
+    """TODOリストの検索でtodo_list_idを指定すると400となることの確認."""
+    response = client.get("/search", params={"q": "買う", "target": "lists", "todo_list_id": 1})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import timedelta
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.database import AsyncSessionLocal, current_timestamp
+from app.main import app
+from app.models import item_model, list_model
+from app.purger import purge_deleted_rows
+
+client = TestClient(app)
+
+
+def _seed(db_session) -> tuple[int, list[int]]:
+    db_todo_list = list_model.ListModel(title="soft_delete_test", description="A test record for soft deletion.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_todo_items = [item_model.ItemModel(todo_list_id=db_todo_list.id, title=f"soft_delete_test_{i}", status_code=i % 2 + 1) for i in range(4)]
+    db_session.add_all(db_todo_items)
+    db_session.commit()
+    return db_todo_list.id, [x.id for x in db_todo_items]
+
+
+def _count_rows(db_session, model, *conditions) -> int:
+    """論理削除された行も含めて件数を数える."""
+    return db_session.query(model).filter(*conditions).execution_options(include_deleted=True).count()
+
+
+def test_delete_and_restore_todo_item(db_session) -> None:
+    """TODO項目が論理削除され、復元するとAPIから再び参照できることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id, todo_item_ids = _seed(db_session)
+    target_todo_item_id = todo_item_ids[1]
+
+    # ******************
+    # テスト実行
+    # ******************
+    delete_response = client.delete(f"/lists/{todo_list_id}/items/{target_todo_item_id}")
+    get_response = client.get(f"/lists/{todo_list_id}/items/{target_todo_item_id}")
+    list_response = client.get(f"/lists/{todo_list_id}/items/")
+    counters_after_delete = client.get(f"/lists/{todo_list_id}").json()
+    restore_response = client.post(f"/lists/{todo_list_id}/items/{target_todo_item_id}/restore")
+    counters_after_restore = client.get(f"/lists/{todo_list_id}").json()
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert delete_response.status_code == status.HTTP_200_OK
+    assert get_response.status_code == status.HTTP_404_NOT_FOUND
+    assert target_todo_item_id not in [x["id"] for x in list_response.json()]
+    assert _count_rows(db_session, item_model.ItemModel, item_model.ItemModel.id == target_todo_item_id) == 1
+
+    assert restore_response.status_code == status.HTTP_200_OK
+    assert restore_response.json()["id"] == target_todo_item_id
+    assert client.get(f"/lists/{todo_list_id}/items/{target_todo_item_id}").status_code == status.HTTP_200_OK
+    # 復元した項目(完了済み)の分だけ件数カウンタが加算される
+    assert counters_after_restore["item_count"] - counters_after_delete["item_count"] == 1
+    assert counters_after_restore["completed_count"] - counters_after_delete["completed_count"] == 1
+
+
+def test_restore_todo_item_404_not_deleted(db_session) -> None:
+    """論理削除されていないTODO項目の復元が404となることの確認."""
+    todo_list_id, todo_item_ids = _seed(db_session)
+
+    response = client.post(f"/lists/{todo_list_id}/items/{todo_item_ids[0]}/restore")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_delete_and_restore_todo_list(db_session) -> None:
+    """TODOリストが論理削除されると属するTODO項目も参照できなくなり、復元で元に戻ることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id, todo_item_ids = _seed(db_session)
+
+    # ******************
+    # テスト実行
+    # ******************
+    delete_response = client.delete(f"/lists/{todo_list_id}")
+    get_list_response = client.get(f"/lists/{todo_list_id}")
+    get_item_response = client.get(f"/lists/{todo_list_id}/items/{todo_item_ids[0]}")
+    post_item_response = client.post(f"/lists/{todo_list_id}/items/", json={"title": "soft_delete_test_new"})
+    restore_response = client.post(f"/lists/{todo_list_id}/restore")
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert delete_response.status_code == status.HTTP_200_OK
+    assert get_list_response.status_code == status.HTTP_404_NOT_FOUND
+    assert get_item_response.status_code == status.HTTP_404_NOT_FOUND
+    assert post_item_response.status_code == status.HTTP_404_NOT_FOUND
+
+    assert restore_response.status_code == status.HTTP_200_OK
+    assert restore_response.json()["id"] == todo_list_id
+    assert [x["id"] for x in client.get(f"/lists/{todo_list_id}/items/").json()] == todo_item_ids
+
+
+def test_purge_deleted_rows(db_session) -> None:
+    """保持期間を過ぎた論理削除済みの行のみ物理削除されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    retention_seconds = 3600
+    expired = current_timestamp() - timedelta(seconds=retention_seconds + 1)
+    purged_list_id, purged_list_item_ids = _seed(db_session)
+    kept_list_id, kept_list_item_ids = _seed(db_session)
+    db_session.query(list_model.ListModel).filter(list_model.ListModel.id == purged_list_id).update({"deleted_at": expired})
+    db_session.query(item_model.ItemModel).filter(item_model.ItemModel.id == kept_list_item_ids[0]).update({"deleted_at": expired})
+    db_session.query(item_model.ItemModel).filter(item_model.ItemModel.id == kept_list_item_ids[1]).update({"deleted_at": current_timestamp()})
+    db_session.commit()
+
+    # ******************
+    # テスト実行
+    # ******************
+    async def _purge() -> tuple[int, int]:
+        async with AsyncSessionLocal() as db:
+            return await purge_deleted_rows(db, retention_seconds, 100)
+
+    purged = asyncio.run(_purge())
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    db_session.reset()
+
+    assert purged == (1, 1)
+    assert _count_rows(db_session, list_model.ListModel, list_model.ListModel.id == purged_list_id) == 0
+    assert _count_rows(db_session, item_model.ItemModel, item_model.ItemModel.id.in_(purged_list_item_ids)) == 0
+    assert _count_rows(db_session, item_model.ItemModel, item_model.ItemModel.id == kept_list_item_ids[0]) == 0
+    # 保持期間内の行は復元できるように残す
+    assert _count_rows(db_session, item_model.ItemModel, item_model.ItemModel.id.in_(kept_list_item_ids)) == len(kept_list_item_ids) - 1
+    assert _count_rows(db_session, list_model.ListModel, list_model.ListModel.id == kept_list_id) == 1
@@ -0,0 +1,71 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import async_engine
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def test_get_todo_items_with_fields(db_session) -> None:
+    """fieldsで指定した項目のみがSELECT・出力されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    db_todo_list = list_model.ListModel(title="fields_test", description="A test record for sparse fields.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.refresh(db_todo_list)
+
+    db_session.add_all([item_model.ItemModel(
+        todo_list_id=db_todo_list.id,
+        title=f"fields_test_{i}",
+        description="A test record for sparse fields.",
+        status_code=1) for i in range(3)])
+    db_session.commit()
+
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "todo_items" in statement:
+            statements.append(statement)
+
+    # ******************
+    # テスト実行
+    # ******************
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        response = client.get(f"/lists/{db_todo_list.id}/items", params={"fields": "title,status_code"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": x["id"], "title": f"fields_test_{i}", "status_code": 1} for i, x in enumerate(response.json())]
+    assert "Last-Modified" not in response.headers
+
+    assert len(statements) == 1
+    assert "description" not in statements[0]
+
+
+def test_get_todo_lists_with_fields(db_session) -> None:
+    """TODOリスト一覧でもfieldsで出力項目を絞り込めることの確認."""
+    db_session.add(list_model.ListModel(title="fields_test", description="A test record for sparse fields."))
+    db_session.commit()
+
+    response = client.get("/lists", params={"fields": "title,updated_at"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert all(set(x) == {"id", "title", "updated_at"} for x in response.json())
+    assert "Last-Modified" in response.headers
+
+
+def test_get_todo_items_400_unknown_fields() -> None:
+    """存在しない項目名を指定すると400となることの確認."""
+    response = client.get("/lists/1/items", params={"fields": "title,password"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
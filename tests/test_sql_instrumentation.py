@@ -0,0 +1,68 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app import const
+from app.main import app
+from app.models import item_model, list_model
+
+client = TestClient(app)
+
+
+def _seed(db_session) -> int:
+    db_todo_list = list_model.ListModel(title="instrumentation_test", description="A test record for SQL instrumentation.")
+    db_session.add(db_todo_list)
+    db_session.commit()
+    db_session.add_all([item_model.ItemModel(todo_list_id=db_todo_list.id, title=f"instrumentation_test_{i}", status_code=1) for i in range(3)])
+    db_session.commit()
+    return db_todo_list.id
+
+
+def test_query_count_headers(db_session) -> None:
+    """SQLの実行件数と合計時間がレスポンスヘッダで返されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id = _seed(db_session)
+
+    # ******************
+    # テスト実行
+    # ******************
+    list_response = client.get("/lists/")
+    include_response = client.get(f"/lists/{todo_list_id}", params={"include": "stats,items"})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert list_response.status_code == status.HTTP_200_OK
+    assert list_response.headers["X-DB-Queries"] == "1"
+    assert list_response.headers["Server-Timing"].startswith("db;dur=")
+    # TODOリスト・集計・TODO項目を1回ずつ取得する
+    assert include_response.headers["X-DB-Queries"] == "3"
+    assert "X-DB-N-Plus-One-Suspect" not in include_response.headers
+
+
+def test_query_count_headers_without_db() -> None:
+    """DBにアクセスしないエンドポイントでは実行件数が0となることの確認."""
+    response = client.get("/health")
+
+    assert response.headers["X-DB-Queries"] == "0"
+
+
+def test_n_plus_one_suspect(db_session, monkeypatch, caplog) -> None:
+    """実行件数が閾値を超えたリクエストにN+1クエリの疑いのヘッダが付与され、ログに出力されることの確認."""
+    # ******************
+    # 事前準備
+    # ******************
+    todo_list_id = _seed(db_session)
+    monkeypatch.setattr(const, "SQL_N_PLUS_ONE_THRESHOLD", 2)
+
+    # ******************
+    # テスト実行
+    # ******************
+    response = client.get(f"/lists/{todo_list_id}", params={"include": "stats,items"})
+
+    # ******************
+    # 実行結果の検証開始
+    # ******************
+    assert response.headers["X-DB-N-Plus-One-Suspect"] == "true"
+    assert "possible N+1 queries" in caplog.text